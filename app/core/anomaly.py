@@ -5,45 +5,52 @@ long-tail 분포 특성을 고려한 이상 탐지.
 from __future__ import annotations
 
 import math
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import numpy as np
 
-from app.models.common import PredictionResult, MCPContext
+from app.core.forecast import PredictionLike, forecast_values
+from app.models.common import MCPContext
 from app.core.predictor.data_sources.factory import get_data_source
 from app.core.errors import DataSourceError
 from app.core.metrics import get_metric_meta
 
 
 def detect_anomaly(
-    pred: PredictionResult,
+    pred: PredictionLike,
     ctx: MCPContext,
     hours: int = 168,
     z_thresh: float = 5.0,
+    hist: Optional[np.ndarray] = None,
 ) -> Dict[str, Any]:
     """
     robust 알고리즘 기반 이상 탐지:
     1. Percentile 기반 이상치 제거 (5%-95%)
     2. 동적 임계값 (mean + threshold_multiplier * std)
     3. 다차원 특성 고려 (현재값, 6시간 평균, 변화율, 표준편차)
+
+    hist 를 넘기면 데이터 소스 조회를 생략한다. (배치 플랜에서 fetch_many 로 미리 조회한 경우)
+    과거 조회 구간은 예측 구간(horizon)보다 짧지 않도록 max(hours, H) 를 사용한다.
     """
-    try:
-        ds = get_data_source()
-    except Exception as exc:
-        raise DataSourceError(f"데이터 소스를 사용할 수 없음: {exc}")
+    pred_values = forecast_values(pred)
+    if hist is None:
+        try:
+            ds = get_data_source()
+        except Exception as exc:
+            raise DataSourceError(f"데이터 소스를 사용할 수 없음: {exc}")
 
-    try:
-        hist = ds.fetch_historical_data(
-            github_url=pred.github_url,
-            metric_name=pred.metric_name,
-            hours=hours,
-        )
-    except Exception as exc:
-        return {
-            "anomaly_detected": False,
-            "score": 0.0,
-            "reason": f"과거 데이터 조회 실패: {exc}",
-        }
+        try:
+            hist = ds.fetch_historical_data(
+                github_url=pred.github_url,
+                metric_name=pred.metric_name,
+                hours=max(hours, len(pred_values)),
+            )
+        except Exception as exc:
+            return {
+                "anomaly_detected": False,
+                "score": 0.0,
+                "reason": f"과거 데이터 조회 실패: {exc}",
+            }
 
     if len(hist) == 0:
         return {"anomaly_detected": False, "score": 0.0, "reason": "과거 데이터 없음"}
@@ -81,7 +88,6 @@ def detect_anomaly(
     hist_std = float(np.std(hist_clean))
     
     # 예측값 처리
-    pred_values = np.array([p.value for p in pred.predictions])
     max_pred = float(np.max(pred_values))
     avg_pred = float(np.mean(pred_values))
     
@@ -0,0 +1,58 @@
+"""
+고정 크기 multi-row INSERT 배치 writer.
+
+행 전체를 한 번의 executemany 로 보내면 메모리와 문장 크기(max_allowed_packet)가 행 수에 비례해 커진다.
+insert_rows 는 행을 batch_size 개씩 잘라 배치마다 executemany 를 한 번 호출한다.
+
+- INSERT 문은 한 번만 컴파일되어 캐시된다. (행마다 VALUES 절을 새로 컴파일하는 .values([...]) 보다 ~10배 빠름)
+- PyMySQL 은 executemany 를 `INSERT ... VALUES (...), (...), ...` multi-row 문장으로 재작성하므로
+  MySQL 왕복 횟수는 배치 수 수준으로 유지된다.
+
+- db_sqlalchemy.bulk_points(_many) 와 scripts/ingest_metric_history.py 가 공통으로 사용한다.
+- Connection / Session 어느 쪽이든 execute() 가 있으면 사용할 수 있다. (트랜잭션은 호출자 책임)
+- ignore_duplicates=True 이면 유니크 키 충돌 행을 건너뛴다. (MySQL INSERT IGNORE / SQLite INSERT OR IGNORE)
+"""
+
+from __future__ import annotations
+
+import os
+from itertools import islice
+from typing import Any, Iterable, Iterator, Mapping
+
+from sqlalchemy import Table, insert
+
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "1000"))
+
+
+def chunked(rows: Iterable[Mapping[str, Any]], size: int) -> Iterator[list[Mapping[str, Any]]]:
+    it = iter(rows)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def insert_statement(table: Table, *, ignore_duplicates: bool = False):
+    stmt = insert(table)
+    if ignore_duplicates:
+        stmt = stmt.prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+    return stmt
+
+
+def insert_rows(
+    conn: Any,
+    table: Table,
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    batch_size: int | None = None,
+    ignore_duplicates: bool = False,
+) -> int:
+    """rows 를 batch_size 개씩 잘라 배치마다 executemany 로 기록한다. 전송한 행 수를 반환."""
+    size = max(1, batch_size or BULK_INSERT_BATCH_SIZE)
+    stmt = insert_statement(table, ignore_duplicates=ignore_duplicates)
+    sent = 0
+    for batch in chunked(rows, size):
+        conn.execute(stmt, batch)
+        sent += len(batch)
+    return sent
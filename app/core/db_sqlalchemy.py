@@ -7,7 +7,7 @@ Key concepts demonstrated:
 1. Engine & Session management
 2. FastAPI dependency (`get_db`)
 3. Basic CRUD (Create / Read / Update / Delete)
-4. Bulk insert for prediction points
+4. Bulk insert for prediction points (fixed-size INSERT batches, see bulk_writer)
 5. Query helpers (filtering, ordering, pagination)
 
 You can import and use these in your routers, e.g.:
@@ -30,12 +30,14 @@ from __future__ import annotations
 
 import os
 from datetime import datetime
-from typing import Iterator, List, Optional
+from typing import Iterable, Iterator, List, Optional
 from contextlib import contextmanager
 from sqlalchemy import create_engine, select
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.bulk_writer import insert_rows
+from app.core import id_registry
 from app.core.persistence_models import (
     Base,
     MCPContext,
@@ -143,10 +145,10 @@ def create_feature_snapshot(
     *,
     context_id: str,
     github_url: str,
-    window_start: datetime,
-    window_end: datetime,
-    sequence_length: int,
-    feature_count: int,
+    window_start: Optional[datetime],
+    window_end: Optional[datetime],
+    sequence_length: Optional[int],
+    feature_count: Optional[int],
     features_json: dict,
 ) -> PredictionFeature:
     snap = PredictionFeature(
@@ -172,23 +174,27 @@ def create_prediction(
     generated_at: datetime,
     predictions_json: list,
     user_id: Optional[str] = None,
-    horizon_hours: int = 24,
+    horizon_hours: Optional[int] = None,  # 생략하면 predictions_json 길이
     scale_factor: Optional[float] = None,
     recommended_flavor: Optional[str] = None,
     min_instances: int = 1,
     max_instances: int = 3,
     expected_cost_per_day: Optional[float] = None,
+    service_id: Optional[int] = None,  # 생략하면 id_registry 로 조회/등록
+    metric_id: Optional[int] = None,
 ) -> Prediction:
     pred = Prediction(
         context_id=context_id,
         feature_snapshot_id=feature_snapshot_id,
+        service_id=service_id if service_id is not None else id_registry.service_id(db, github_url),
+        metric_id=metric_id if metric_id is not None else id_registry.metric_id(db, metric_name),
         github_url=github_url,
         metric_name=metric_name,
         model_version=model_version,
         generated_at=generated_at,
         predictions_json=predictions_json,
         user_id=user_id,
-        horizon_hours=horizon_hours,
+        horizon_hours=horizon_hours if horizon_hours is not None else len(predictions_json),
         scale_factor=scale_factor,
         recommended_flavor=recommended_flavor,
         min_instances=min_instances,
@@ -204,16 +210,25 @@ def bulk_points(
     prediction_id: int,
     rows: List[dict],  # {forecast_time, predicted_value, actual_value?}
 ) -> None:
-    db.add_all(
-        [
-            PredictionPoint(
-                prediction_id=prediction_id,
-                forecast_time=r["forecast_time"],
-                predicted_value=r["predicted_value"],
-                actual_value=r.get("actual_value"),
-            )
+    bulk_points_many(db, ({**r, "prediction_id": prediction_id} for r in rows))
+
+def bulk_points_many(
+    db: Session,
+    rows: Iterable[dict],  # {prediction_id, forecast_time, predicted_value, actual_value?}
+) -> int:
+    """여러 예측의 시점 행을 고정 크기 INSERT 배치로 저장한다. (bulk_writer) 저장한 행 수를 반환."""
+    return insert_rows(
+        db,
+        PredictionPoint.__table__,
+        (
+            {
+                "prediction_id": r["prediction_id"],
+                "forecast_time": r["forecast_time"],
+                "predicted_value": r["predicted_value"],
+                "actual_value": r.get("actual_value"),
+            }
             for r in rows
-        ]
+        ),
     )
 
 # ---------------------------------------------------------------------------
@@ -233,9 +248,16 @@ def list_contexts(db: Session, github_url: str, limit: int = 20) -> List[MCPCont
     return list(db.execute(stmt).scalars())
 
 def list_predictions(db: Session, github_url: str, metric: Optional[str] = None, limit: int = 50) -> List[Prediction]:
-    stmt = select(Prediction).where(Prediction.github_url == github_url)
+    # 정수 ID 로 조회해 (service_id, metric_id, generated_at) 인덱스를 탄다
+    sid = id_registry.service_id(db, github_url, create=False)
+    if sid is None:
+        return []
+    stmt = select(Prediction).where(Prediction.service_id == sid)
     if metric:
-        stmt = stmt.where(Prediction.metric_name == metric)
+        mid = id_registry.metric_id(db, metric, create=False)
+        if mid is None:
+            return []
+        stmt = stmt.where(Prediction.metric_id == mid)
     stmt = stmt.order_by(Prediction.generated_at.desc()).limit(limit)
     return list(db.execute(stmt).scalars())
 
@@ -0,0 +1,136 @@
+"""
+비동기 배포 작업(Job) 러너.
+
+Nova 프로비저닝(wait_for_server)은 수 분이 걸릴 수 있으므로 /deploy 요청 스레드에서
+기다리지 않고, 제한된 동시성(DEPLOY_MAX_CONCURRENCY)의 백그라운드 워커에서 실행한다.
+/deploy 는 job_id를 즉시 반환하고, 클라이언트는 /status/jobs/{job_id} 로 상태를 조회한다.
+
+프로세스 메모리 기반 저장소이므로 projects_store와 마찬가지로 재시작 시 기록이 사라진다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JobStatus = str  # queued | running | succeeded | failed
+
+_lock = Lock()
+_jobs: Dict[str, Dict[str, Any]] = {}
+_executor: Optional[ThreadPoolExecutor] = None
+
+_MAX_CONCURRENCY = int(os.getenv("DEPLOY_MAX_CONCURRENCY", "4"))
+_MAX_FINISHED_JOBS = int(os.getenv("DEPLOY_JOB_RETENTION", "500"))
+
+
+def _now() -> datetime:
+    return datetime.utcnow()
+
+
+def _clone(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {**record}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_MAX_CONCURRENCY, thread_name_prefix="deploy-job")
+        return _executor
+
+
+def _prune_finished() -> None:
+    """완료된 작업이 보관 한도를 넘으면 오래된 것부터 제거한다. (_lock 보유 상태에서 호출)"""
+    finished = [j for j in _jobs.values() if j["status"] in ("succeeded", "failed")]
+    overflow = len(finished) - _MAX_FINISHED_JOBS
+    if overflow <= 0:
+        return
+    finished.sort(key=lambda j: j["finished_at"] or j["created_at"])
+    for job in finished[:overflow]:
+        _jobs.pop(job["job_id"], None)
+
+
+def _update(job_id: str, **fields: Any) -> None:
+    with _lock:
+        record = _jobs.get(job_id)
+        if record is None:
+            return
+        record.update(fields)
+        record["updated_at"] = _now()
+        if fields.get("status") in ("succeeded", "failed"):
+            _prune_finished()
+
+
+def _run(job_id: str, fn: Callable[[], Dict[str, Any]]) -> None:
+    _update(job_id, status="running", started_at=_now())
+    try:
+        result = fn()
+    except Exception as exc:  # noqa: BLE001 - 실패는 job 상태로 노출
+        logger.exception("Deploy job %s failed", job_id)
+        _update(job_id, status="failed", error=str(exc), finished_at=_now())
+        return
+    _update(job_id, status="succeeded", result=result, finished_at=_now())
+
+
+def submit(
+    fn: Callable[[], Dict[str, Any]],
+    *,
+    github_url: str,
+    plan_id: Optional[str] = None,
+    server_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    배포 작업을 큐에 넣고 job 레코드를 반환한다.
+
+    fn 은 워커 스레드에서 실행되며, 반환한 dict 는 job 의 result 로 저장된다.
+    """
+    job_id = uuid.uuid4().hex
+    now = _now()
+    record: Dict[str, Any] = {
+        "job_id": job_id,
+        "github_url": github_url,
+        "plan_id": plan_id,
+        "server_name": server_name,
+        "status": "queued",
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "started_at": None,
+        "finished_at": None,
+    }
+    with _lock:
+        _jobs[job_id] = record
+        snapshot = _clone(record)
+
+    _get_executor().submit(_run, job_id, fn)
+    return snapshot
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        record = _jobs.get(job_id)
+        return _clone(record) if record else None
+
+
+def list_jobs(github_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    with _lock:
+        return [
+            _clone(j) for j in _jobs.values()
+            if github_url is None or j["github_url"] == github_url
+        ]
+
+
+def shutdown(wait: bool = False) -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
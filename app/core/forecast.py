@@ -0,0 +1,147 @@
+"""
+내부 예측 표현 (Forecast) 과 응답 직렬화.
+
+PredictionResult 는 시점마다 PredictionPoint(Pydantic 모델)를 만들기 때문에
+predictor → policy → 추천/이상탐지를 거치는 동안 모델 생성/검증 비용이 반복된다.
+Forecast 는 시작 시각 + 1시간 간격 + float 배열만 보관하고, 공개 JSON 계약
+(PredictionResult) 으로는 응답을 만들 때(edge) 한 번만 변환한다.
+
+- values 는 읽기 전용 배열이므로 캐시/single-flight 로 여러 요청이 공유해도 안전하다.
+- dumps 는 orjson 이 설치되어 있으면 사용하고, 없으면 표준 json 으로 동작한다.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional, Union
+
+import numpy as np
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.models.common import PredictionPoint, PredictionResult
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 선택 의존성
+    orjson = None  # type: ignore[assignment]
+
+HOUR = timedelta(hours=1)
+
+
+def _frozen(values: Any) -> np.ndarray:
+    arr = np.array(values, dtype=float)
+    arr.setflags(write=False)
+    return arr
+
+
+@dataclass(frozen=True, eq=False)
+class Forecast:
+    github_url: str
+    metric_name: str
+    model_version: str
+    generated_at: datetime
+    start: datetime  # 첫 예측 시각
+    values: np.ndarray  # (H,) float64, 읽기 전용
+    step: timedelta = HOUR
+    # 예측 입력 정보 (이력 저장용). predictor 가 모르면 None 이며 DB 에는 NULL 로 남는다
+    sequence_length: Optional[int] = None  # 입력으로 쓴 최근 시점 수 (시간)
+    feature_count: Optional[int] = None  # 시점당 입력 특징 수
+    scale_factor: Optional[float] = None  # predictor 가 적용한 컨텍스트 스케일
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "values", _frozen(self.values))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def times(self) -> list[datetime]:
+        return [self.start + self.step * i for i in range(len(self.values))]
+
+    def replace(self, **changes: Any) -> "Forecast":
+        return dataclasses.replace(self, **changes)
+
+    @classmethod
+    def from_result(cls, pred: PredictionResult) -> "Forecast":
+        points = pred.predictions
+        start = points[0].time if points else pred.generated_at
+        step = points[1].time - points[0].time if len(points) > 1 else HOUR
+        return cls(
+            github_url=pred.github_url,
+            metric_name=pred.metric_name,
+            model_version=pred.model_version,
+            generated_at=pred.generated_at,
+            start=start,
+            values=[p.value for p in points],
+            step=step,
+        )
+
+    def to_result(self) -> PredictionResult:
+        """공개 계약(PredictionResult)으로 변환한다. 값은 이미 검증된 것이므로 검증을 생략한다."""
+        points = [
+            PredictionPoint.model_construct(time=t, value=v)
+            for t, v in zip(self.times, self.values.tolist())
+        ]
+        return PredictionResult.model_construct(
+            github_url=self.github_url,
+            metric_name=self.metric_name,
+            model_version=self.model_version,
+            generated_at=self.generated_at,
+            predictions=points,
+        )
+
+
+PredictionLike = Union[Forecast, PredictionResult]
+
+
+def as_forecast(pred: PredictionLike) -> Forecast:
+    return pred if isinstance(pred, Forecast) else Forecast.from_result(pred)
+
+
+def forecast_values(pred: PredictionLike) -> np.ndarray:
+    """Forecast / PredictionResult 어느 쪽이든 예측값 배열을 반환한다."""
+    if isinstance(pred, Forecast):
+        return pred.values
+    return np.array([p.value for p in pred.predictions], dtype=float)
+
+
+# ----------------------------------------------------------------------
+# 응답 직렬화 (edge)
+# ----------------------------------------------------------------------
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, (np.floating, np.integer)):
+        return obj.item()
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON 바이트로 직렬화한다. Pydantic 모델은 pydantic-core 직렬화기를 그대로 사용한다."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump_json().encode()
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default, ensure_ascii=False).encode()
+
+
+class FastJSONResponse(Response):
+    """
+    response_model 재검증 없이 한 번에 직렬화하는 JSON 응답.
+
+    라우트가 이 응답을 직접 반환하면 FastAPI 는 반환값 검증/직렬화를 건너뛴다.
+    (response_model 은 OpenAPI 문서용으로만 남는다)
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
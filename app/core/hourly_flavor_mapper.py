@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import math
 import os
-import statistics
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Sequence
+from typing import Literal, Optional, Sequence
+
+import numpy as np
 
 from app.models.common import PredictionPoint
 from app.models.hourly_plans import (
@@ -27,40 +30,36 @@ HOURLY_COST: dict[FlavorType, float] = {
 SMALL_MAX = float(os.getenv("HOURLY_FLAVOR_SMALL_MAX", "300"))
 MEDIUM_MAX = float(os.getenv("HOURLY_FLAVOR_MEDIUM_MAX", "900"))
 
+# 비용 최적화(optimal) 모드 파라미터
+#   HOURLY_FLAVOR_RESIZE_PENALTY: 플레이버를 바꿀 때마다 더하는 비용 (리사이즈/마이그레이션 비용 환산, USD)
+#   HOURLY_FLAVOR_HEADROOM: 용량 여유 배수 (예측값 × headroom ≤ 플레이버 상한이어야 함)
+RESIZE_PENALTY = float(os.getenv("HOURLY_FLAVOR_RESIZE_PENALTY", "0.1"))
+HEADROOM = float(os.getenv("HOURLY_FLAVOR_HEADROOM", "1.0"))
 
-def _percentile(values: Sequence[float], pct: float) -> float:
-    """퍼센타일 계산 (리포팅용, 단순 선형 보간)."""
-    if not values:
-        raise ValueError("Cannot compute percentile on empty sequence.")
-    if pct < 0 or pct > 100:
-        raise ValueError("Percentile must be between 0 and 100.")
-
-    sorted_values = sorted(values)
-    k = (len(sorted_values) - 1) * (pct / 100.0)
-    low = int(k)
-    high = min(low + 1, len(sorted_values) - 1)
-
-    if low == high:
-        return float(sorted_values[int(k)])
-
-    weight = k - low
-    return float(sorted_values[low] * (1 - weight) + sorted_values[high] * weight)
+Strategy = Literal["threshold", "optimal"]
 
 
 def compute_breakpoints(values: Sequence[float]) -> FlavorBreakpoints:
     """분포 요약 (디버그/리포팅용)."""
-    if len(values) != 24:
-        raise ValueError(f"Expected 24 hourly predictions, got {len(values)}.")
-
-    p25 = _percentile(values, 25)
-    p50 = _percentile(values, 50)
-    p75 = _percentile(values, 75)
-    mean = statistics.fmean(values)
-    stdev = statistics.pstdev(values)
+    if len(values) == 0:
+        raise ValueError("Expected at least one hourly prediction.")
 
+    p25, p50, p75, mean, stdev = compute_breakpoints_matrix(np.asarray(values, dtype=float)[None, :])[0]
     return FlavorBreakpoints(p25=p25, p50=p50, p75=p75, mean=mean, stdev=stdev)
 
 
+def compute_breakpoints_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    (N, H) 예측 행렬의 행별 분포 요약을 한 번에 계산한다.
+
+    Returns:
+        (N, 5) 배열. 열 순서는 p25, p50, p75, mean, stdev (선형 보간 퍼센타일, 모표준편차).
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    pct = np.percentile(values, [25, 50, 75], axis=1)  # (3, N), 정렬 1회
+    return np.column_stack([pct.T, values.mean(axis=1), values.std(axis=1)])
+
+
 def pick_flavor_by_threshold(value: float) -> FlavorType:
     """고정 임계값 기반 플레이버 선택."""
     if value <= SMALL_MAX:
@@ -70,37 +69,171 @@ def pick_flavor_by_threshold(value: float) -> FlavorType:
     return "large"
 
 
+FLAVORS: tuple[FlavorType, ...] = ("small", "medium", "large")
+_COST_VECTOR = np.array([HOURLY_COST[f] for f in FLAVORS])
+
+
+@dataclass(frozen=True)
+class FlavorMatrix:
+    """map_flavor_matrix 결과. 모든 배열은 (N, H) 또는 (N, ...) 모양."""
+
+    flavor_index: np.ndarray  # (N, H) FLAVORS 인덱스
+    costs: np.ndarray  # (N, H) 시간당 비용
+    totals: np.ndarray  # (N,) 행별 비용 합계
+    percentiles: np.ndarray  # (N, H) 행 안에서의 백분위 순위 (0~1)
+    breakpoints: np.ndarray  # (N, 5) p25, p50, p75, mean, stdev
+
+    def flavors(self, row: int) -> list[FlavorType]:
+        return [FLAVORS[i] for i in self.flavor_index[row]]
+
+
+def _percentile_rank(values: np.ndarray) -> np.ndarray:
+    """
+    행별 백분위 순위 (최솟값 0, 최댓값 1, 동률은 평균 순위). 행마다 정렬 1회로 O(N·H log H).
+
+    정렬된 행에서 같은 값 묶음의 첫/끝 위치를 구하면 평균 순위는 (첫 + 끝) / 2 이다. (rankdata "average" - 1)
+    """
+    n, h = values.shape
+    if h == 1:
+        return np.zeros_like(values)
+    order = np.argsort(values, axis=1, kind="stable")
+    ordered = np.take_along_axis(values, order, axis=1)
+    pos = np.broadcast_to(np.arange(h), (n, h))
+
+    new_group = np.ones((n, h), dtype=bool)
+    new_group[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    first = np.maximum.accumulate(np.where(new_group, pos, 0), axis=1)
+    group_end = np.ones((n, h), dtype=bool)
+    group_end[:, :-1] = new_group[:, 1:]
+    last = np.minimum.accumulate(np.where(group_end, pos, h - 1)[:, ::-1], axis=1)[:, ::-1]
+
+    ranks = np.empty((n, h), dtype=float)
+    np.put_along_axis(ranks, order, (first + last) / 2.0, axis=1)
+    return ranks / (h - 1)
+
+
+def map_flavor_matrix(values: np.ndarray) -> FlavorMatrix:
+    """
+    (N, H) 예측 행렬을 임계값 기반 플레이버/비용/백분위로 한 번에 매핑한다.
+
+    여러 저장소의 비용 계획을 한꺼번에 계산할 때 사용 (Python 루프 / 모델 생성 없음).
+    플레이버 선택 규칙은 pick_flavor_by_threshold 와 같다. (상한 포함)
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    idx = np.searchsorted(np.array([SMALL_MAX, MEDIUM_MAX]), values, side="left")
+    costs = _COST_VECTOR[idx]
+    return FlavorMatrix(
+        flavor_index=idx,
+        costs=costs,
+        totals=costs.sum(axis=1),
+        percentiles=_percentile_rank(values),
+        breakpoints=compute_breakpoints_matrix(values),
+    )
+
+
+def _flavor_capacity(flavor: FlavorType) -> float:
+    """플레이버가 감당하는 예측값 상한 (large 는 상한 없음)."""
+    if flavor == "small":
+        return SMALL_MAX
+    if flavor == "medium":
+        return MEDIUM_MAX
+    return math.inf
+
+
+def optimize_flavor_schedule(
+    values: Sequence[float],
+    *,
+    resize_penalty: Optional[float] = None,
+    headroom: Optional[float] = None,
+) -> list[FlavorType]:
+    """
+    시간별 비용 + 리사이즈 페널티 합을 최소화하는 플레이버 스케줄 (동적 계획법, O(H·F²)).
+
+    각 시간의 플레이버는 value × headroom ≤ 용량 상한을 만족해야 한다.
+    resize_penalty=0, headroom=1 이면 시간별 최저가 선택(= 임계값 방식)과 같다.
+    입력 길이(H)에 제한이 없으므로 24시간보다 긴 구간에도 사용할 수 있다.
+    """
+    penalty = RESIZE_PENALTY if resize_penalty is None else resize_penalty
+    room = HEADROOM if headroom is None else headroom
+    if not values:
+        return []
+
+    flavors: list[FlavorType] = list(HOURLY_COST)
+    capacity = [_flavor_capacity(f) for f in flavors]
+
+    # best[f]: 현재 시간까지 f 로 끝나는 스케줄의 최소 비용, back[h][f]: 직전 시간 플레이버 인덱스
+    best = [HOURLY_COST[f] if values[0] * room <= cap else math.inf for f, cap in zip(flavors, capacity)]
+    back: list[list[int]] = [[-1] * len(flavors)]
+
+    for value in values[1:]:
+        need = value * room
+        nxt = [math.inf] * len(flavors)
+        choice = [-1] * len(flavors)
+        for j, f in enumerate(flavors):
+            if need > capacity[j]:
+                continue
+            for i, prev_cost in enumerate(best):
+                cost = prev_cost + (penalty if i != j else 0.0)
+                if cost < nxt[j]:
+                    nxt[j], choice[j] = cost, i
+            nxt[j] += HOURLY_COST[f]
+        best = nxt
+        back.append(choice)
+
+    j = min(range(len(flavors)), key=lambda k: best[k])
+    schedule: list[FlavorType] = []
+    for h in range(len(values) - 1, -1, -1):
+        schedule.append(flavors[j])
+        j = back[h][j]
+    schedule.reverse()
+    return schedule
+
+
 def map_predictions_to_flavors(
     predictions: Sequence[PredictionPoint],
+    *,
+    strategy: Strategy = "threshold",
 ) -> tuple[list[HourlyFlavorRecommendation], FlavorBreakpoints, float]:
     """
-    24개 예측값을 고정 임계값으로 매핑해 24개 플레이버를 추천한다.
+    H개(예측 구간 길이) 예측값을 플레이버로 매핑해 시간별 플레이버를 추천한다.
+
+    strategy:
+        threshold: 시간별로 고정 임계값에 따라 독립 선택
+        optimal: optimize_flavor_schedule 로 비용 + 리사이즈 페널티 최소 스케줄 선택
 
     Returns:
-        recommendations: 시간별 HourlyFlavorRecommendation 24개
+        recommendations: 시간별 HourlyFlavorRecommendation H개
         breakpoints: 분포 요약(참고용)
-        total_hourly_cost: 24시간 전체 비용 합계
+        total_hourly_cost: 전체 구간 비용 합계
     """
-    if len(predictions) != 24:
-        raise ValueError(f"Expected 24 hourly predictions, got {len(predictions)}.")
+    if len(predictions) == 0:
+        raise ValueError("Expected at least one hourly prediction.")
 
     values = [p.value for p in predictions]
-    breakpoints = compute_breakpoints(values)
+    matrix = map_flavor_matrix(np.asarray(values, dtype=float)[None, :])
+    p25, p50, p75, mean, stdev = matrix.breakpoints[0]
+    breakpoints = FlavorBreakpoints(p25=p25, p50=p50, p75=p75, mean=mean, stdev=stdev)
+
+    if strategy == "optimal":
+        flavors = optimize_flavor_schedule(values)
+    else:
+        flavors = matrix.flavors(0)
 
+    percentiles = matrix.percentiles[0].tolist()
     recommendations: list[HourlyFlavorRecommendation] = []
     total_cost = 0.0
 
-    for hour_idx, point in enumerate(predictions):
-        flavor = pick_flavor_by_threshold(point.value)
+    for hour_idx, (point, flavor) in enumerate(zip(predictions, flavors)):
         hourly_cost = HOURLY_COST[flavor]
         total_cost += hourly_cost
 
+        # 값은 모두 위에서 계산/검증된 것이므로 검증 없이 생성
         recommendations.append(
-            HourlyFlavorRecommendation(
+            HourlyFlavorRecommendation.model_construct(
                 hour_index=hour_idx,
                 timestamp=point.time if isinstance(point.time, datetime) else datetime.fromisoformat(str(point.time)),
                 predicted_value=float(point.value),
-                percentile=0.0,  # 단순 임계값 모드에서는 퍼센타일 미사용
+                percentile=percentiles[hour_idx],  # 예측 구간 안에서의 백분위 순위
                 recommended_flavor=flavor,
                 hourly_cost=hourly_cost,
             )
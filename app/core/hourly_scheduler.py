@@ -0,0 +1,321 @@
+"""
+시간별 플레이버 추천(/hourly-flavor)을 리사이즈 타임라인으로 바꿔 실행하는 스케줄러.
+
+- build_segments: 같은 플레이버가 이어지는 시간을 하나의 구간으로 합친다.
+  min_hold_hours 보다 짧은 구간은 인접 구간 중 큰 플레이버 쪽으로 흡수해
+  (용량을 줄이는 방향으로는 합치지 않음) 잦은 리사이즈(flapping)를 막는다.
+- plan_actions: 구간 경계마다 리사이즈 액션을 만든다. (첫 구간은 현재 플레이버와 다를 때만)
+- 실행기: 등록된 인스턴스별 액션을 정시(hour boundary)마다 깨어나 실행한다.
+  백엔드는 OpenStack resize 또는 로컬 dry-run(HOURLY_SCHEDULE_BACKEND) 중 선택.
+
+프로세스 메모리 기반이므로 projects_store 와 마찬가지로 재시작 시 등록된 스케줄이 사라진다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+from app.core.hourly_flavor_mapper import HOURLY_COST
+from app.models.hourly_plans import (
+    FlavorType,
+    HourlyFlavorRecommendation,
+    ScheduledResize,
+    ScheduleSegment,
+)
+
+logger = logging.getLogger(__name__)
+
+_FLAVOR_RANK: Dict[str, int] = {"small": 0, "medium": 1, "large": 2}
+
+MIN_HOLD_HOURS = int(os.getenv("HOURLY_SCHEDULE_MIN_HOLD_HOURS", "3"))
+# 동시에 진행하는 리사이즈 수. OpenStack 연결 풀(OPENSTACK_POOL_SIZE, 기본 4)보다 작게 둔다.
+MAX_PARALLEL_RESIZES = int(os.getenv("HOURLY_SCHEDULE_MAX_PARALLEL", "3"))
+
+
+# ----------------------------------------------------------------------
+# 타임라인 계산
+# ----------------------------------------------------------------------
+def _merge_equal(runs: List[List[Any]]) -> List[List[Any]]:
+    """[flavor, start, end] 목록에서 인접한 같은 플레이버를 합친다."""
+    merged: List[List[Any]] = []
+    for run in runs:
+        if merged and merged[-1][0] == run[0]:
+            merged[-1][2] = run[2]
+        else:
+            merged.append(list(run))
+    return merged
+
+
+def build_segments(
+    recommendations: Sequence[HourlyFlavorRecommendation],
+    *,
+    min_hold_hours: Optional[int] = None,
+) -> List[ScheduleSegment]:
+    """시간별 추천을 리사이즈 구간으로 합친다."""
+    if not recommendations:
+        return []
+    hold = MIN_HOLD_HOURS if min_hold_hours is None else min_hold_hours
+
+    runs = _merge_equal([[r.recommended_flavor, i, i + 1] for i, r in enumerate(recommendations)])
+
+    # 가장 짧은 구간부터 인접 구간으로 흡수 (구간 수가 매번 줄어들므로 종료 보장)
+    while len(runs) > 1:
+        short = [i for i, (_, start, end) in enumerate(runs) if end - start < hold]
+        if not short:
+            break
+        idx = min(short, key=lambda i: (runs[i][2] - runs[i][1], i))
+        neighbors = [j for j in (idx - 1, idx + 1) if 0 <= j < len(runs)]
+        # 큰 플레이버 쪽(동률이면 더 긴 구간)으로 합쳐 해당 시간의 용량이 줄지 않게 한다
+        target = max(neighbors, key=lambda j: (_FLAVOR_RANK[runs[j][0]], runs[j][2] - runs[j][1]))
+        flavor = max(runs[idx][0], runs[target][0], key=_FLAVOR_RANK.__getitem__)
+        lo, hi = sorted((idx, target))
+        runs[lo:hi + 1] = [[flavor, runs[lo][1], runs[hi][2]]]
+        runs = _merge_equal(runs)
+
+    step = timedelta(hours=1)
+    segments: List[ScheduleSegment] = []
+    for flavor, start, end in runs:
+        hours = end - start
+        segments.append(
+            ScheduleSegment(
+                start_hour=start,
+                end_hour=end,
+                start_time=recommendations[start].timestamp,
+                end_time=recommendations[end - 1].timestamp + step,
+                flavor=flavor,
+                hours=hours,
+                cost=round(hours * HOURLY_COST[flavor], 3),
+            )
+        )
+    return segments
+
+
+def plan_actions(
+    segments: Sequence[ScheduleSegment],
+    *,
+    instance_id: Optional[str] = None,
+    current_flavor: Optional[FlavorType] = None,
+) -> List[ScheduledResize]:
+    """구간 시작 시각마다 플레이버가 바뀌는 경우에만 리사이즈 액션을 만든다."""
+    actions: List[ScheduledResize] = []
+    prev = current_flavor
+    for seg in segments:
+        if seg.flavor != prev:
+            actions.append(
+                ScheduledResize(at=seg.start_time, instance_id=instance_id, from_flavor=prev, to_flavor=seg.flavor)
+            )
+        prev = seg.flavor
+    return actions
+
+
+def planned_cost(segments: Sequence[ScheduleSegment], hours: Optional[int] = None) -> float:
+    """구간대로 운영할 때 비용. hours 를 주면 처음 hours 시간만 센다."""
+    if hours is None:
+        return round(sum(seg.hours * HOURLY_COST[seg.flavor] for seg in segments), 3)
+    return round(
+        sum(max(0, min(seg.end_hour, hours) - seg.start_hour) * HOURLY_COST[seg.flavor] for seg in segments), 3
+    )
+
+
+# ----------------------------------------------------------------------
+# 리사이즈 백엔드
+# ----------------------------------------------------------------------
+class ResizeBackend(Protocol):
+    def resize(self, instance_id: str, flavor_name: str) -> bool:
+        """리사이즈를 수행하고, 이미 해당 플레이버라 건너뛰었으면 False 를 반환한다."""
+        ...
+
+
+class DryRunResizeBackend:
+    """OpenStack 없이 로컬에서 스케줄을 확인하기 위한 백엔드. 호출 기록만 남긴다."""
+
+    def __init__(self) -> None:
+        self.calls: List[tuple[str, str]] = []
+
+    def resize(self, instance_id: str, flavor_name: str) -> bool:
+        logger.info("[dry-run] resize %s -> %s", instance_id, flavor_name)
+        self.calls.append((instance_id, flavor_name))
+        return True
+
+
+class OpenStackResizeBackend:
+    """Nova resize → VERIFY_RESIZE 대기 → confirm 순서로 리사이즈한다."""
+
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        self.timeout = float(os.getenv("HOURLY_SCHEDULE_RESIZE_TIMEOUT", "900")) if timeout is None else timeout
+
+    def resize(self, instance_id: str, flavor_name: str) -> bool:
+        from app.core.openstack.catalog import get_catalog
+        from app.core.openstack.client import get_connection
+        from app.core.openstack.deployer import wait_for_status
+
+        # 연결은 API 호출 동안만 빌린다. 상태 대기(최대 timeout × 2)는 짧은 조회로 한다.
+        with get_connection() as conn:
+            server = conn.compute.get_server(instance_id)  # type: ignore
+            flavor = getattr(server, "flavor", None)
+            current = getattr(flavor, "original_name", None) or getattr(flavor, "name", None)
+            if current == flavor_name:
+                return False
+
+            flv = get_catalog().resolve_flavor(flavor_name) or conn.compute.find_flavor(  # type: ignore
+                flavor_name, ignore_missing=False
+            )
+            conn.compute.resize_server(server, flv.id)  # type: ignore
+        server = wait_for_status(instance_id, "VERIFY_RESIZE", timeout=self.timeout)
+        with get_connection() as conn:
+            conn.compute.confirm_server_resize(server)  # type: ignore
+        wait_for_status(instance_id, "ACTIVE", timeout=self.timeout)
+        return True
+
+
+def default_backend() -> ResizeBackend:
+    """HOURLY_SCHEDULE_BACKEND=openstack|dryrun. 미지정 시 OpenStack 설정 여부로 결정."""
+    name = os.getenv("HOURLY_SCHEDULE_BACKEND")
+    if name is None:
+        from app.core.openstack.client import is_openstack_configured
+
+        name = "openstack" if is_openstack_configured() else "dryrun"
+    if name.strip().lower() == "openstack":
+        return OpenStackResizeBackend()
+    return DryRunResizeBackend()
+
+
+# ----------------------------------------------------------------------
+# 실행기 (인스턴스별 스케줄 등록 + 정시 실행)
+# ----------------------------------------------------------------------
+_lock = threading.Lock()
+_schedules: Dict[str, Dict[str, Any]] = {}
+_backend: Optional[ResizeBackend] = None
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def set_backend(backend: Optional[ResizeBackend]) -> None:
+    """실행 백엔드를 교체한다. (None 이면 다음 실행 시 default_backend 로 다시 결정)"""
+    global _backend
+    with _lock:
+        _backend = backend
+
+
+def _get_backend() -> ResizeBackend:
+    global _backend
+    with _lock:
+        if _backend is None:
+            _backend = default_backend()
+        return _backend
+
+
+def register(
+    *,
+    instance_id: str,
+    github_url: str,
+    actions: Sequence[ScheduledResize],
+    runtime_env: str = "prod",
+) -> Dict[str, Any]:
+    """인스턴스의 스케줄을 등록한다. 기존 스케줄의 미실행 액션은 새 스케줄로 대체된다."""
+    record = {
+        "instance_id": instance_id,
+        "github_url": github_url,
+        "runtime_env": runtime_env,
+        "actions": [a.model_copy(update={"instance_id": instance_id}) for a in actions],
+        "registered_at": datetime.utcnow(),
+    }
+    with _lock:
+        _schedules[instance_id] = record
+        return {**record, "actions": list(record["actions"])}
+
+
+def get_schedule(instance_id: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        record = _schedules.get(instance_id)
+        return {**record, "actions": list(record["actions"])} if record else None
+
+
+def cancel(instance_id: str) -> bool:
+    with _lock:
+        return _schedules.pop(instance_id, None) is not None
+
+
+def run_due(now: Optional[datetime] = None, *, max_parallel: Optional[int] = None) -> int:
+    """
+    now 시각까지 도래한 pending 액션을 실행한다. 실행한 액션 수를 반환.
+
+    인스턴스마다 가장 최근에 도래한 액션만 실행하고 그 이전 것은 skipped 처리한다.
+    (실행기가 멈춰 있던 사이 지난 구간을 순서대로 되감아 리사이즈하지 않도록)
+    인스턴스들은 최대 max_parallel(HOURLY_SCHEDULE_MAX_PARALLEL) 개씩 동시에 리사이즈한다.
+    """
+    from app.core.openstack.flavor_mapper import get_openstack_flavor
+
+    now = now or datetime.utcnow()
+    with _lock:
+        due: List[tuple[Dict[str, Any], int]] = []
+        for record in _schedules.values():
+            idxs = [i for i, a in enumerate(record["actions"]) if a.status == "pending" and a.at <= now]
+            if not idxs:
+                continue
+            for i in idxs[:-1]:
+                record["actions"][i] = record["actions"][i].model_copy(update={"status": "skipped"})
+            due.append((record, idxs[-1]))
+
+    if not due:
+        return 0
+
+    backend = _get_backend()
+
+    def _run(record: Dict[str, Any], idx: int) -> None:
+        action: ScheduledResize = record["actions"][idx]
+        try:
+            flavor_name = get_openstack_flavor(action.to_flavor, runtime_env=record["runtime_env"])
+            changed = backend.resize(record["instance_id"], flavor_name)
+            update = {"status": "done" if changed else "skipped"}
+        except Exception as exc:  # noqa: BLE001 - 실패는 액션 상태로 노출
+            logger.exception("Scheduled resize failed for %s", record["instance_id"])
+            update = {"status": "failed", "error": str(exc)}
+        with _lock:
+            if _schedules.get(record["instance_id"]) is record:
+                record["actions"][idx] = action.model_copy(update=update)
+
+    # 인스턴스별 리사이즈는 서로 독립이므로 동시에 진행한다 (한 대의 대기가 다른 인스턴스의 정시를 밀지 않도록)
+    workers = max(1, min(len(due), max_parallel or MAX_PARALLEL_RESIZES))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hourly-resize") as pool:
+        for _ in pool.map(lambda item: _run(*item), due):
+            pass
+    return len(due)
+
+
+def _seconds_until_next_hour(now: datetime) -> float:
+    next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    return max((next_hour - now).total_seconds(), 1.0)
+
+
+def _loop() -> None:
+    while not _stop.is_set():
+        try:
+            run_due()
+        except Exception:
+            logger.exception("Hourly schedule run failed (will retry)")
+        _stop.wait(_seconds_until_next_hour(datetime.utcnow()))
+
+
+def start() -> None:
+    """정시마다 깨어나는 실행 스레드를 시작한다. 이미 실행 중이면 무시."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_loop, name="hourly-scheduler", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
@@ -0,0 +1,115 @@
+"""
+서비스(github_url) / 메트릭(metric_name) 사전 테이블 ID 조회.
+
+시계열 테이블(metric_history, 롤업, predictions)은 문자열 대신 services.service_id /
+metrics.metric_id 정수를 저장한다. ID 는 한 번 부여되면 바뀌거나 재사용되지 않으므로
+프로세스 메모리에 캐시하고, 캐시에 없는 값만 DB 에서 조회한다.
+
+- bind 는 Engine / Connection / Session 어느 것이든 된다. 조회·등록은 bind 의 Engine 에서
+  별도 연결로 수행한다. 등록(INSERT IGNORE)은 즉시 커밋되므로 호출자 트랜잭션이 롤백돼도
+  캐시에 존재하지 않는 ID 가 남지 않는다.
+- 캐시는 Engine 별로 둔다. (테스트/스크립트가 여러 DB 를 쓰는 경우)
+- create=False 이면 등록하지 않고 이미 있는 ID 만 돌려준다. (조회 경로: 없는 값 = 데이터 없음)
+  없는 값도 ID_REGISTRY_MISS_TTL 초 동안 캐시해 같은 미등록 키 조회가 매번 DB 로 가지 않게 한다.
+  같은 프로세스에서 create=True 로 등록되면 바로 지워지고, 다른 프로세스의 등록은 TTL 후 보인다.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import Column, Table, select
+
+from app.core.bulk_writer import insert_rows
+from app.core.persistence_models import Metric, Service
+
+_lock = threading.Lock()
+_caches: "weakref.WeakKeyDictionary[Any, Dict[str, Dict[str, int]]]" = weakref.WeakKeyDictionary()
+# 미등록 키 → 만료 시각 (monotonic). create=False 조회 결과가 없을 때만 기록한다
+_misses: "weakref.WeakKeyDictionary[Any, Dict[str, Dict[str, float]]]" = weakref.WeakKeyDictionary()
+
+_MISS_TTL = float(os.getenv("ID_REGISTRY_MISS_TTL", "30"))
+
+
+def _engine(bind: Any) -> Any:
+    if hasattr(bind, "get_bind"):  # Session
+        bind = bind.get_bind()
+    return bind.engine  # Connection.engine / Engine.engine(자기 자신)
+
+
+def _resolve(bind: Any, table: Table, key: Column, id_col: Column, keys: Iterable[str], create: bool) -> Dict[str, int]:
+    wanted = list(dict.fromkeys(keys))
+    engine = _engine(bind)
+    now = time.monotonic()
+    with _lock:
+        cache = _caches.setdefault(engine, {}).setdefault(table.name, {})
+        misses = _misses.setdefault(engine, {}).setdefault(table.name, {})
+        out = {k: cache[k] for k in wanted if k in cache}
+        # create=True 는 미등록 캐시를 무시하고 등록한다
+        missing = [k for k in wanted if k not in out and (create or misses.get(k, 0.0) <= now)]
+    if not missing:
+        return out
+
+    with engine.begin() as conn:
+        if create:
+            insert_rows(conn, table, ({key.name: k} for k in missing), ignore_duplicates=True)
+        found = {k: i for k, i in conn.execute(select(key, id_col).where(key.in_(missing)))}
+    with _lock:
+        cache.update(found)
+        for k in missing:
+            if k in found:
+                misses.pop(k, None)
+            elif _MISS_TTL > 0:
+                misses[k] = now + _MISS_TTL
+    out.update(found)
+    return out
+
+
+def service_ids(bind: Any, github_urls: Iterable[str], *, create: bool = True) -> Dict[str, int]:
+    """{github_url: service_id}. create=False 이면 미등록 URL 은 결과에서 빠진다."""
+    t = Service.__table__
+    return _resolve(bind, t, t.c.github_url, t.c.service_id, github_urls, create)
+
+
+def metric_ids(bind: Any, metric_names: Iterable[str], *, create: bool = True) -> Dict[str, int]:
+    """{metric_name: metric_id}. create=False 이면 미등록 메트릭은 결과에서 빠진다."""
+    t = Metric.__table__
+    return _resolve(bind, t, t.c.metric_name, t.c.metric_id, metric_names, create)
+
+
+def service_id(bind: Any, github_url: str, *, create: bool = True) -> Optional[int]:
+    return service_ids(bind, [github_url], create=create).get(github_url)
+
+
+def metric_id(bind: Any, metric_name: str, *, create: bool = True) -> Optional[int]:
+    return metric_ids(bind, [metric_name], create=create).get(metric_name)
+
+
+def history_rows(bind: Any, points: Iterable[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    {"github_url", "metric_name", "ts", "value"} 점들을 metric_history 행으로 바꾼다.
+
+    처음 보는 서비스/메트릭은 등록한다. (점 목록 전체를 한 번에 조회)
+    """
+    points = list(points)
+    sids = service_ids(bind, [p["github_url"] for p in points])
+    mids = metric_ids(bind, [p["metric_name"] for p in points])
+    return [
+        {
+            "service_id": sids[p["github_url"]],
+            "metric_id": mids[p["metric_name"]],
+            "ts": p["ts"],
+            "value": float(p["value"]),
+        }
+        for p in points
+    ]
+
+
+def clear_cache() -> None:
+    with _lock:
+        _caches.clear()
+        _misses.clear()
@@ -1,7 +1,15 @@
 """
-SQLAlchemy ORM 모델: metric_history (LSTM feature 시계열)
+SQLAlchemy ORM 모델: metric_history (LSTM feature 시계열) + 시간/일 단위 롤업
+
+- metric_history 의 PK 는 (service_id, metric_id, ts) 이다. InnoDB 클러스터드 인덱스가
+  예측 조회 패턴(service=?, metric=?, ts BETWEEN) 과 그대로 일치하므로 보조 인덱스 없이
+  범위 스캔 한 번으로 value 까지 읽는다. (MySQL 에서는 ts 기준 월별 RANGE 파티션, db/schema_unified.sql)
+- github_url / metric_name 문자열 대신 services / metrics 사전 테이블의 정수 ID 를 저장한다.
+  (id_registry) 파티션 테이블은 외래키를 지원하지 않으므로 FK 제약은 두지 않는다.
+- metric_history_hourly / metric_history_daily 는 (count, sum, min, max) 롤업이다. 평균은 sum / count.
+  갱신/보존 주기는 app/core/metric_rollup.py 참고.
 """
-from sqlalchemy import Column, BigInteger, String, DateTime, Float, TIMESTAMP, UniqueConstraint, Index
+from sqlalchemy import Column, DateTime, Float, Integer, PrimaryKeyConstraint, SmallInteger, TIMESTAMP
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
@@ -10,23 +18,47 @@ Base = declarative_base()
 class MetricHistory(Base):
     __tablename__ = "metric_history"
     __table_args__ = (
-        UniqueConstraint("github_url", "ts", "metric_name", name="uk_metric"),
-        Index("idx_github_url", "github_url"),
-        Index("idx_metric_name", "metric_name"),
-        Index("idx_ts", "ts"),
+        PrimaryKeyConstraint("service_id", "metric_id", "ts", name="pk_metric_history"),
         {"mysql_engine": "InnoDB", "mysql_comment": "LSTM feature_names 전체를 저장하는 시계열 테이블"}
     )
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True, comment="row id")
-    github_url = Column(String(200), nullable=False, comment="서비스 구분자")
+    service_id = Column(Integer, nullable=False, comment="services.service_id")
+    metric_id = Column(SmallInteger, nullable=False, comment="metrics.metric_id (feature)")
     ts = Column(DateTime, nullable=False, comment="타임스탬프 (UTC)")
-    metric_name = Column(String(100), nullable=False, comment="feature 이름")
     value = Column(Float, nullable=False, comment="feature 값")
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow, comment="적재 시각")
 
+
+class _RollupColumns:
+    service_id = Column(Integer, nullable=False)
+    metric_id = Column(SmallInteger, nullable=False)
+    bucket_ts = Column(DateTime, nullable=False, comment="구간 시작 시각 (UTC)")
+    sample_count = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+
+
+class MetricHistoryHourly(_RollupColumns, Base):
+    __tablename__ = "metric_history_hourly"
+    __table_args__ = (
+        PrimaryKeyConstraint("service_id", "metric_id", "bucket_ts", name="pk_metric_history_hourly"),
+        {"mysql_engine": "InnoDB", "mysql_comment": "metric_history 시간 단위 롤업"}
+    )
+
+
+class MetricHistoryDaily(_RollupColumns, Base):
+    __tablename__ = "metric_history_daily"
+    __table_args__ = (
+        PrimaryKeyConstraint("service_id", "metric_id", "bucket_ts", name="pk_metric_history_daily"),
+        {"mysql_engine": "InnoDB", "mysql_comment": "metric_history 일 단위 롤업"}
+    )
+
 # 사용 예시:
-# from app.core.db import get_session
+# from app.core.db_sqlalchemy import session_scope
+# from app.core import id_registry
 # from .metric_history import MetricHistory
-# with get_session() as session:
-#     session.add(MetricHistory(github_url="https://github.com/xxx", ts=datetime.utcnow(), metric_name="avg_cpu", value=0.5))
-#     session.commit()
+# with session_scope() as session:
+#     sid = id_registry.service_id(session, "https://github.com/xxx")
+#     mid = id_registry.metric_id(session, "avg_cpu")
+#     session.add(MetricHistory(service_id=sid, metric_id=mid, ts=datetime.utcnow(), value=0.5))
@@ -0,0 +1,185 @@
+"""
+/metrics/ingest 로 들어온 메트릭 점의 버퍼링 적재.
+
+요청 경로에서는 검증된 점을 메모리 버퍼에 넣기만 하고(submit, 비차단), 백그라운드 스레드가
+METRIC_INGEST_BATCH_SIZE 개가 모이거나 첫 점이 들어온 뒤 METRIC_INGEST_FLUSH_MS 가 지나면
+데이터 소스의 append() 로 한 번에 적재한다. (prediction_persister 와 같은 write-behind 구조)
+
+- 적재 대상은 현재 DATA_SOURCE_BACKEND 의 DataSource.append (mysql / sqlite). CSV 는 쓰기를
+  지원하지 않으므로 시작하지 않는다.
+- 적재가 끝나면 배치에 포함된 저장소의 plan_cache 를 무효화해 다음 예측이 새 데이터를 읽는다.
+- 버퍼가 METRIC_INGEST_MAX_BUFFERED 를 넘으면 요청 전체를 거절한다. (라우트에서 429, back-pressure)
+  적재가 밀리면 버퍼가 차므로 에이전트가 재시도 간격을 늘린다.
+- 적재 실패한 배치는 재시도하지 않고 로그/카운터만 남긴다. (같은 점 재전송은 무시되므로 안전)
+
+METRIC_INGEST_ENABLED=1 일 때만 앱 시작 시 켜진다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from app.core import plan_cache
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = int(os.getenv("METRIC_INGEST_BATCH_SIZE", "5000"))
+_FLUSH_MS = int(os.getenv("METRIC_INGEST_FLUSH_MS", "1000"))
+_MAX_BUFFERED = int(os.getenv("METRIC_INGEST_MAX_BUFFERED", "200000"))
+
+Writer = Callable[[List[Mapping[str, Any]]], Any]
+
+
+def is_enabled() -> bool:
+    return os.getenv("METRIC_INGEST_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+
+
+_cond = threading.Condition()
+_buffer: List[Mapping[str, Any]] = []
+_first_at: Optional[float] = None  # 버퍼가 비어 있다가 처음 점이 들어온 시각 (monotonic)
+_max_buffered = _MAX_BUFFERED
+_flush_ms = _FLUSH_MS
+_stats: Dict[str, Any] = {"accepted": 0, "rejected": 0, "written": 0, "failed": 0, "batches": 0, "last_flush": None}
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def is_running() -> bool:
+    return _thread is not None
+
+
+def submit(points: List[Mapping[str, Any]]) -> Optional[int]:
+    """
+    점들을 버퍼에 넣고 버퍼 크기를 반환한다.
+
+    버퍼가 가득 차면 아무것도 넣지 않고 None. (요청 단위로 전부 받거나 전부 거절)
+    """
+    global _first_at
+    with _cond:
+        if len(_buffer) + len(points) > _max_buffered:
+            _stats["rejected"] += len(points)
+            return None
+        if not _buffer:
+            _first_at = time.monotonic()
+        _buffer.extend(points)
+        _stats["accepted"] += len(points)
+        _cond.notify()
+        return len(_buffer)
+
+
+def _flush(batch: List[Mapping[str, Any]], writer: Writer) -> None:
+    try:
+        writer(batch)
+    except Exception:
+        with _cond:
+            _stats["failed"] += len(batch)
+        logger.exception("Metric ingest flush failed (%d points dropped)", len(batch))
+        return
+    finally:
+        with _cond:
+            _stats["last_flush"] = datetime.utcnow()
+    # 커밋 이후에 무효화해야 다음 예측이 방금 적재한 점을 읽는다
+    for url in {p["github_url"] for p in batch}:
+        plan_cache.invalidate(url)
+    with _cond:
+        _stats["written"] += len(batch)
+        _stats["batches"] += 1
+
+
+def _take(batch_size: int) -> List[Mapping[str, Any]]:
+    global _first_at
+    batch = _buffer[:batch_size]
+    del _buffer[:batch_size]
+    # 남은 점은 바로 다음 배치 대상이므로 대기 시작 시각을 지금으로 둔다
+    _first_at = time.monotonic() if _buffer else None
+    return batch
+
+
+def _loop(writer: Writer, batch_size: int, flush_ms: int) -> None:
+    while not _stop.is_set():
+        with _cond:
+            # batch_size 가 차거나, 첫 점부터 flush_ms 가 지날 때까지 기다린다
+            while not _stop.is_set():
+                if len(_buffer) >= batch_size:
+                    break
+                if _buffer:
+                    remaining = _first_at + flush_ms / 1000.0 - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    _cond.wait(timeout=remaining)
+                else:
+                    _cond.wait(timeout=0.2)
+            batch = _take(batch_size)
+        if batch:
+            _flush(batch, writer)
+
+    # 종료 시 남은 점을 best-effort 로 적재
+    while True:
+        with _cond:
+            batch = _take(batch_size)
+        if not batch:
+            break
+        _flush(batch, writer)
+
+
+def start(
+    *,
+    writer: Optional[Writer] = None,
+    batch_size: Optional[int] = None,
+    flush_ms: Optional[int] = None,
+    max_buffered: Optional[int] = None,
+) -> bool:
+    """
+    백그라운드 적재 스레드를 시작한다. 이미 실행 중이면 무시.
+
+    writer 기본값은 get_data_source().append. 쓰기를 지원하지 않는 백엔드면 시작하지 않고 False.
+    """
+    global _thread, _max_buffered, _flush_ms
+    if _thread is not None and _thread.is_alive():
+        return True
+    if writer is None:
+        from app.core.predictor.data_sources import DataSource, get_data_source
+
+        source = get_data_source()
+        if type(source).append is DataSource.append:
+            logger.warning("Metric ingest disabled: %s does not support append", type(source).__name__)
+            return False
+        writer = source.append
+    _max_buffered = max_buffered or _MAX_BUFFERED
+    _flush_ms = flush_ms if flush_ms is not None else _FLUSH_MS
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_loop,
+        args=(writer, max(1, batch_size or _BATCH_SIZE), _flush_ms),
+        name="metric-ingest",
+        daemon=True,
+    )
+    _thread.start()
+    return True
+
+
+def stop(timeout: float = 10.0) -> None:
+    """스레드를 멈추고 버퍼에 남은 점을 적재한 뒤 반환한다."""
+    global _thread
+    _stop.set()
+    with _cond:
+        _cond.notify_all()
+    if _thread is not None:
+        _thread.join(timeout=timeout)
+        _thread = None
+
+
+def retry_after_seconds() -> int:
+    """429 응답의 Retry-After. 한 번 flush 될 시간 이상은 기다리게 한다."""
+    return max(1, -(-_flush_ms // 1000))
+
+
+def stats() -> Dict[str, Any]:
+    with _cond:
+        return {**_stats, "buffered": len(_buffer), "max_buffered": _max_buffered, "running": _thread is not None}
@@ -0,0 +1,240 @@
+"""
+metric_history 롤업 갱신과 보존(retention).
+
+롤업 (증분 갱신)
+- refresh_rollups(conn, start, end) 는 [start, end] 에 걸친 시간/일 구간만 다시 계산한다.
+  해당 구간 롤업 행을 지우고 원본에서 GROUP BY 로 다시 채우므로 여러 번 실행해도 결과가 같다.
+- 시간 롤업은 metric_history 에서, 일 롤업은 시간 롤업에서 계산한다. (원본을 두 번 읽지 않음)
+- scripts/ingest_metric_history.py 는 청크를 커밋할 때마다 그 청크의 ts 범위로 호출한다.
+
+보존
+- MySQL 파티션 테이블: 상한이 cutoff 이하인 월 파티션은 DROP PARTITION (즉시, undo 로그 없음),
+  남은 경계 월의 행은 LIMIT 배치 DELETE (배치마다 커밋). ensure_future_partitions 로 p_future 를
+  미리 쪼개 둔다.
+- 그 외(SQLite, 파티션 없는 테이블): 배치 DELETE 만 사용한다.
+- 실행 진입점: scripts/metric_history_retention.py
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import and_, delete, func, insert, select, text
+
+from app.core.metric_history import MetricHistory, MetricHistoryDaily, MetricHistoryHourly
+
+logger = logging.getLogger(__name__)
+
+RAW_TABLE = MetricHistory.__tablename__
+FUTURE_PARTITION = "p_future"
+_MONTH_PARTITION = re.compile(r"^p(\d{4})(\d{2})$")
+
+
+# ----------------------------------------------------------------------
+# 롤업
+# ----------------------------------------------------------------------
+def floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(ts: datetime) -> datetime:
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _bucket(col, unit: str, dialect: str):
+    """ts 를 시간/일 구간 시작 시각으로 내림하는 SQL 식."""
+    if dialect == "mysql":
+        return func.date_format(col, "%Y-%m-%d %H:00:00" if unit == "hour" else "%Y-%m-%d 00:00:00")
+    # SQLite: SQLAlchemy DateTime 저장 형식(마이크로초 포함 문자열)과 맞춰야 범위 비교가 맞다
+    return func.strftime("%Y-%m-%d %H:00:00.000000" if unit == "hour" else "%Y-%m-%d 00:00:00.000000", col)
+
+
+def _refresh(conn: Any, target, source, *, unit: str, start: datetime, end: datetime, service_id: Optional[int]) -> int:
+    """target 의 [start, end) 구간 행을 source 로부터 다시 계산한다. 새로 쓴 행 수를 반환."""
+    t, s = target.__table__, source.__table__
+    from_rollup = "bucket_ts" in s.c
+    ts_col = s.c.bucket_ts if from_rollup else s.c.ts
+
+    cond = [ts_col >= start, ts_col < end]
+    t_cond = [t.c.bucket_ts >= start, t.c.bucket_ts < end]
+    if service_id is not None:
+        cond.append(s.c.service_id == service_id)
+        t_cond.append(t.c.service_id == service_id)
+
+    bucket = _bucket(ts_col, unit, conn.dialect.name).label("bucket_ts")
+    if from_rollup:
+        aggs = [
+            func.sum(s.c.sample_count), func.sum(s.c.value_sum), func.min(s.c.value_min), func.max(s.c.value_max)
+        ]
+    else:
+        aggs = [func.count(), func.sum(s.c.value), func.min(s.c.value), func.max(s.c.value)]
+    query = (
+        select(s.c.service_id, s.c.metric_id, bucket, *aggs)
+        .where(and_(*cond))
+        .group_by(s.c.service_id, s.c.metric_id, bucket)
+    )
+
+    conn.execute(delete(t).where(and_(*t_cond)))
+    result = conn.execute(
+        insert(t).from_select(
+            ["service_id", "metric_id", "bucket_ts", "sample_count", "value_sum", "value_min", "value_max"], query
+        )
+    )
+    return max(result.rowcount or 0, 0)
+
+
+def refresh_rollups(
+    conn: Any,
+    start: datetime,
+    end: datetime,
+    *,
+    service_id: Optional[int] = None,
+) -> dict[str, int]:
+    """
+    원본 ts 가 [start, end] 에 걸친 시간/일 구간을 다시 계산한다. (트랜잭션은 호출자 책임)
+    service_id 를 주면 해당 서비스만 갱신한다.
+    """
+    h_start, h_end = floor_hour(start), floor_hour(end) + timedelta(hours=1)
+    d_start, d_end = floor_day(start), floor_day(end) + timedelta(days=1)
+    hourly = _refresh(
+        conn, MetricHistoryHourly, MetricHistory, unit="hour", start=h_start, end=h_end, service_id=service_id
+    )
+    daily = _refresh(
+        conn, MetricHistoryDaily, MetricHistoryHourly, unit="day", start=d_start, end=d_end, service_id=service_id
+    )
+    return {"hourly": hourly, "daily": daily}
+
+
+# ----------------------------------------------------------------------
+# 파티션 / 보존
+# ----------------------------------------------------------------------
+def _next_month(d: date) -> date:
+    return date(d.year + (d.month == 12), d.month % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """'p202501' -> date(2025, 1, 1). 월 파티션이 아니면 None."""
+    m = _MONTH_PARTITION.match(name)
+    return date(int(m.group(1)), int(m.group(2)), 1) if m else None
+
+
+def future_partitions_sql(existing: Iterable[str], now: datetime, months_ahead: int, table: str = RAW_TABLE) -> Optional[str]:
+    """
+    now 가 속한 달부터 months_ahead 개월 뒤까지 월 파티션이 있도록 p_future 를 쪼개는 DDL.
+    이미 충분하면 None.
+    """
+    months = sorted(m for m in (partition_month(n) for n in existing) if m is not None)
+    target = date(now.year, now.month, 1)
+    for _ in range(months_ahead):
+        target = _next_month(target)
+
+    month = _next_month(months[-1]) if months else date(now.year, now.month, 1)
+    parts = []
+    while month <= target:
+        upper = _next_month(month)
+        parts.append(f"PARTITION {partition_name(month)} VALUES LESS THAN ('{upper.isoformat()}')")
+        month = upper
+    if not parts:
+        return None
+    parts.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO (\n  " + ",\n  ".join(parts) + "\n)"
+
+
+def expired_partitions(existing: Iterable[str], cutoff: datetime) -> list[str]:
+    """상한(다음 달 1일)이 cutoff 이하인, 즉 모든 행이 cutoff 이전인 월 파티션."""
+    out = []
+    for name in existing:
+        month = partition_month(name)
+        if month is not None and datetime.combine(_next_month(month), datetime.min.time()) <= cutoff:
+            out.append(name)
+    return sorted(out)
+
+
+def list_partitions(conn: Any, table: str = RAW_TABLE) -> list[str]:
+    """MySQL 파티션 이름 목록. 파티션이 없거나 MySQL 이 아니면 빈 리스트."""
+    if conn.dialect.name != "mysql":
+        return []
+    rows = conn.execute(
+        text(
+            """
+            SELECT PARTITION_NAME FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+            """
+        ),
+        {"table": table},
+    ).scalars()
+    return list(rows)
+
+
+def ensure_future_partitions(conn: Any, *, months_ahead: int = 3, now: Optional[datetime] = None) -> list[str]:
+    """부족한 미래 월 파티션을 만든다. 만든 파티션 이름을 반환. (파티션 테이블이 아니면 아무것도 하지 않음)"""
+    existing = list_partitions(conn)
+    if FUTURE_PARTITION not in existing:
+        return []
+    ddl = future_partitions_sql(existing, now or datetime.utcnow(), months_ahead)
+    if ddl is None:
+        return []
+    conn.execute(text(ddl))
+    return [n for n in list_partitions(conn) if n not in existing]
+
+
+def purge_before(engine: Any, table, ts_col, cutoff: datetime, *, batch_size: int = 10_000) -> int:
+    """
+    ts_col < cutoff 행을 지운다. MySQL 은 LIMIT 배치마다 트랜잭션을 커밋해 잠금/undo 크기를 제한한다.
+    (engine 을 받아 배치마다 engine.begin() 으로 새 트랜잭션을 연다)
+    """
+    if engine.dialect.name != "mysql":
+        with engine.begin() as conn:
+            return max(conn.execute(delete(table).where(ts_col < cutoff)).rowcount or 0, 0)
+    total = 0
+    stmt = text(f"DELETE FROM {table.name} WHERE {ts_col.name} < :cutoff LIMIT {int(batch_size)}")
+    while True:
+        with engine.begin() as conn:
+            deleted = conn.execute(stmt, {"cutoff": cutoff}).rowcount or 0
+        total += deleted
+        if deleted < batch_size:
+            return total
+
+
+def apply_retention(
+    engine: Any,
+    *,
+    raw_days: Optional[int],
+    hourly_days: Optional[int],
+    daily_days: Optional[int],
+    now: Optional[datetime] = None,
+    batch_size: int = 10_000,
+) -> dict[str, Any]:
+    """
+    보존 기간이 지난 데이터를 지운다. days 가 None 이면 해당 테이블은 보존 무제한.
+    원본은 먼저 만료된 파티션을 DROP 하고, 남은 행만 DELETE 한다.
+    트랜잭션은 단계/배치마다 따로 열고 커밋한다. (하나의 긴 트랜잭션으로 묶지 않음)
+    """
+    now = now or datetime.utcnow()
+    report: dict[str, Any] = {"dropped_partitions": [], "raw": 0, "hourly": 0, "daily": 0}
+
+    if raw_days is not None:
+        cutoff = now - timedelta(days=raw_days)
+        with engine.begin() as conn:
+            expired = expired_partitions(list_partitions(conn), cutoff)
+            if expired:
+                conn.execute(text(f"ALTER TABLE {RAW_TABLE} DROP PARTITION {', '.join(expired)}"))
+        report["dropped_partitions"] = expired
+        t = MetricHistory.__table__
+        report["raw"] = purge_before(engine, t, t.c.ts, cutoff, batch_size=batch_size)
+
+    for key, days, model in (("hourly", hourly_days, MetricHistoryHourly), ("daily", daily_days, MetricHistoryDaily)):
+        if days is not None:
+            t = model.__table__
+            report[key] = purge_before(engine, t, t.c.bucket_ts, now - timedelta(days=days), batch_size=batch_size)
+
+    logger.info("metric_history retention: %s", report)
+    return report
@@ -10,6 +10,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Literal
 
+import numpy as np
+
 
 MetricKind = Literal["ratio", "count"]
 
@@ -31,6 +33,11 @@ class MetricMeta:
             return self.clamp_max
         return value
 
+    def clamp_array(self, values: np.ndarray) -> np.ndarray:
+        """clamp 의 배열 버전. (NaN 은 0.0)"""
+        out = np.nan_to_num(np.asarray(values, dtype=float), nan=0.0)
+        return np.clip(out, self.clamp_min, self.clamp_max)
+
     def normalize_for_planning(self, value: float) -> float:
         """
         flavor 추천을 위한 값(0~1 스케일)을 반환한다.
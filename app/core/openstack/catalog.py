@@ -0,0 +1,147 @@
+# app/core/openstack/catalog.py
+
+"""
+OpenStack 리소스 카탈로그 캐시 (flavor / image / network).
+
+create_server 가 배포마다 find_image / find_flavor / find_network 를 호출하면
+각각 Keystone 인증된 REST 호출(경우에 따라 list 폴백 포함)이 발생한다.
+이 모듈은 세 종류의 리소스 목록을 한 번에 불러와 메모리에 보관하고,
+TTL(OPENSTACK_CATALOG_TTL)이 지나면 다시 불러온다.
+
+- 이름/ID 모두로 조회 가능
+- 갱신 실패 시 기존 데이터를 유지 (배포 경로는 find_* 폴백으로 동작)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """카탈로그 항목. create_server 가 필요로 하는 id/name 과 부가 스펙만 보관."""
+
+    id: str
+    name: str
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+def _index(entries: Iterable[CatalogEntry]) -> Dict[str, CatalogEntry]:
+    index: Dict[str, CatalogEntry] = {}
+    for entry in entries:
+        index[entry.id] = entry
+        if entry.name:
+            # 이름 중복 시 먼저 조회된 항목 유지 (find_* 는 중복 이름이면 에러를 내므로 폴백에 맡김)
+            index.setdefault(entry.name, entry)
+    return index
+
+
+class ResourceCatalog:
+    """flavor / image / network 목록을 TTL 기반으로 캐시한다."""
+
+    def __init__(self, ttl: float | None = None) -> None:
+        self.ttl = float(os.getenv("OPENSTACK_CATALOG_TTL", "600")) if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._flavors: Dict[str, CatalogEntry] = {}
+        self._images: Dict[str, CatalogEntry] = {}
+        self._networks: Dict[str, CatalogEntry] = {}
+        self._loaded_at: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # 로딩
+    # ------------------------------------------------------------------
+    def refresh(self, conn: Any = None) -> None:
+        """세 종류의 리소스를 목록 호출로 한 번에 다시 불러온다."""
+        if conn is None:
+            from app.core.openstack.client import get_connection
+
+            with get_connection() as pooled:
+                self.refresh(pooled)
+            return
+
+        flavors = [
+            CatalogEntry(
+                id=f.id,
+                name=f.name,
+                extra={"vcpus": f.vcpus, "ram_mb": f.ram, "disk_gb": f.disk},
+            )
+            for f in conn.compute.flavors(details=True)
+        ]
+        images = [CatalogEntry(id=i.id, name=i.name) for i in conn.image.images()]
+        networks = [CatalogEntry(id=n.id, name=n.name) for n in conn.network.networks()]
+
+        with self._lock:
+            self._flavors = _index(flavors)
+            self._images = _index(images)
+            self._networks = _index(networks)
+            self._loaded_at = time.time()
+        logger.info(
+            "OpenStack catalog refreshed: %d flavors, %d images, %d networks",
+            len(flavors), len(images), len(networks),
+        )
+
+    def is_loaded(self) -> bool:
+        with self._lock:
+            return self._loaded_at is not None
+
+    def _is_stale(self) -> bool:
+        with self._lock:
+            return self._loaded_at is None or time.time() - self._loaded_at > self.ttl
+
+    def ensure_fresh(self) -> None:
+        """TTL이 지났으면 갱신한다. 동시에 여러 스레드가 갱신하지 않도록 한 번만 수행."""
+        if not self._is_stale():
+            return
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # 다른 스레드가 갱신 중: 기존 데이터(또는 find_* 폴백) 사용
+        try:
+            if self._is_stale():
+                self.refresh()
+        except Exception:
+            logger.exception("OpenStack catalog refresh failed (keeping previous data)")
+        finally:
+            self._refresh_lock.release()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def _lookup(self, table: str, name_or_id: str, refresh: bool) -> Optional[CatalogEntry]:
+        if refresh:
+            self.ensure_fresh()
+        with self._lock:
+            return getattr(self, table).get(name_or_id)
+
+    def resolve_flavor(self, name_or_id: str, *, refresh: bool = True) -> Optional[CatalogEntry]:
+        return self._lookup("_flavors", name_or_id, refresh)
+
+    def resolve_image(self, name_or_id: str, *, refresh: bool = True) -> Optional[CatalogEntry]:
+        return self._lookup("_images", name_or_id, refresh)
+
+    def resolve_network(self, name_or_id: str, *, refresh: bool = True) -> Optional[CatalogEntry]:
+        return self._lookup("_networks", name_or_id, refresh)
+
+    def flavor_specs(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """메모리에 있는 flavor 스펙만 반환한다. (네트워크 호출 없음)"""
+        entry = self.resolve_flavor(name_or_id, refresh=False)
+        return dict(entry.extra) if entry else None
+
+
+_catalog = ResourceCatalog()
+
+
+def get_catalog() -> ResourceCatalog:
+    """프로세스 공유 카탈로그 인스턴스."""
+    return _catalog
+
+
+def preload_in_background() -> None:
+    """앱 시작 시 카탈로그를 미리 불러온다. 실패해도 앱 기동은 막지 않는다."""
+    threading.Thread(target=_catalog.ensure_fresh, name="openstack-catalog-preload", daemon=True).start()
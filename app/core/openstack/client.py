@@ -1,19 +1,34 @@
 # app/core/openstack/client.py
-from functools import lru_cache
+import logging
 import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
 
 from openstack import connection
 
+logger = logging.getLogger(__name__)
+
 
 class OpenStackConfigError(RuntimeError):
     """OS_* 설정이 잘못된 경우 발생하는 에러."""
 
 
-@lru_cache
-def get_connection() -> connection.Connection:
+class OpenStackPoolTimeout(RuntimeError):
+    """풀에서 제한 시간 안에 연결을 얻지 못한 경우 발생하는 에러."""
+
+
+def is_openstack_configured() -> bool:
+    """OS_CLOUD 또는 OS_AUTH_URL 이 설정되어 있는지 여부 (백그라운드 작업 on/off 판단용)."""
+    return bool(os.getenv("OS_CLOUD") or os.getenv("OS_AUTH_URL"))
+
+
+def create_connection() -> connection.Connection:
     """
-    DevStack/OpenStack 연결 객체를 하나만 생성해서 재사용한다.
-    
+    DevStack/OpenStack 연결 객체를 새로 생성한다. (직접 쓰기보다 connection() 풀 사용 권장)
+
     우선 OS_CLOUD(clouds.yaml) 를 쓰고, 없으면 OS_AUTH_URL 등 환경변수 기반으로 붙는다.
     """
     cloud = os.getenv("OS_CLOUD")
@@ -36,3 +51,132 @@ def get_connection() -> connection.Connection:
         compute_api_version="2",
         identity_interface="public",
     )
+
+
+def _check_health(conn: connection.Connection) -> None:
+    """
+    keystone 토큰을 확인한다. 세션은 유효한 토큰을 재사용하고, 만료 임박 시에만 재인증한다.
+    실패하면 예외를 그대로 올려 풀에서 해당 연결을 폐기하게 한다.
+    """
+    conn.session.get_token()
+
+
+class ConnectionPool:
+    """
+    인증된 OpenStack 연결의 제한된 풀.
+
+    openstacksdk Connection(내부 requests 세션)은 여러 스레드가 동시에 쓰도록 설계되지 않았으므로,
+    연결 하나는 한 번에 한 스레드만 사용하도록 checkout/return 방식으로 관리한다.
+
+    - 최대 size개까지만 생성 (초과 요청은 timeout 동안 대기)
+    - 반납된 연결은 인증 세션/토큰을 유지한 채 재사용
+    - 마지막 점검 후 health_interval 이 지난 연결은 checkout 시 토큰 확인, 실패하면 새로 생성
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        *,
+        timeout: float = 30.0,
+        health_interval: float = 300.0,
+        factory: Callable[[], connection.Connection] = create_connection,
+        health_check: Callable[[connection.Connection], None] = _check_health,
+    ) -> None:
+        self.size = size
+        self.timeout = timeout
+        self.health_interval = health_interval
+        self._factory = factory
+        self._health_check = health_check
+        self._slots = threading.BoundedSemaphore(size)
+        # LIFO: 최근 사용한(토큰이 따뜻한) 연결부터 재사용
+        self._idle: "queue.LifoQueue[Tuple[connection.Connection, float]]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+
+    def _checkout(self) -> Tuple[connection.Connection, float]:
+        try:
+            conn, checked_at = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._factory()
+            with self._lock:
+                self._created += 1
+            return conn, time.monotonic()
+
+        if time.monotonic() - checked_at < self.health_interval:
+            return conn, checked_at
+        try:
+            self._health_check(conn)
+            return conn, time.monotonic()
+        except Exception:
+            logger.warning("Discarding unhealthy OpenStack connection from pool", exc_info=True)
+            self._discard(conn)
+            conn = self._factory()
+            with self._lock:
+                self._created += 1
+            return conn, time.monotonic()
+
+    def _discard(self, conn: connection.Connection) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[connection.Connection]:
+        """풀에서 연결을 빌려 with 블록 동안 독점 사용한 뒤 반납한다."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise OpenStackPoolTimeout(f"No OpenStack connection available within {self.timeout}s")
+        try:
+            conn, checked_at = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+        try:
+            yield conn
+        finally:
+            self._idle.put((conn, checked_at))
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            created = self._created
+        return {"size": self.size, "created": created, "idle": self._idle.qsize()}
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """프로세스 공유 연결 풀 (지연 생성)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                size=int(os.getenv("OPENSTACK_POOL_SIZE", "4")),
+                timeout=float(os.getenv("OPENSTACK_POOL_TIMEOUT", "30")),
+                health_interval=float(os.getenv("OPENSTACK_POOL_HEALTHCHECK_INTERVAL", "300")),
+            )
+        return _pool
+
+
+@contextmanager
+def get_connection() -> Iterator[connection.Connection]:
+    """
+    공유 풀에서 OpenStack 연결을 빌린다.
+
+        with get_connection() as conn:
+            conn.compute.servers()
+    """
+    with get_pool().connection() as conn:
+        yield conn
@@ -1,68 +1,75 @@
 # app/core/openstack/deployer.py
 
 import logging
-from typing import Optional, Dict, Any
+import os
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
 
+from app.core.openstack.catalog import get_catalog
 from app.core.openstack.client import get_connection
 from app.core.errors import DeploymentError
 from app.models.deploy import InstanceInfo
 
+# Nova 서버 최종 상태
+_ACTIVE = "ACTIVE"
+_ERROR = "ERROR"
 
-def create_server(
-    *,
-    name: str,
-    image_ref: str,  # 이름 또는 ID
-    flavor_name: str,
-    network_name: str,
-    key_name: str,
-    metadata: Optional[Dict[str, str]] = None,
-    user_data: Optional[str] = None,
-) -> InstanceInfo:
-    """
-    DevStack에 VM 한 대를 생성하고, 부팅 완료될 때까지 기다린 뒤
-    InstanceInfo 모델로 반환한다.
-    """
-    conn = get_connection()
+# fleet 대기 중 서버가 이 횟수만큼 연속으로 목록에 없으면 실패로 본다
+_MAX_MISSING_POLLS = 2
 
-    try:
-        # 1) 먼저 compute 쪽에서 이미지 찾아보기 (이름 / ID 둘 다 지원)
-        img = conn.compute.find_image(image_ref)  # type: ignore
-        if img is not None:
-            image_id = img.id
-        else:
+
+def _resolve_resources(conn: Any, image_ref: str, flavor_name: str, network_name: str) -> Tuple[str, Any, Any]:
+    """이미지 ID / flavor / network 를 카탈로그(메모리) 우선으로 찾는다."""
+    catalog = get_catalog()
+
+    # 1) 이미지: 카탈로그(메모리)에서 이름/ID로 먼저 찾고, 없으면 compute API로 조회
+    img = catalog.resolve_image(image_ref)
+    if img is not None:
+        image_id = img.id
+    else:
+        try:
+            found = conn.compute.find_image(image_ref)  # type: ignore
             # 못 찾으면 그냥 "이미 ID 라고 가정" 하고 그대로 사용
+            image_id = found.id if found is not None else image_ref
+        except Exception as e:
+            logging.exception("Failed to resolve image via compute API, using raw ref: %s", e)
             image_id = image_ref
-    except Exception as e:
-        logging.exception("Failed to resolve image via compute API, using raw ref: %s", e)
-        image_id = image_ref
 
-    # 2) flavor / network 도 compute / network 프록시로만 처리
-    flv = conn.compute.find_flavor(flavor_name, ignore_missing=False)  # type: ignore
-    net = conn.network.find_network(network_name, ignore_missing=False)  # type: ignore
+    # 2) flavor / network 도 카탈로그 우선, 없을 때만 compute / network 프록시로 조회
+    flv = catalog.resolve_flavor(flavor_name) or conn.compute.find_flavor(flavor_name, ignore_missing=False)  # type: ignore
+    net = catalog.resolve_network(network_name) or conn.network.find_network(network_name, ignore_missing=False)  # type: ignore
+    return image_id, flv, net
 
-    try:
-        # OpenStack API는 user_data가 None 인 것을 허용하지 않고 string 타입만 허용하는 경우가 있다.
-        # 따라서 user_data가 None 이면 아예 인자를 보내지 않는다.
-        create_kwargs: Dict[str, Any] = {
-            "name": name,
-            "image_id": image_id,
-            "flavor_id": flv.id,
-            "networks": [{"uuid": net.id}],
-            "key_name": key_name,
-            "metadata": metadata or {},
-        }
-        if user_data is not None:
-            create_kwargs["user_data"] = user_data
-
-        server = conn.compute.create_server(  # type: ignore
-            **create_kwargs
-        )
-        # Nova가 프로비저닝 끝날 때까지 기다리려면:
-        server = conn.compute.wait_for_server(server)  # type: ignore
-    except Exception as e:
-        logging.exception("Failed to create server")
-        raise DeploymentError(f"Failed to create server: {e}")
 
+def _create_kwargs(
+    *,
+    name: str,
+    image_id: str,
+    flv: Any,
+    net: Any,
+    key_name: str,
+    metadata: Optional[Dict[str, str]],
+    user_data: Optional[str],
+) -> Dict[str, Any]:
+    # OpenStack API는 user_data가 None 인 것을 허용하지 않고 string 타입만 허용하는 경우가 있다.
+    # 따라서 user_data가 None 이면 아예 인자를 보내지 않는다.
+    create_kwargs: Dict[str, Any] = {
+        "name": name,
+        "image_id": image_id,
+        "flavor_id": flv.id,
+        "networks": [{"uuid": net.id}],
+        "key_name": key_name,
+        "metadata": metadata or {},
+    }
+    if user_data is not None:
+        create_kwargs["user_data"] = user_data
+    return create_kwargs
+
+
+def _to_instance_info(server: Any, *, image_id: str, flv: Any, net: Any, key_name: str, user_data: Optional[str]) -> InstanceInfo:
     # InstanceInfo 빌드 (필드명은 프로젝트 정의에 맞게 조정)
     return InstanceInfo(
         instance_id=server.id,
@@ -76,3 +83,194 @@ def create_server(
         status=server.status,
         addresses=server.addresses or {},
     )
+
+
+def wait_for_status(
+    server_id: str,
+    status: str = _ACTIVE,
+    *,
+    timeout: Optional[float] = None,
+    poll_interval: Optional[float] = None,
+) -> Any:
+    """
+    서버가 status 가 될 때까지 get_server 로 주기적으로 확인한다. (ERROR 또는 timeout 이면 DeploymentError)
+
+    조회할 때만 풀에서 연결을 잠깐 빌리므로 수 분 걸리는 대기 동안에도 다른 작업이 연결을 쓸 수 있다.
+    (openstacksdk wait_for_server 는 대기 내내 같은 연결을 붙잡는다)
+    """
+    timeout = float(os.getenv("OPENSTACK_SERVER_TIMEOUT", "600")) if timeout is None else timeout
+    poll_interval = float(os.getenv("OPENSTACK_SERVER_POLL_INTERVAL", "3")) if poll_interval is None else poll_interval
+
+    deadline = time.monotonic() + timeout
+    while True:
+        with get_connection() as conn:
+            server = conn.compute.get_server(server_id)  # type: ignore
+        current = getattr(server, "status", None)
+        if current == status:
+            return server
+        if current == _ERROR:
+            raise DeploymentError(f"Server {server_id} went to ERROR while waiting for {status}")
+        if time.monotonic() >= deadline:
+            raise DeploymentError(f"Timed out waiting for server {server_id} to reach {status} (last: {current})")
+        time.sleep(poll_interval)
+
+
+def create_server(
+    *,
+    name: str,
+    image_ref: str,  # 이름 또는 ID
+    flavor_name: str,
+    network_name: str,
+    key_name: str,
+    metadata: Optional[Dict[str, str]] = None,
+    user_data: Optional[str] = None,
+) -> InstanceInfo:
+    """
+    DevStack에 VM 한 대를 생성하고, 부팅 완료될 때까지 기다린 뒤
+    InstanceInfo 모델로 반환한다.
+    """
+    # 연결은 생성 요청까지만 빌리고, 부팅 대기는 짧은 조회(wait_for_status)로 한다.
+    with get_connection() as conn:
+        image_id, flv, net = _resolve_resources(conn, image_ref, flavor_name, network_name)
+
+        try:
+            server = conn.compute.create_server(  # type: ignore
+                **_create_kwargs(
+                    name=name, image_id=image_id, flv=flv, net=net,
+                    key_name=key_name, metadata=metadata, user_data=user_data,
+                )
+            )
+        except Exception as e:
+            logging.exception("Failed to create server")
+            raise DeploymentError(f"Failed to create server: {e}")
+
+    # Nova가 프로비저닝 끝날 때까지 기다린다
+    server = wait_for_status(server.id, _ACTIVE)
+
+    return _to_instance_info(server, image_id=image_id, flv=flv, net=net, key_name=key_name, user_data=user_data)
+
+
+def _delete_servers(server_ids: List[str]) -> None:
+    """서버들을 best-effort 로 삭제한다. (실패는 로그만 남김)"""
+    for sid in server_ids:
+        try:
+            with get_connection() as conn:
+                conn.compute.delete_server(sid, ignore_missing=True)  # type: ignore
+        except Exception:
+            logging.exception("Failed to delete server %s during fleet cleanup", sid)
+
+
+def create_servers(
+    *,
+    name_prefix: str,
+    count: int,
+    image_ref: str,
+    flavor_name: str,
+    network_name: str,
+    key_name: str,
+    metadata: Optional[Dict[str, str]] = None,
+    user_data: Optional[str] = None,
+    timeout: Optional[float] = None,
+    poll_interval: Optional[float] = None,
+    max_parallel: Optional[int] = None,
+) -> List[InstanceInfo]:
+    """
+    VM 여러 대(fleet)를 동시에 생성하고, 한 번의 목록 조회로 전체 부팅 완료를 기다린다.
+
+    - 리소스(이미지/flavor/network)는 한 번만 해석한다.
+    - create 요청은 스레드로 동시에 제출한다. (서버별 wait_for_server 없음)
+    - 대기는 servers(details=True, name=^prefix-) 목록을 주기적으로 1회씩 조회하며,
+      metadata.fleet_id 로 이번 fleet 서버만 골라 ACTIVE/ERROR 가 될 때까지 기다린다.
+
+    Returns
+    -------
+    List[InstanceInfo]
+        생성 순서대로의 인스턴스 목록. (모두 ACTIVE)
+
+    Raises
+    ------
+    DeploymentError
+        모든 create 요청이 실패했거나, 한 대라도 ERROR 가 되었거나, 목록에서 사라졌거나,
+        timeout 안에 전체가 최종 상태에 도달하지 못한 경우. 대기 중 실패하면 이미 생성된
+        서버는 삭제한 뒤 올린다.
+    """
+    if count < 1:
+        raise ValueError("count must be >= 1")
+
+    timeout = float(os.getenv("OPENSTACK_FLEET_TIMEOUT", "600")) if timeout is None else timeout
+    poll_interval = float(os.getenv("OPENSTACK_FLEET_POLL_INTERVAL", "3")) if poll_interval is None else poll_interval
+    max_parallel = int(os.getenv("OPENSTACK_FLEET_MAX_PARALLEL", "10")) if max_parallel is None else max_parallel
+
+    with get_connection() as conn:
+        image_id, flv, net = _resolve_resources(conn, image_ref, flavor_name, network_name)
+
+    fleet_id = uuid.uuid4().hex[:12]
+    fleet_metadata = {**(metadata or {}), "fleet_id": fleet_id}
+    names = [f"{name_prefix}-{i + 1}" for i in range(count)]
+
+    def _submit(name: str) -> Any:
+        # 스레드마다 풀에서 별도 연결을 빌린다. (동시 제출 수는 풀 크기로도 제한됨)
+        with get_connection() as conn:
+            return conn.compute.create_server(  # type: ignore
+                **_create_kwargs(
+                    name=name, image_id=image_id, flv=flv, net=net,
+                    key_name=key_name, metadata=fleet_metadata, user_data=user_data,
+                )
+            )
+
+    submitted: Dict[str, str] = {}  # server id -> name
+    errors: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(count, max_parallel)), thread_name_prefix="fleet-create") as pool:
+        futures = {name: pool.submit(_submit, name) for name in names}
+        for name, fut in futures.items():
+            try:
+                submitted[fut.result().id] = name
+            except Exception as e:
+                logging.exception("Failed to submit server %s", name)
+                errors.append(f"{name}: {e}")
+
+    if not submitted:
+        raise DeploymentError(f"Failed to create servers: {'; '.join(errors)}")
+
+    deadline = time.monotonic() + timeout
+    servers: Dict[str, Any] = {}
+    missing: Dict[str, int] = {}  # server id -> 연속으로 목록에 없었던 조회 횟수
+    try:
+        while True:
+            # 서버별 GET 대신 이름 prefix로 좁힌 목록 1회 조회 + fleet_id 메타데이터로 필터
+            with get_connection() as conn:
+                servers = {
+                    s.id: s
+                    for s in conn.compute.servers(details=True, name=f"^{re.escape(name_prefix)}-")  # type: ignore
+                    if (s.metadata or {}).get("fleet_id") == fleet_id
+                }
+            failed = [sid for sid in submitted if getattr(servers.get(sid), "status", None) == _ERROR]
+            if failed:
+                raise DeploymentError(f"Servers in fleet {fleet_id} went to ERROR: {', '.join(failed)}")
+            # 생성 직후 목록에 아직 안 보일 수 있으므로 한 번은 봐주고, 연속 2회 없으면 삭제된 것으로 본다
+            for sid in submitted:
+                missing[sid] = missing.get(sid, 0) + 1 if sid not in servers else 0
+            vanished = [sid for sid, n in missing.items() if n >= _MAX_MISSING_POLLS]
+            if vanished:
+                raise DeploymentError(f"Servers in fleet {fleet_id} disappeared: {', '.join(vanished)}")
+            pending = [sid for sid in submitted if getattr(servers.get(sid), "status", None) != _ACTIVE]
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                raise DeploymentError(
+                    f"Timed out waiting for {len(pending)}/{len(submitted)} servers in fleet {fleet_id}"
+                )
+            time.sleep(poll_interval)
+    except Exception:
+        # 일부만 뜬 fleet 은 기록되지 않으므로 이미 생성된 서버를 남기지 않고 정리한다
+        _delete_servers(list(submitted))
+        raise
+
+    if errors:
+        logging.warning("Fleet %s created with %d submit failures: %s", fleet_id, len(errors), errors)
+
+    ordered = sorted(submitted, key=lambda sid: names.index(submitted[sid]))
+    return [
+        _to_instance_info(servers[sid], image_id=image_id, flv=flv, net=net, key_name=key_name, user_data=user_data)
+        for sid in ordered
+    ]
@@ -6,10 +6,11 @@ OpenStack Flavor 매핑 모듈.
 역할:
 - recommended_flavor ("small", "medium", "large")를 OpenStack flavor 이름으로 변환
 - 환경별(prod/dev), 리전별로 다른 flavor 매핑 지원 가능
-- 향후 OpenStack API를 통해 실제 flavor 목록을 조회하여 검증 가능
+- flavor 스펙은 리소스 카탈로그(실제 OpenStack 목록)를 우선 사용
 """
 
 from typing import Dict, Optional
+from app.core.openstack.catalog import get_catalog
 from app.models.common import RuntimeEnv
 
 
@@ -36,6 +37,14 @@ _ENV_FLAVOR_MAPS: Dict[RuntimeEnv, Dict[str, str]] = {
     },
 }
 
+# 카탈로그 미로드 시 사용하는 기본 스펙 테이블 (DevStack 기본 flavor 기준)
+_FLAVOR_SPECS: Dict[str, Dict[str, Optional[float]]] = {
+    "m1.tiny": {"vcpus": 1, "ram_mb": 512, "disk_gb": 1},
+    "m1.small": {"vcpus": 1, "ram_mb": 2048, "disk_gb": 20},
+    "m1.medium": {"vcpus": 2, "ram_mb": 4096, "disk_gb": 40},
+    "m1.large": {"vcpus": 4, "ram_mb": 8192, "disk_gb": 80},
+}
+
 
 def get_openstack_flavor(
     recommended_flavor: str,
@@ -87,9 +96,10 @@ def get_openstack_flavor(
 
 def get_flavor_specs(flavor_name: str) -> Dict[str, Optional[float]]:
     """
-    OpenStack flavor 이름으로부터 예상 스펙 정보를 반환 (더미).
+    OpenStack flavor 이름으로부터 스펙 정보를 반환.
 
-    향후 OpenStack API를 통해 실제 flavor 정보를 조회하도록 확장 가능.
+    리소스 카탈로그(app.core.openstack.catalog)가 로드되어 있으면 실제 flavor 정보를
+    메모리에서 반환하고, 아직 로드 전이거나 카탈로그에 없는 flavor면 기본 스펙 테이블을 사용한다.
 
     Parameters
     ----------
@@ -101,13 +111,8 @@ def get_flavor_specs(flavor_name: str) -> Dict[str, Optional[float]]:
     Dict[str, Optional[float]]
         flavor 스펙 정보 (vCPUs, RAM, Disk 등)
     """
-    # 더미 스펙 테이블 (실제로는 OpenStack API로 조회)
-    _FLAVOR_SPECS: Dict[str, Dict[str, Optional[float]]] = {
-        "m1.tiny": {"vcpus": 1, "ram_mb": 512, "disk_gb": 1},
-        "m1.small": {"vcpus": 1, "ram_mb": 2048, "disk_gb": 20},
-        "m1.medium": {"vcpus": 2, "ram_mb": 4096, "disk_gb": 40},
-        "m1.large": {"vcpus": 4, "ram_mb": 8192, "disk_gb": 80},
-    }
+    specs = get_catalog().flavor_specs(flavor_name)
+    if specs is not None:
+        return specs
 
     return _FLAVOR_SPECS.get(flavor_name, {"vcpus": None, "ram_mb": None, "disk_gb": None})
-
@@ -1,7 +1,10 @@
 """
-SQLAlchemy ORM models for persistence (mcp_contexts, prediction_features, predictions, prediction_points)
+SQLAlchemy ORM models for persistence (services, metrics, mcp_contexts, prediction_features, predictions, prediction_points)
+
+services / metrics 는 github_url / metric_name 사전 테이블이다. 시계열 테이블은 문자열 대신
+정수 ID 를 저장한다. (ID 조회/등록: app/core/id_registry.py)
 """
-from sqlalchemy import Column, BigInteger, String, DateTime, Float, TIMESTAMP, Text, Integer, DECIMAL, Enum as SQLEnum, JSON, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import Column, BigInteger, SmallInteger, String, DateTime, Float, TIMESTAMP, Text, Integer, DECIMAL, Enum as SQLEnum, JSON, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -9,6 +12,12 @@ import enum
 
 Base = declarative_base()
 
+# MySQL 에서는 BIGINT AUTO_INCREMENT, SQLite 에서는 rowid 별칭(INTEGER PRIMARY KEY)으로 자동 채번
+BigIntPK = BigInteger().with_variant(Integer, "sqlite")
+
+# SQLite 는 INTEGER PRIMARY KEY 만 자동 채번된다
+SmallIntPK = SmallInteger().with_variant(Integer, "sqlite")
+
 # Enum types
 class ServiceType(str, enum.Enum):
     web = "web"
@@ -31,6 +40,30 @@ class FlavorType(str, enum.Enum):
     large = "large"
 
 
+class Service(Base):
+    __tablename__ = "services"
+    __table_args__ = (
+        UniqueConstraint("github_url", name="uk_service_url"),
+        {"mysql_engine": "InnoDB", "mysql_comment": "github_url 사전 (service_id 부여)"}
+    )
+
+    service_id = Column(Integer, primary_key=True, autoincrement=True)
+    github_url = Column(String(500), nullable=False)
+    created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+
+
+class Metric(Base):
+    __tablename__ = "metrics"
+    __table_args__ = (
+        UniqueConstraint("metric_name", name="uk_metric_name"),
+        {"mysql_engine": "InnoDB", "mysql_comment": "metric_name 사전 (metric_id 부여)"}
+    )
+
+    metric_id = Column(SmallIntPK, primary_key=True, autoincrement=True)
+    metric_name = Column(String(100), nullable=False)
+    created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
+
+
 class MCPContext(Base):
     __tablename__ = "mcp_contexts"
     __table_args__ = (
@@ -66,13 +99,13 @@ class PredictionFeature(Base):
         {"mysql_engine": "InnoDB", "mysql_comment": "예측에 사용된 feature 스냅샷"}
     )
 
-    feature_snapshot_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    feature_snapshot_id = Column(BigIntPK, primary_key=True, autoincrement=True)
     context_id = Column(String(36), ForeignKey("mcp_contexts.context_id", ondelete="CASCADE"), nullable=False)
     github_url = Column(String(500), nullable=False)
-    window_start = Column(DateTime, nullable=False, comment="사용된 feature 시작 시간")
-    window_end = Column(DateTime, nullable=False, comment="사용된 feature 종료 시간")
-    sequence_length = Column(Integer, nullable=False, comment="시퀀스 길이 (예: 24시간)")
-    feature_count = Column(Integer, nullable=False, comment="feature 개수 (예: 79개)")
+    window_start = Column(DateTime, nullable=True, comment="사용된 feature 시작 시간 (모르면 NULL)")
+    window_end = Column(DateTime, nullable=True, comment="사용된 feature 종료 시간 (모르면 NULL)")
+    sequence_length = Column(Integer, nullable=True, comment="시퀀스 길이 (예: 24시간, 모르면 NULL)")
+    feature_count = Column(Integer, nullable=True, comment="feature 개수 (예: 79개, 모르면 NULL)")
     features_json = Column(JSON, nullable=False, comment="feature_names + 값들 (압축 가능)")
     created_at = Column(TIMESTAMP, nullable=False, default=datetime.utcnow)
 
@@ -85,21 +118,23 @@ class Prediction(Base):
     __tablename__ = "predictions"
     __table_args__ = (
         Index("idx_user_time", "user_id", "generated_at"),
-        Index("idx_github_metric", "github_url", "metric_name", "generated_at"),
+        Index("idx_service_metric", "service_id", "metric_id", "generated_at"),
         Index("idx_model", "model_version"),
         {"mysql_engine": "InnoDB", "mysql_comment": "후처리된 예측 결과 (사용자+시간 매핑)"}
     )
 
-    prediction_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    prediction_id = Column(BigIntPK, primary_key=True, autoincrement=True)
     context_id = Column(String(36), ForeignKey("mcp_contexts.context_id", ondelete="CASCADE"), nullable=False)
     feature_snapshot_id = Column(BigInteger, ForeignKey("prediction_features.feature_snapshot_id", ondelete="CASCADE"), nullable=False)
     user_id = Column(String(100), nullable=True, comment="예측을 요청한 사용자")
+    service_id = Column(Integer, ForeignKey("services.service_id"), nullable=False)
+    metric_id = Column(SmallInteger, ForeignKey("metrics.metric_id"), nullable=False)
     github_url = Column(String(500), nullable=False)
     metric_name = Column(String(100), nullable=False)
     model_version = Column(String(100), nullable=False)
     generated_at = Column(DateTime, nullable=False, comment="예측 생성 시각 (= request_timestamp)")
     horizon_hours = Column(Integer, nullable=False, default=24)
-    predictions_json = Column(JSON, nullable=False, comment="24시간 후처리된 예측값 [{time, value}, ...]")
+    predictions_json = Column(JSON, nullable=False, comment="horizon_hours 시간 후처리된 예측값 [{time, value}, ...]")
     scale_factor = Column(DECIMAL(12, 6), nullable=True, comment="컨텍스트 스케일 팩터")
     recommended_flavor = Column(SQLEnum(FlavorType), nullable=True)
     min_instances = Column(Integer, nullable=False, default=1)
@@ -121,7 +156,7 @@ class PredictionPoint(Base):
         {"mysql_engine": "InnoDB", "mysql_comment": "시간별 예측값 (시간 매핑, 실제값 비교용)"}
     )
 
-    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    id = Column(BigIntPK, primary_key=True, autoincrement=True)
     prediction_id = Column(BigInteger, ForeignKey("predictions.prediction_id", ondelete="CASCADE"), nullable=False)
     forecast_time = Column(DateTime, nullable=False, comment="예측 대상 시각 (미래 시점)")
     predicted_value = Column(Float, nullable=False)
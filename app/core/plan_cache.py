@@ -0,0 +1,159 @@
+"""
+/plans 계열 예측 결과 캐시.
+
+동일 저장소/컨텍스트로 한 시간에 여러 번 들어오는 /plans 요청(프론트 새로고침,
+/deploy 내부 호출 등)이 매번 predictor → policy → anomaly 파이프라인을
+다시 돌지 않도록 결과를 메모리에 보관한다.
+
+캐시 키 구성:
+- kind (plans / multi / hourly 등 엔드포인트 구분)
+- github_url, metric(s)
+- 정규화된 컨텍스트 (service_type, runtime_env, time_slot, expected_users 버킷, weight)
+- model_version
+- 데이터 소스 시간 워터마크 (UTC 정시) + 저장소별 데이터 버전
+
+예측 결과는 "현재 정시 + N시간" 기준으로 생성되므로 정시가 바뀌면 키가 자연스럽게 바뀐다.
+새 이력이 적재되면 invalidate()로 해당 저장소의 데이터 버전을 올려 즉시 무효화한다.
+
+프로세스 단위 메모리 캐시이므로 여러 워커 환경에서는 워커별로 독립 동작한다.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from threading import RLock
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from app.models.common import MCPContext
+
+_lock = RLock()
+_cache: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+_data_versions: Dict[str, int] = {}
+
+_DEFAULT_TTL = int(os.getenv("PLAN_CACHE_TTL", "3600"))  # 기본 1시간 (워터마크와 동일 주기)
+_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "1024"))
+_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+
+
+def _now() -> float:
+    return time.time()
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def hour_watermark(now: Optional[datetime] = None) -> str:
+    """예측 기준 시각(UTC 정시). 이 값이 바뀌면 이전 결과는 재사용하지 않는다."""
+    ts = (now or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+    return ts.isoformat()
+
+
+def bucket_users(expected_users: Optional[int]) -> Optional[int]:
+    """
+    expected_users를 유효숫자 2자리로 올림한 버킷으로 변환한다.
+
+    flavor 추천 규칙이 "<= 500", "<= 5000" 형태이므로 올림 버킷을 쓰면
+    같은 버킷 안의 값은 항상 같은 flavor 구간에 속한다. (예: 501 → 510, 500 → 500)
+    LSTM 선택 임계값(>= 1000)은 model_version이 키에 포함되어 별도로 구분된다.
+    """
+    if expected_users is None:
+        return None
+    if expected_users < 100:
+        return int(expected_users)
+    unit = 10 ** (int(math.log10(expected_users)) - 1)
+    return int(math.ceil(expected_users / unit) * unit)
+
+
+def data_version(github_url: str) -> int:
+    with _lock:
+        return _data_versions.get(github_url, 0)
+
+
+def normalized_context(ctx: MCPContext) -> Tuple[Hashable, ...]:
+    """캐시 키에 들어가는 컨텍스트 부분. (context_id/timestamp 제외, 사용자 수는 버킷, weight 는 반올림)"""
+    return (
+        ctx.service_type,
+        ctx.runtime_env,
+        ctx.time_slot,
+        bucket_users(ctx.expected_users),
+        round(float(ctx.weight), 3),
+    )
+
+
+def make_key(
+    kind: str,
+    *,
+    github_url: str,
+    metrics: str | Iterable[str],
+    ctx: MCPContext,
+    model_version: str,
+    extra: Tuple[Hashable, ...] = (),
+) -> Tuple[Hashable, ...]:
+    """정규화된 컨텍스트 기반 캐시 키를 만든다. context_id/timestamp는 키에서 제외."""
+    metric_key = metrics if isinstance(metrics, str) else tuple(metrics)
+    return (
+        kind,
+        github_url,
+        metric_key,
+        *normalized_context(ctx),
+        model_version,
+        hour_watermark(),
+        data_version(github_url),
+        *extra,
+    )
+
+
+def get(key: Hashable, *, ttl: int | None = None) -> Optional[Any]:
+    """캐시된 값을 반환한다. 없거나 TTL이 지났으면 None."""
+    if not _ENABLED:
+        return None
+    ttl = _DEFAULT_TTL if ttl is None else ttl
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if _now() - stored_at > ttl:
+            _cache.pop(key, None)
+            return None
+        _cache.move_to_end(key)
+        return value
+
+
+def put(key: Hashable, value: Any) -> None:
+    """값을 저장하고, 최대 항목 수를 넘으면 가장 오래 사용되지 않은 항목부터 제거한다."""
+    if not _ENABLED:
+        return
+    with _lock:
+        _cache[key] = (_now(), value)
+        _cache.move_to_end(key)
+        while len(_cache) > _MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def invalidate(github_url: Optional[str] = None) -> None:
+    """
+    새 이력이 적재되었을 때 호출한다.
+
+    github_url을 주면 해당 저장소의 데이터 버전을 올리고 관련 항목을 제거한다.
+    None이면 전체 캐시를 비운다.
+    """
+    with _lock:
+        if github_url is None:
+            _cache.clear()
+            _data_versions.clear()
+            return
+        _data_versions[github_url] = _data_versions.get(github_url, 0) + 1
+        stale = [k for k in _cache if isinstance(k, tuple) and len(k) > 1 and k[1] == github_url]
+        for k in stale:
+            _cache.pop(k, None)
+
+
+def size() -> int:
+    with _lock:
+        return len(_cache)
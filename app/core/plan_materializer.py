@@ -0,0 +1,142 @@
+"""
+/plans 예측 사전 계산 (materialize).
+
+대부분의 저장소는 같은 컨텍스트로 일정한 주기마다 /plans 를 호출한다. plan_cache 키에는 시간
+워터마크(UTC 정시)가 들어 있어 정시가 바뀌면 모든 결과가 미스가 되고, 그 시각 첫 요청이
+추론 비용을 그대로 떠안는다. 이 모듈은 최근 요청된 (저장소, metric, 컨텍스트, horizon) 을
+기억해 두었다가 매 정시 직후 한 번에 다시 계산해 캐시를 채운다.
+
+- 추적: build_plan 이 요청마다 track() 을 호출한다. (정규화된 컨텍스트 단위, 최근
+  PLAN_MATERIALIZE_LOOKBACK_HOURS 안에 요청된 것만, 최대 PLAN_MATERIALIZE_MAX_ENTRIES 개 LRU)
+- 계산: plan_service.prewarm_plans (= /plans/batch 경로). 과거 데이터 일괄 조회 + predict_batch
+  + 이력 저장 큐(prediction_persister → predictions / prediction_points) 를 거친다. 이상 탐지 알림은
+  매 정시 반복되지 않도록 보내지 않는다. (사용자 요청 경로에서만)
+- 결과는 /plans 와 같은 키로 plan_cache 에 들어가므로, 같은 정시·데이터 버전·컨텍스트의 /plans
+  요청은 추론 없이 응답한다. 미스(새 컨텍스트, 적재로 무효화된 저장소)는 기존처럼 즉시 추론한다.
+- 실행 시각: 매 정시 + PLAN_MATERIALIZE_DELAY_SECONDS (정시 직후 들어온 적재가 반영되도록)
+
+PLAN_MATERIALIZE_ENABLED=1 일 때만 앱 시작 시 켜진다. 실행 중이 아니면 track 은 아무것도 하지 않는다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from app.core import plan_cache
+from app.models.common import MCPContext
+
+logger = logging.getLogger(__name__)
+
+_LOOKBACK_HOURS = int(os.getenv("PLAN_MATERIALIZE_LOOKBACK_HOURS", "24"))
+_MAX_ENTRIES = int(os.getenv("PLAN_MATERIALIZE_MAX_ENTRIES", "512"))
+_DELAY_SECONDS = float(os.getenv("PLAN_MATERIALIZE_DELAY_SECONDS", "30"))
+
+Tracked = Tuple[str, str, MCPContext, int]  # (github_url, metric_name, ctx, horizon)
+
+
+def is_enabled() -> bool:
+    return os.getenv("PLAN_MATERIALIZE_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+
+
+_lock = threading.Lock()
+_tracked: "OrderedDict[Hashable, Tuple[Tracked, datetime]]" = OrderedDict()
+_stats: Dict[str, Any] = {"runs": 0, "planned": 0, "failed": 0, "last_run": None, "last_duration_s": None}
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _key(github_url: str, metric_name: str, ctx: MCPContext, horizon: int) -> Tuple[Hashable, ...]:
+    # plan_cache.make_key 와 같은 정규화 (워터마크/데이터 버전/모델 버전 제외)
+    return (github_url, metric_name, *plan_cache.normalized_context(ctx), horizon)
+
+
+def track(github_url: str, metric_name: str, ctx: MCPContext, horizon: int, *, now: Optional[datetime] = None) -> None:
+    """요청된 플랜을 사전 계산 대상으로 기록한다. 실행 중이 아니면 no-op."""
+    if _thread is None:
+        return
+    key = _key(github_url, metric_name, ctx, horizon)
+    with _lock:
+        _tracked[key] = ((github_url, metric_name, ctx, horizon), now or datetime.utcnow())
+        _tracked.move_to_end(key)
+        while len(_tracked) > _MAX_ENTRIES:
+            _tracked.popitem(last=False)
+
+
+def tracked(now: Optional[datetime] = None) -> List[Tracked]:
+    """최근 LOOKBACK 안에 요청된 대상 목록. 오래된 항목은 여기서 정리한다."""
+    cutoff = (now or datetime.utcnow()) - timedelta(hours=_LOOKBACK_HOURS)
+    with _lock:
+        for key in [k for k, (_, seen) in _tracked.items() if seen < cutoff]:
+            del _tracked[key]
+        return [item for item, _ in _tracked.values()]
+
+
+def run_once(now: Optional[datetime] = None) -> int:
+    """추적 중인 플랜을 모두 다시 계산해 캐시에 넣는다. 성공한 플랜 수를 반환."""
+    from app.core.plan_service import prewarm_plans
+
+    items = tracked(now)
+    if not items:
+        return 0
+    started = time.monotonic()
+    planned, failed = prewarm_plans(items)
+    with _lock:
+        _stats["runs"] += 1
+        _stats["planned"] += planned
+        _stats["failed"] += failed
+        _stats["last_run"] = datetime.utcnow()
+        _stats["last_duration_s"] = round(time.monotonic() - started, 3)
+    logger.info("Materialized %d plans (%d failed)", planned, failed)
+    return planned
+
+
+def _seconds_until_next_run(now: datetime, delay: float) -> float:
+    run_at = now.replace(minute=0, second=0, microsecond=0) + timedelta(seconds=delay)
+    if run_at <= now:
+        run_at += timedelta(hours=1)
+    return max((run_at - now).total_seconds(), 1.0)
+
+
+def _loop(delay: float) -> None:
+    while not _stop.wait(_seconds_until_next_run(datetime.utcnow(), delay)):
+        try:
+            run_once()
+        except Exception:
+            logger.exception("Plan materialization failed (will retry next hour)")
+
+
+def start(*, delay_seconds: Optional[float] = None) -> None:
+    """정시마다 사전 계산하는 스레드를 시작한다. 이미 실행 중이면 무시."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_loop,
+        args=(_DELAY_SECONDS if delay_seconds is None else delay_seconds,),
+        name="plan-materializer",
+        daemon=True,
+    )
+    _thread.start()
+
+
+def stop() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
+    with _lock:
+        _tracked.clear()
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        return {**_stats, "tracked": len(_tracked), "running": _thread is not None}
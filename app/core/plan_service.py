@@ -0,0 +1,585 @@
+"""
+Plan service (in-process 예측 파이프라인).
+
+역할:
+- /plans, /plans/multi 라우트와 /deploy 가 공통으로 호출하는 예측 파이프라인.
+  1) context 파싱/검증
+  2) router 기반 모델 버전 선택
+  3) predictor 실행 (LSTM 또는 Baseline, 실패 시 baseline 폴백)
+  4) policy 후처리(가중치/클램프)
+  5) 추천 flavor 및 비용 산출
+  6) 이상 탐지 + Discord 알림 (비차단)
+  7) 예측 이력 저장 (prediction_persister 큐, 비차단)
+- 결과 캐시(plan_cache)와 single-flight 병합을 이 레이어에서 적용한다.
+- /plans/batch: 여러 저장소를 한 번에 처리 (과거 데이터 일괄 조회 + predictor.run_batch).
+- 사전 계산: plan_materializer 가 최근 요청된 플랜을 매 정시 prewarm_plans 로 미리 캐시에 넣는다.
+
+/deploy 가 같은 프로세스에서 /plans 를 HTTP로 다시 호출하지 않도록
+파이프라인을 함수로 노출하는 것이 목적이다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from app.core import plan_cache, plan_materializer, prediction_persister
+from app.core.alerts.dedupe import mark_sent, should_send
+from app.core.alerts.discord_alert import send_discord_dev_alert
+from app.core.anomaly import detect_anomaly
+from app.core.context_extractor import extract_context
+from app.core.errors import PredictionError
+from app.core.forecast import Forecast, PredictionLike, forecast_values
+from app.core.policy import postprocess_forecast, postprocess_forecasts
+from app.core.predictor.base import BasePredictor, BatchItem
+from app.core.predictor.data_sources import get_data_source
+from app.core.predictor.baseline_predictor import BaselinePredictor
+from app.core.predictor.lstm_predictor import LSTMPredictor
+from app.core.router import select_route
+from app.core.singleflight import SingleFlight
+from app.models.common import DEFAULT_HORIZON_HOURS, MCPContext
+from app.models.plans import (
+    BatchPlanResult,
+    BatchPlansRequest,
+    BatchPlansResponse,
+    MultiPlansRequest,
+    MultiPlansResponse,
+    PlansRequest,
+    PlansResponse,
+    PlanStreamLine,
+)
+
+logger = logging.getLogger(__name__)
+
+# 지연 생성용 레지스트리: 앱 시작 시 무거운 모델/IO를 실행하지 않기 위함
+_PREDICTORS: dict[str, BasePredictor] = {}
+
+# 동일 (저장소, metric, 컨텍스트, 모델) 예측이 동시에 들어오면 한 번만 계산
+_PREDICTION_FLIGHT: SingleFlight[Forecast] = SingleFlight()
+
+_FLAVOR_DAILY_COST = {"small": 1.2, "medium": 2.8, "large": 5.5}
+
+# 멀티 호출은 weekend도 저사용 시간대로 취급한다 (기존 /plans/multi 동작 유지)
+_MULTI_DOWNGRADE_SLOTS = ("low", "weekend")
+
+# 배치/스트리밍 처리 단위: 이 개수만큼 저장소를 묶어 조회/추론하고 바로 내보낸다
+_BATCH_CHUNK_SIZE = int(os.getenv("BATCH_PLAN_CHUNK_SIZE", "50"))
+_PLAN_NOTES = "(더미) cost/flavor 룰 기반 산정"
+
+
+def get_predictor(kind: str) -> BasePredictor:
+    """첫 사용 시 인스턴스 생성 (lazy init)."""
+    if kind not in _PREDICTORS:
+        if kind == "lstm":
+            _PREDICTORS[kind] = LSTMPredictor()
+        else:
+            _PREDICTORS[kind] = BaselinePredictor()
+    return _PREDICTORS[kind]
+
+
+def pick_engine(model_version: str) -> BasePredictor:
+    """
+    model_version 문자열에 'lstm'이 포함된 경우 LSTMPredictor,
+    그 외에는 BaselinePredictor를 반환한다.
+    """
+    if "lstm" in model_version:
+        return get_predictor("lstm")
+    return get_predictor("baseline")
+
+
+def run_prediction(
+    *,
+    github_url: str,
+    metric_name: str,
+    ctx: MCPContext,
+    model_version: str,
+    horizon: int = DEFAULT_HORIZON_HOURS,
+) -> Forecast:
+    """
+    predictor 실행 + 실패 시 baseline 폴백. horizon 은 예측할 시간 수.
+
+    동시에 들어온 동일 요청은 single-flight로 병합되어 하나의 Forecast를 공유한다. (values 는 읽기 전용)
+    """
+
+    def _compute() -> Forecast:
+        try:
+            predictor = pick_engine(model_version)
+            return predictor.predict(
+                github_url=github_url, metric_name=metric_name, ctx=ctx, model_version=model_version, horizon=horizon
+            )
+        except PredictionError as e:
+            # LSTM 등 예측 실패 시 안전하게 baseline으로 폴백
+            logger.exception("Predictor failed for %s, falling back to baseline: %s", metric_name, e)
+            fallback = get_predictor("baseline")
+            return fallback.predict(
+                github_url=github_url, metric_name=metric_name, ctx=ctx, model_version=model_version, horizon=horizon
+            )
+
+    key = plan_cache.make_key(
+        "predict", github_url=github_url, metrics=metric_name, ctx=ctx, model_version=model_version, extra=(horizon,)
+    )
+    raw_pred, _ = _PREDICTION_FLIGHT.do(key, _compute)
+    return raw_pred
+
+
+def recommend_flavor(
+    ctx: MCPContext,
+    pred: PredictionLike,
+    *,
+    downgrade_slots: Iterable[str] = ("low",),
+) -> str:
+    """
+    사용자 수와 시간대 기반 flavor 추천.
+
+    1단계: 사용자 수 기반 기본 사이즈
+    2단계: 시간대 고려 (peak는 한 단계 업, downgrade_slots는 한 단계 다운)
+    3단계: 예측값 기반 안전장치 (극단적 케이스만 large 강제)
+    """
+    expected_users = ctx.expected_users or 100
+    time_slot = ctx.time_slot or "normal"
+
+    if expected_users <= 500:
+        base_flavor = "small"
+    elif expected_users <= 5000:
+        base_flavor = "medium"
+    else:
+        base_flavor = "large"
+
+    recommended = base_flavor
+    if time_slot == "peak":
+        # 피크 타임에는 한 단계 업그레이드
+        if base_flavor == "small":
+            recommended = "medium"
+        elif base_flavor == "medium":
+            recommended = "large"
+    elif time_slot in downgrade_slots:
+        # 저사용 시간대는 한 단계 다운그레이드
+        if base_flavor == "large":
+            recommended = "medium"
+        elif base_flavor == "medium":
+            recommended = "small"
+
+    values = forecast_values(pred)
+    max_val = float(values.max()) if len(values) else 0
+    avg_val = float(values.mean()) if len(values) else 0
+
+    # 예측값이 비정상적으로 높으면 large 강제
+    if max_val > 1000 or avg_val > 500:
+        recommended = "large"
+    return recommended
+
+
+def notify_anomaly(
+    pred: PredictionLike,
+    ctx: MCPContext,
+    recommended_flavor: str,
+    *,
+    hist: Optional[np.ndarray] = None,
+) -> None:
+    """이상 탐지 및 Discord 알림 (비차단). 실패는 로그만 남긴다. hist 는 미리 조회한 과거 데이터."""
+    try:
+        # Z-score 임계값: 기본 5.0 (더 높게 설정하여 false positive 감소)
+        z_thresh = float(os.getenv("ANOMALY_Z_THRESH", "5.0"))
+        anomaly = detect_anomaly(pred, ctx, z_thresh=z_thresh, hist=hist)
+        if not anomaly.get("anomaly_detected"):
+            return
+
+        webhook = os.getenv("DISCORD_WEBHOOK_URL") or os.getenv("DISCORD_WEBHOOK")
+        username = os.getenv("DISCORD_BOT_NAME", "MCP-dangerous")
+        avatar_url = os.getenv("DISCORD_BOT_AVATAR")
+
+        # 중복 방지 키(동일 저장소/지표/모델/시간대 기준)
+        dedup_key = "|".join(
+            [
+                str(pred.github_url),
+                str(pred.metric_name),
+                str(pred.model_version),
+                str(getattr(ctx, "time_slot", "unknown")),
+            ]
+        )
+        if not should_send(dedup_key):
+            return
+
+        ctx_dict = {
+            "runtime_env": getattr(ctx, "runtime_env", None),
+            "time_slot": getattr(ctx, "time_slot", None),
+            "expected_users": getattr(ctx, "expected_users", None),
+            "service_type": getattr(ctx, "service_type", None),
+            "model_version": str(pred.model_version),
+        }
+        stats = {
+            "hist_mean": anomaly.get("hist_mean"),
+            "hist_std": anomaly.get("hist_std"),
+            "hist_median": anomaly.get("hist_median"),
+            "max_pred": anomaly.get("max_pred"),
+            "avg_pred": anomaly.get("avg_pred"),
+            "score": anomaly.get("score"),
+            "score_breakdown": anomaly.get("score_breakdown"),
+            "data_points_used": anomaly.get("data_points_used"),
+            "outliers_removed": anomaly.get("outliers_removed"),
+        }
+        # 권고 조치 메시지
+        action_msg = f"현재 추천 스펙: {recommended_flavor}. 트래픽 급증이 지속되면 임시 스케일 업을 검토하세요."
+
+        if webhook:
+            send_discord_dev_alert(
+                webhook_url=webhook,
+                service_url=pred.github_url,
+                metric_name=pred.metric_name,
+                current_value=float(anomaly.get("score", 0.0)),
+                threshold_value=float(anomaly.get("threshold", 0.0)),
+                context=ctx_dict,
+                stats=stats,
+                action=action_msg,
+                dedup_key=dedup_key,
+                username=username,
+                avatar_url=avatar_url,
+            )
+            mark_sent(dedup_key)
+    except Exception:
+        logger.exception("Discord alert failed (non-blocking) [%s]", pred.metric_name)
+
+
+def _plan_metric(
+    github_url: str,
+    metric_name: str,
+    ctx: MCPContext,
+    model_version: str,
+    *,
+    downgrade_slots: Iterable[str],
+    horizon: int = DEFAULT_HORIZON_HOURS,
+    requirements: Optional[str] = None,
+) -> PlansResponse:
+    raw_pred = run_prediction(
+        github_url=github_url, metric_name=metric_name, ctx=ctx, model_version=model_version, horizon=horizon
+    )
+    return _finish_plan(
+        postprocess_forecast(raw_pred, ctx), ctx, downgrade_slots=downgrade_slots, requirements=requirements
+    )
+
+
+def _finish_plan(
+    final_pred: Forecast,
+    ctx: MCPContext,
+    *,
+    downgrade_slots: Iterable[str],
+    hist: Optional[np.ndarray] = None,
+    alert: bool = True,
+    requirements: Optional[str] = None,
+) -> PlansResponse:
+    """
+    후처리된 예측 → flavor 추천 → 이상 탐지 → PlansResponse.
+
+    중간 단계는 모두 Forecast 배열로 처리하고, 공개 계약(PredictionResult)으로는 마지막에 한 번만 변환한다.
+    alert=False 이면 이상 탐지 알림을 보내지 않는다. (사용자 요청이 아닌 사전 계산 경로)
+    requirements 는 요청의 자연어 요구사항으로, 이력 저장 시 requirements_text 로 남는다.
+    """
+    recommended_flavor = recommend_flavor(ctx, final_pred, downgrade_slots=downgrade_slots)
+    if alert:
+        notify_anomaly(final_pred, ctx, recommended_flavor, hist=hist)
+    # 이력 저장은 큐에 넣기만 한다 (write-behind, 비활성이면 no-op)
+    prediction_persister.enqueue(
+        final_pred,
+        ctx,
+        recommended_flavor=recommended_flavor,
+        expected_cost_per_day=_FLAVOR_DAILY_COST[recommended_flavor],
+        requirements_text=requirements,
+    )
+
+    # 모든 필드가 이미 검증된 값이므로 재검증 없이 생성
+    return PlansResponse.model_construct(
+        prediction=final_pred.to_result(),
+        recommended_flavor=recommended_flavor,
+        expected_cost_per_day=_FLAVOR_DAILY_COST[recommended_flavor],
+        generated_at=datetime.utcnow(),
+        notes=_PLAN_NOTES,
+    )
+
+
+def _plan_key(github_url: str, metric_name: str, ctx: MCPContext, model_version: str, horizon: int):
+    """/plans 결과 캐시 키. /plans/batch 도 같은 키를 사용해 결과를 공유한다."""
+    return plan_cache.make_key(
+        "plans", github_url=github_url, metrics=metric_name, ctx=ctx, model_version=model_version, extra=(horizon,)
+    )
+
+
+def build_plan(req: PlansRequest) -> PlansResponse:
+    """단일 metric 예측 플랜. /plans 와 /deploy 가 공통으로 사용한다."""
+    ctx = extract_context(req.context.model_dump())
+    model_version, _ = select_route(ctx)
+
+    # 다음 정시에 미리 계산할 대상으로 기록 (plan_materializer 비활성이면 no-op)
+    plan_materializer.track(req.github_url, req.metric_name, ctx, req.horizon_hours)
+
+    # 동일 컨텍스트/모델/데이터 워터마크 결과가 있으면 그대로 재사용
+    cache_key = _plan_key(req.github_url, req.metric_name, ctx, model_version, req.horizon_hours)
+    cached = plan_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    response = _plan_metric(
+        req.github_url,
+        req.metric_name,
+        ctx,
+        model_version,
+        downgrade_slots=("low",),
+        horizon=req.horizon_hours,
+        requirements=req.requirements,
+    )
+    plan_cache.put(cache_key, response)
+    return response
+
+
+def build_multi_plan(req: MultiPlansRequest) -> MultiPlansResponse:
+    """여러 metric 예측 플랜. 각 metric 결과는 PlansResponse와 동일한 형태."""
+    ctx = extract_context(req.context.model_dump())
+    model_version, _ = select_route(ctx)
+
+    cache_key = plan_cache.make_key(
+        "multi",
+        github_url=req.github_url,
+        metrics=req.metric_names,
+        ctx=ctx,
+        model_version=model_version,
+        extra=(req.horizon_hours,),
+    )
+    cached = plan_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    results: dict[str, PlansResponse] = {}
+    for metric in req.metric_names:
+        results[metric] = _plan_metric(
+            req.github_url,
+            metric,
+            ctx,
+            model_version,
+            downgrade_slots=_MULTI_DOWNGRADE_SLOTS,
+            horizon=req.horizon_hours,
+            requirements=req.requirements,
+        )
+
+    response = MultiPlansResponse(results=results, generated_at=datetime.utcnow())
+    plan_cache.put(cache_key, response)
+    return response
+
+
+def iter_multi_plan(req: MultiPlansRequest) -> Iterator[PlanStreamLine]:
+    """
+    /plans/multi 스트리밍 모드. metric 하나가 끝날 때마다 한 줄씩 내보낸다.
+
+    전체 결과를 모아 두지 않으므로 결과 캐시(kind "multi")에는 저장하지 않는다.
+    (metric 별 예측 자체는 single-flight/predict 경로를 그대로 탄다)
+    """
+    ctx = extract_context(req.context.model_dump())
+    model_version, _ = select_route(ctx)
+
+    cached = plan_cache.get(
+        plan_cache.make_key(
+            "multi",
+            github_url=req.github_url,
+            metrics=req.metric_names,
+            ctx=ctx,
+            model_version=model_version,
+            extra=(req.horizon_hours,),
+        )
+    )
+    if cached is not None:
+        for metric, response in cached.results.items():
+            yield PlanStreamLine(github_url=req.github_url, context_id=ctx.context_id, metric_name=metric, result=response)
+        return
+
+    for metric in req.metric_names:
+        try:
+            response = _plan_metric(
+                req.github_url,
+                metric,
+                ctx,
+                model_version,
+                downgrade_slots=_MULTI_DOWNGRADE_SLOTS,
+                horizon=req.horizon_hours,
+                requirements=req.requirements,
+            )
+        except Exception as exc:  # noqa: BLE001 - 스트림 도중 실패는 해당 줄의 error 로 노출
+            logger.exception("Streaming multi plan failed for %s", metric)
+            yield PlanStreamLine(github_url=req.github_url, context_id=ctx.context_id, metric_name=metric, error=str(exc))
+            continue
+        yield PlanStreamLine(github_url=req.github_url, context_id=ctx.context_id, metric_name=metric, result=response)
+
+
+def run_prediction_batch(
+    items: Sequence[BatchItem],
+    *,
+    metric_name: str,
+    model_version: str,
+    horizon: int = DEFAULT_HORIZON_HOURS,
+) -> list[Forecast]:
+    """predictor.predict_batch + 실패 시 baseline 배치로 폴백 (run_prediction 의 배치 버전)."""
+    try:
+        return pick_engine(model_version).predict_batch(
+            items, metric_name=metric_name, model_version=model_version, horizon=horizon
+        )
+    except PredictionError as e:
+        logger.exception("Batch predictor failed for %s, falling back to baseline: %s", metric_name, e)
+        return get_predictor("baseline").predict_batch(
+            items, metric_name=metric_name, model_version=model_version, horizon=horizon
+        )
+
+
+def _fetch_history_bulk(github_urls: Sequence[str], metric_name: str) -> dict[str, np.ndarray]:
+    """이상 탐지용 과거 데이터를 저장소 전체에 대해 한 번에 조회한다. 실패 시 빈 dict."""
+    try:
+        hours = int(os.getenv("ANOMALY_HISTORY_HOURS", "168"))
+        return get_data_source().fetch_many(github_urls, metric_name, hours=hours)
+    except Exception:
+        logger.exception("Bulk history fetch failed for %s (anomaly scoring skipped)", metric_name)
+        return {}
+
+
+def _plan_batch_metric(
+    entries: Sequence[tuple[int, str, MCPContext, str]],
+    metric_name: str,
+    *,
+    horizon: int = DEFAULT_HORIZON_HOURS,
+    alert: bool = True,
+) -> dict[int, PlansResponse | Exception]:
+    """
+    한 metric 에 대해 여러 (index, github_url, ctx, model_version) 플랜을 계산한다.
+
+    캐시 키는 /plans 와 같으므로 단건 요청과 결과를 공유한다.
+    캐시 미스만 model_version 별로 묶어 run_batch 로 예측한다. alert 는 _finish_plan 으로 전달된다.
+    """
+    out: dict[int, PlansResponse | Exception] = {}
+    misses: dict[str, list[tuple[int, str, MCPContext, str]]] = {}
+
+    for idx, url, ctx, model_version in entries:
+        cached = plan_cache.get(_plan_key(url, metric_name, ctx, model_version, horizon))
+        if cached is not None:
+            out[idx] = cached
+        else:
+            misses.setdefault(model_version, []).append((idx, url, ctx, model_version))
+
+    if not misses:
+        return out
+
+    hist = _fetch_history_bulk([e[1] for group in misses.values() for e in group], metric_name)
+    empty = np.empty(0, dtype=float)
+
+    for model_version, group in misses.items():
+        try:
+            preds = run_prediction_batch(
+                [(url, ctx) for _, url, ctx, _ in group],
+                metric_name=metric_name,
+                model_version=model_version,
+                horizon=horizon,
+            )
+            # 그룹 전체를 (N, H) 배열로 묶어 정책을 한 번에 적용
+            final_preds = postprocess_forecasts(preds, [ctx for _, _, ctx, _ in group])
+        except Exception as exc:  # noqa: BLE001 - 항목별 error 로 노출
+            logger.exception("Batch prediction failed for %s/%s", metric_name, model_version)
+            out.update({idx: exc for idx, *_ in group})
+            continue
+
+        for (idx, url, ctx, _), final_pred in zip(group, final_preds):
+            try:
+                response = _finish_plan(
+                    final_pred, ctx, downgrade_slots=("low",), hist=hist.get(url, empty), alert=alert
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Batch plan failed for %s", url)
+                out[idx] = exc
+                continue
+            plan_cache.put(_plan_key(url, metric_name, ctx, model_version, horizon), response)
+            out[idx] = response
+    return out
+
+
+def _iter_batch(req: BatchPlansRequest, size: int) -> Iterator[tuple[int, PlanStreamLine]]:
+    """(요청 내 항목 index, 결과 줄)을 chunk 단위로 계산하며 내보낸다."""
+    for start in range(0, len(req.items), size):
+        entries: list[tuple[int, str, MCPContext, str]] = []
+        for idx, item in enumerate(req.items[start:start + size], start):
+            try:
+                ctx = extract_context(item.context.model_dump())
+                model_version, _ = select_route(ctx)
+            except Exception as exc:  # noqa: BLE001
+                yield idx, PlanStreamLine(
+                    github_url=item.github_url, context_id=item.context.context_id, error=f"invalid context: {exc}"
+                )
+                continue
+            entries.append((idx, item.github_url, ctx, model_version))
+
+        for metric in req.metric_names:
+            outcomes = _plan_batch_metric(entries, metric, horizon=req.horizon_hours)
+            for idx, url, ctx, _ in entries:
+                outcome = outcomes[idx]
+                line = PlanStreamLine(github_url=url, context_id=ctx.context_id, metric_name=metric)
+                if isinstance(outcome, Exception):
+                    line.error = str(outcome)
+                else:
+                    line.result = outcome
+                yield idx, line
+
+
+def iter_batch_plan(req: BatchPlansRequest, *, chunk_size: Optional[int] = None) -> Iterator[PlanStreamLine]:
+    """
+    여러 저장소/컨텍스트 플랜을 chunk 단위로 계산하며 결과를 한 줄씩 내보낸다. (/plans/batch?stream=true)
+
+    - 과거 데이터는 chunk × metric 마다 fetch_many 한 번으로 조회
+    - 예측은 chunk × metric × model_version 마다 predictor.run_batch 한 번으로 수행
+    - 항목별 실패는 전체를 실패시키지 않고 해당 줄의 error 로 반환
+    - 각 metric 결과는 /plans 와 같은 형태 (저사용 다운그레이드는 "low" 만 적용)
+
+    한 번에 chunk 하나의 결과만 메모리에 두므로 항목 수와 무관하게 메모리 사용이 일정하다.
+    """
+    for _, line in _iter_batch(req, max(1, chunk_size or _BATCH_CHUNK_SIZE)):
+        yield line
+
+
+def build_batch_plan(req: BatchPlansRequest) -> BatchPlansResponse:
+    """iter_batch_plan 과 같은 계산 결과를 저장소별로 모아 한 번에 반환한다. (/plans/batch 기본 모드)"""
+    results = [BatchPlanResult(github_url=item.github_url, context_id=item.context.context_id) for item in req.items]
+
+    for idx, line in _iter_batch(req, max(1, _BATCH_CHUNK_SIZE)):
+        if line.error is not None:
+            # 여러 metric 이 실패하면 덮어쓰지 않고 "; " 로 이어 붙인다
+            message = f"{line.metric_name}: {line.error}" if line.metric_name else line.error
+            results[idx].error = f"{results[idx].error}; {message}" if results[idx].error else message
+        else:
+            results[idx].results[line.metric_name] = line.result
+
+    return BatchPlansResponse(results=results, generated_at=datetime.utcnow())
+
+
+def prewarm_plans(
+    items: Iterable[tuple[str, str, MCPContext, int]],
+    *,
+    chunk_size: Optional[int] = None,
+) -> tuple[int, int]:
+    """
+    (github_url, metric_name, ctx, horizon) 플랜을 미리 계산해 /plans 결과 캐시에 넣는다. (plan_materializer)
+
+    /plans/batch 와 같은 경로와 캐시 키를 쓰므로, 이후 같은 컨텍스트의 /plans 요청은 캐시에서 응답한다.
+    (성공, 실패) 플랜 수를 반환한다.
+    """
+    groups: dict[tuple[str, int], list[tuple[str, MCPContext]]] = {}
+    for url, metric, ctx, horizon in items:
+        groups.setdefault((metric, horizon), []).append((url, ctx))
+
+    size = max(1, chunk_size or _BATCH_CHUNK_SIZE)
+    planned = failed = 0
+    for (metric, horizon), group in groups.items():
+        for start in range(0, len(group), size):
+            entries = [
+                (idx, url, ctx, select_route(ctx)[0]) for idx, (url, ctx) in enumerate(group[start:start + size])
+            ]
+            # 매 정시 같은 플랜을 다시 계산하므로 이상 탐지 알림은 사용자 요청 경로에서만 보낸다
+            outcomes = _plan_batch_metric(entries, metric, horizon=horizon, alert=False)
+            errors = sum(isinstance(o, Exception) for o in outcomes.values())
+            failed += errors
+            planned += len(outcomes) - errors
+    return planned, failed
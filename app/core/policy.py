@@ -4,42 +4,194 @@ Prediction post-processing policy.
 - 가중치(weight) 적용
 - 메트릭 특성에 맞는 clamp/보정
 - downstream 시스템이 바로 활용할 수 있는 안정된 값 제공
+
+정책은 (N, H) 배열 전체에 NumPy 연산으로 적용되는 단계(stage)들의 조합이다.
+단계를 추가해도 시점(point)마다 Python 코드를 실행하지 않으며, 여러 예측을 한 번에
+(배치) 처리할 수 있다. 기본 파이프라인은 weight → smoothing → headroom → clamp 이고,
+smoothing/headroom 은 환경변수로 켤 때만 포함된다.
 """
 
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Protocol, Sequence
+
+import numpy as np
 
-from app.core.metrics import get_metric_meta
+from app.core.forecast import Forecast
+from app.core.metrics import MetricMeta, get_metric_meta
 from app.models.common import MCPContext, PredictionPoint, PredictionResult
 
+SMOOTHING_WINDOW = int(os.getenv("POLICY_SMOOTHING_WINDOW", "1"))  # 1 이하이면 비활성
+HEADROOM = float(os.getenv("POLICY_HEADROOM", "1.0"))  # 1.0 이면 비활성
+
 
 def apply_weight(value: float, weight: float) -> float:
     """서비스별 중요도 가중치 반영."""
     return value * weight
 
 
-def postprocess_predictions(pred: PredictionResult, ctx: MCPContext) -> PredictionResult:
+# ----------------------------------------------------------------------
+# 정책 단계
+# ----------------------------------------------------------------------
+class PolicyStage(Protocol):
     """
-    Predictor가 생성한 PredictionResult를 정책적으로 보정한다.
+    values: (N, H) 예측값, weights: (N, 1) 컨텍스트 가중치.
+    입력 배열을 수정하지 않고 새 배열을 반환한다.
+    """
+
+    def __call__(self, values: np.ndarray, meta: MetricMeta, weights: np.ndarray) -> np.ndarray: ...
+
+
+@dataclass(frozen=True)
+class WeightStage:
+    """컨텍스트 weight 만큼 scaling."""
+
+    def __call__(self, values: np.ndarray, meta: MetricMeta, weights: np.ndarray) -> np.ndarray:
+        return values * weights
+
 
-    단계:
-        1) 컨텍스트 weight만큼 scaling
-        2) ratio/count 메트릭에 따른 clamp 정책 사용 -> metrics.py의 MetricMeta 활용
+@dataclass(frozen=True)
+class SmoothingStage:
+    """후행(trailing) 이동평균. 앞쪽 window-1 시점은 가용한 값만으로 평균낸다."""
+
+    window: int
+
+    def __call__(self, values: np.ndarray, meta: MetricMeta, weights: np.ndarray) -> np.ndarray:
+        horizon = values.shape[1]
+        if self.window <= 1 or horizon == 0:
+            return values
+        csum = np.cumsum(values, axis=1)
+        shifted = np.zeros_like(csum)
+        if horizon > self.window:
+            shifted[:, self.window:] = csum[:, :-self.window]
+        counts = np.minimum(np.arange(1, horizon + 1), self.window)
+        return (csum - shifted) / counts
+
+
+@dataclass(frozen=True)
+class HeadroomStage:
+    """용량 여유분(factor 배)을 반영한다. ratio 메트릭은 이후 clamp 단계에서 상한이 다시 적용된다."""
+
+    factor: float
+
+    def __call__(self, values: np.ndarray, meta: MetricMeta, weights: np.ndarray) -> np.ndarray:
+        return values * self.factor
+
+
+@dataclass(frozen=True)
+class ClampStage:
     """
+    ratio/count 메트릭에 따른 clamp 정책 -> metrics.py 의 MetricMeta 활용.
 
-    meta = get_metric_meta(pred.metric_name)
-    processed = []
-    for point in pred.predictions:
-        weighted_value = apply_weight(point.value, ctx.weight)
+    - ratio: NaN 은 0.0, [clamp_min, clamp_max] 로 제한
+    - count: NaN/하한 미만은 clamp_min (상한이 정의된 경우에만 상한 적용)
+    """
+
+    def __call__(self, values: np.ndarray, meta: MetricMeta, weights: np.ndarray) -> np.ndarray:
         if meta.kind == "ratio":
-            adjusted = meta.clamp(weighted_value)
-        else:
-            adjusted = weighted_value if weighted_value >= meta.clamp_min else meta.clamp_min
-        processed.append(PredictionPoint(time=point.time, value=adjusted))
+            return meta.clamp_array(values)
+        # NaN 은 비교가 거짓이므로 clamp_min 으로 대체된다
+        out = np.where(values >= meta.clamp_min, values, meta.clamp_min)
+        if meta.clamp_max is not None:
+            out = np.minimum(out, meta.clamp_max)
+        return out
+
+
+@dataclass(frozen=True)
+class PolicyPipeline:
+    stages: tuple[PolicyStage, ...]
+
+    def apply(self, values: np.ndarray, meta: MetricMeta, weights: np.ndarray | float) -> np.ndarray:
+        """values: (H,) 또는 (N, H). weights: 스칼라 또는 (N,). 입력과 같은 shape 로 반환한다."""
+        arr = np.asarray(values, dtype=float)
+        batch = np.atleast_2d(arr)
+        w = np.broadcast_to(np.asarray(weights, dtype=float).reshape(-1, 1), (batch.shape[0], 1))
+        for stage in self.stages:
+            batch = stage(batch, meta, w)
+        return batch.reshape(arr.shape)
+
+
+def build_pipeline(*, smoothing_window: int | None = None, headroom: float | None = None) -> PolicyPipeline:
+    """기본 파이프라인. 인자를 생략하면 환경변수 설정을 사용한다."""
+    window = SMOOTHING_WINDOW if smoothing_window is None else smoothing_window
+    factor = HEADROOM if headroom is None else headroom
+
+    stages: list[PolicyStage] = [WeightStage()]
+    if window > 1:
+        stages.append(SmoothingStage(window))
+    if factor != 1.0:
+        stages.append(HeadroomStage(factor))
+    stages.append(ClampStage())
+    return PolicyPipeline(tuple(stages))
+
+
+DEFAULT_PIPELINE = build_pipeline()
+
+
+# ----------------------------------------------------------------------
+# 진입점
+# ----------------------------------------------------------------------
+def postprocess_forecast(fc: Forecast, ctx: MCPContext, *, pipeline: PolicyPipeline | None = None) -> Forecast:
+    """Forecast 배열에 정책 파이프라인을 한 번에 적용한다."""
+    pipeline = pipeline or DEFAULT_PIPELINE
+    adjusted = pipeline.apply(fc.values, get_metric_meta(fc.metric_name), ctx.weight)
+    return fc.replace(values=adjusted, generated_at=datetime.utcnow())
+
+
+def postprocess_forecasts(
+    forecasts: Sequence[Forecast],
+    ctxs: Sequence[MCPContext],
+    *,
+    pipeline: PolicyPipeline | None = None,
+) -> list[Forecast]:
+    """
+    여러 Forecast 를 (metric, horizon) 별로 (N, H) 배열로 쌓아 정책을 한 번에 적용한다.
+    결과 순서는 입력 순서와 같다.
+    """
+    if len(forecasts) != len(ctxs):
+        raise ValueError("forecasts 와 ctxs 의 길이가 다릅니다")
+
+    pipeline = pipeline or DEFAULT_PIPELINE
+    groups: dict[tuple[str, int], list[int]] = {}
+    for i, fc in enumerate(forecasts):
+        groups.setdefault((fc.metric_name, len(fc)), []).append(i)
+
+    now = datetime.utcnow()
+    out: list[Forecast | None] = [None] * len(forecasts)
+    for (metric_name, _), idxs in groups.items():
+        values = np.stack([forecasts[i].values for i in idxs])
+        weights = np.array([ctxs[i].weight for i in idxs], dtype=float)
+        adjusted = pipeline.apply(values, get_metric_meta(metric_name), weights)
+        for row, i in zip(adjusted, idxs):
+            out[i] = forecasts[i].replace(values=row, generated_at=now)
+    return out  # type: ignore[return-value]
+
+
+def postprocess_predictions(
+    pred: PredictionResult,
+    ctx: MCPContext,
+    *,
+    pipeline: PolicyPipeline | None = None,
+) -> PredictionResult:
+    """
+    Predictor가 생성한 PredictionResult를 정책적으로 보정한다.
+
+    postprocess_forecast 와 같은 파이프라인을 사용하며, 각 시점의 time 은 원본을 유지한다.
+    """
+    pipeline = pipeline or DEFAULT_PIPELINE
+    values = np.fromiter((p.value for p in pred.predictions), dtype=float, count=len(pred.predictions))
+    adjusted = pipeline.apply(values, get_metric_meta(pred.metric_name), ctx.weight)
 
-    return PredictionResult(
+    return PredictionResult.model_construct(
         github_url=pred.github_url,
         metric_name=pred.metric_name,
         model_version=pred.model_version,
         generated_at=datetime.utcnow(),
-        predictions=processed,
+        predictions=[
+            PredictionPoint.model_construct(time=p.time, value=v)
+            for p, v in zip(pred.predictions, adjusted.tolist())
+        ],
     )
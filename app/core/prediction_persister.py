@@ -0,0 +1,277 @@
+"""
+예측 결과 write-behind 저장.
+
+/plans 요청 경로에서는 저장할 레코드를 메모리 큐에 넣기만 하고(enqueue, 비차단),
+백그라운드 스레드가 PREDICTION_PERSIST_FLUSH_MS 마다 또는 PREDICTION_PERSIST_BATCH_SIZE 건이
+모이면 한 트랜잭션으로 묶어 저장한다. 요청 지연에 DB 왕복이 더해지지 않는다.
+
+- 저장 형태: db_sqlalchemy 헬퍼(create_context / create_feature_snapshot / create_prediction)
+  + bulk_points_many (여러 예측의 시점 행을 고정 크기 배치 INSERT 로)
+- 배치당 flush 는 3번(컨텍스트+스냅샷 → 예측 → 시점)이며 모두 같은 트랜잭션이다.
+- service_id / metric_id 는 배치 전체를 한 번에 조회한다. (id_registry, 세션 작업 전에 조회)
+- 큐가 가득 차면 요청을 막지 않고 레코드를 버린다 (dropped 카운터로 노출).
+- 저장 실패한 배치는 재시도하지 않고 로그/카운터만 남긴다.
+
+PREDICTION_PERSIST_ENABLED=1 일 때만 앱 시작 시 켜진다. 실행 중이 아니면 enqueue 는 아무것도 하지 않는다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.forecast import Forecast
+from app.models.common import MCPContext
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = int(os.getenv("PREDICTION_PERSIST_BATCH_SIZE", "200"))
+_FLUSH_MS = int(os.getenv("PREDICTION_PERSIST_FLUSH_MS", "500"))
+_QUEUE_SIZE = int(os.getenv("PREDICTION_PERSIST_QUEUE_SIZE", "10000"))
+
+
+def is_enabled() -> bool:
+    return os.getenv("PREDICTION_PERSIST_ENABLED", "0").strip().lower() in ("1", "true", "yes")
+
+
+@dataclass(frozen=True)
+class PendingPrediction:
+    """저장 대기 중인 예측 1건 (요청 시점 값의 스냅샷)."""
+
+    forecast: Forecast
+    ctx: MCPContext
+    recommended_flavor: Optional[str] = None
+    expected_cost_per_day: Optional[float] = None
+    requirements_text: Optional[str] = None
+
+
+_queue: "queue.Queue[PendingPrediction]" = queue.Queue(maxsize=_QUEUE_SIZE)
+_lock = threading.Lock()
+_stats: Dict[str, Any] = {"written": 0, "dropped": 0, "failed": 0, "batches": 0, "last_flush": None}
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _bump(**deltas: int) -> None:
+    with _lock:
+        for name, delta in deltas.items():
+            _stats[name] += delta
+
+
+def enqueue(
+    forecast: Forecast,
+    ctx: MCPContext,
+    *,
+    recommended_flavor: Optional[str] = None,
+    expected_cost_per_day: Optional[float] = None,
+    requirements_text: Optional[str] = None,
+) -> bool:
+    """저장 큐에 넣는다. 실행 중이 아니거나 큐가 가득 차면 False (요청은 막지 않는다)."""
+    if _thread is None:
+        return False
+    try:
+        _queue.put_nowait(
+            PendingPrediction(
+                forecast=forecast,
+                ctx=ctx,
+                recommended_flavor=recommended_flavor,
+                expected_cost_per_day=expected_cost_per_day,
+                requirements_text=requirements_text,
+            )
+        )
+        return True
+    except queue.Full:
+        _bump(dropped=1)
+        logger.warning("Prediction persist queue full, dropping %s/%s", forecast.github_url, forecast.metric_name)
+        return False
+
+
+def write_batch(db: Any, batch: List[PendingPrediction]) -> int:
+    """
+    batch 를 열린 세션 db 에 기록한다. (commit 은 호출자 책임) 저장한 예측 수를 반환.
+
+    컨텍스트 행의 context_id 는 매 저장마다 새 UUID 이며, 요청의 context_id 는 context_json 에 남는다.
+    (요청 context_id 는 재사용될 수 있어 PK 로 쓸 수 없다)
+    입력 구간/특징 수/스케일은 Forecast 에 실린 predictor 값을 그대로 쓰고, 없으면 NULL 로 남긴다.
+    """
+    from app.core import id_registry
+    from app.core.db_sqlalchemy import (
+        bulk_points_many,
+        create_context,
+        create_feature_snapshot,
+        create_prediction,
+    )
+
+    sids = id_registry.service_ids(db, [item.forecast.github_url for item in batch])
+    mids = id_registry.metric_ids(db, [item.forecast.metric_name for item in batch])
+
+    snaps = []
+    for item in batch:
+        fc, ctx = item.forecast, item.ctx
+        row_id = str(uuid.uuid4())
+        window_start = window_end = None
+        if fc.sequence_length is not None:
+            window_end = fc.generated_at
+            window_start = window_end - timedelta(hours=fc.sequence_length)
+        create_context(
+            db,
+            context_id=row_id,
+            github_url=fc.github_url,
+            request_timestamp=ctx.timestamp,
+            context_json=ctx.model_dump(mode="json"),
+            requirements_text=item.requirements_text,
+            service_type=ctx.service_type,
+            runtime_env=ctx.runtime_env,
+            time_slot=ctx.time_slot,
+            expected_users=ctx.expected_users,
+            region=ctx.region,
+        )
+        snaps.append(
+            create_feature_snapshot(
+                db,
+                context_id=row_id,
+                github_url=fc.github_url,
+                window_start=window_start,
+                window_end=window_end,
+                sequence_length=fc.sequence_length,
+                feature_count=fc.feature_count,
+                features_json={"metric_name": fc.metric_name, "model_version": fc.model_version},
+            )
+        )
+    db.flush()  # feature_snapshot_id 채번
+
+    preds = []
+    for item, snap in zip(batch, snaps):
+        fc = item.forecast
+        preds.append(
+            create_prediction(
+                db,
+                context_id=snap.context_id,
+                feature_snapshot_id=snap.feature_snapshot_id,
+                service_id=sids[fc.github_url],
+                metric_id=mids[fc.metric_name],
+                github_url=fc.github_url,
+                metric_name=fc.metric_name,
+                model_version=fc.model_version,
+                generated_at=fc.generated_at,
+                predictions_json=[
+                    {"time": t.isoformat(), "value": v} for t, v in zip(fc.times, fc.values.tolist())
+                ],
+                scale_factor=fc.scale_factor,
+                recommended_flavor=item.recommended_flavor,
+                expected_cost_per_day=item.expected_cost_per_day,
+            )
+        )
+    db.flush()  # prediction_id 채번
+
+    bulk_points_many(
+        db,
+        (
+            {"prediction_id": pred.prediction_id, "forecast_time": t, "predicted_value": v}
+            for item, pred in zip(batch, preds)
+            for t, v in zip(item.forecast.times, item.forecast.values.tolist())
+        ),
+    )
+    return len(preds)
+
+
+def _flush(batch: List[PendingPrediction], session_factory: Callable[[], Any]) -> None:
+    if not batch:
+        return
+    session = session_factory()
+    try:
+        written = write_batch(session, batch)
+        session.commit()
+        _bump(written=written, batches=1)
+    except Exception:
+        session.rollback()
+        _bump(failed=len(batch))
+        logger.exception("Prediction persist flush failed (%d records dropped)", len(batch))
+    finally:
+        session.close()
+        with _lock:
+            _stats["last_flush"] = datetime.utcnow()
+
+
+def _drain(limit: int) -> List[PendingPrediction]:
+    batch: List[PendingPrediction] = []
+    while len(batch) < limit:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _loop(session_factory: Callable[[], Any], batch_size: int, flush_ms: int) -> None:
+    while not _stop.is_set():
+        try:
+            first = _queue.get(timeout=0.2)
+        except queue.Empty:
+            continue
+
+        # 첫 레코드부터 flush_ms 동안(또는 batch_size 가 찰 때까지) 모은다
+        batch = [first]
+        deadline = time.monotonic() + flush_ms / 1000.0
+        while len(batch) < batch_size and not _stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _flush(batch, session_factory)
+
+    # 종료 시 남은 레코드를 best-effort 로 저장
+    while True:
+        batch = _drain(batch_size)
+        if not batch:
+            break
+        _flush(batch, session_factory)
+
+
+def start(
+    *,
+    session_factory: Optional[Callable[[], Any]] = None,
+    batch_size: Optional[int] = None,
+    flush_ms: Optional[int] = None,
+) -> None:
+    """백그라운드 저장 스레드를 시작한다. 이미 실행 중이면 무시. session_factory 기본값은 SessionLocal."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    if session_factory is None:
+        from app.core.db_sqlalchemy import SessionLocal
+
+        session_factory = SessionLocal
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_loop,
+        args=(session_factory, max(1, batch_size or _BATCH_SIZE), flush_ms if flush_ms is not None else _FLUSH_MS),
+        name="prediction-persister",
+        daemon=True,
+    )
+    _thread.start()
+
+
+def stop(timeout: float = 10.0) -> None:
+    """스레드를 멈추고 큐에 남은 레코드를 저장한 뒤 반환한다."""
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=timeout)
+        _thread = None
+
+
+def stats() -> Dict[str, Any]:
+    with _lock:
+        return {**_stats, "queued": _queue.qsize(), "running": _thread is not None}
@@ -9,8 +9,14 @@ Predictor interface definition.
 """
 
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Tuple
+
+from app.core.forecast import Forecast
 from app.models.common import MCPContext, PredictionResult
 
+# 배치 예측 입력 한 건: (github_url, context)
+BatchItem = Tuple[str, MCPContext]
+
 class BasePredictor(ABC):
     """
     Base class for all predictors.
@@ -18,10 +24,20 @@ class BasePredictor(ABC):
     모든 Predictor 구현체는 run()을 제공해야 한다.
     run()은 github_url/metric_name/ctx/model_version을 받아서
     PredictionResult를 반환해야 한다.
+
+    horizon 은 예측할 시간 수이며, None 이면 predictor 기본값(보통 24시간)을 사용한다.
     """
 
     @abstractmethod
-    def run(self, *, github_url: str, metric_name: str, ctx: MCPContext, model_version: str) -> PredictionResult:
+    def run(
+        self,
+        *,
+        github_url: str,
+        metric_name: str,
+        ctx: MCPContext,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> PredictionResult:
         """
         Execute prediction for the given (github_url, metric_name) under context ctx.
 
@@ -31,4 +47,57 @@ class BasePredictor(ABC):
             예측된 시계열 데이터 목록(predictions[])과 메타정보(model_version 등)를 포함한다.
         """
         
-        ...
\ No newline at end of file
+        ...
+
+    def run_batch(
+        self,
+        items: Sequence[BatchItem],
+        *,
+        metric_name: str,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> list[PredictionResult]:
+        """
+        여러 (github_url, ctx) 에 대한 예측을 입력 순서대로 반환한다.
+
+        기본 구현은 run()을 반복 호출한다. 데이터 조회나 모델 추론을 묶어서
+        처리할 수 있는 predictor는 오버라이드한다.
+        """
+        return [
+            self.run(github_url=url, metric_name=metric_name, ctx=ctx, model_version=model_version, horizon=horizon)
+            for url, ctx in items
+        ]
+
+    def predict(
+        self,
+        *,
+        github_url: str,
+        metric_name: str,
+        ctx: MCPContext,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> Forecast:
+        """
+        내부 경량 표현(Forecast)으로 예측한다. 파이프라인(plan_service)은 이 메서드를 사용한다.
+
+        기본 구현은 run() 결과를 변환한다. 배열로 바로 예측할 수 있는 predictor는 오버라이드한다.
+        """
+        return Forecast.from_result(
+            self.run(
+                github_url=github_url, metric_name=metric_name, ctx=ctx, model_version=model_version, horizon=horizon
+            )
+        )
+
+    def predict_batch(
+        self,
+        items: Sequence[BatchItem],
+        *,
+        metric_name: str,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> list[Forecast]:
+        """run_batch 의 Forecast 버전."""
+        return [
+            Forecast.from_result(r)
+            for r in self.run_batch(items, metric_name=metric_name, model_version=model_version, horizon=horizon)
+        ]
@@ -1,22 +1,77 @@
 """
 Baseline Predictor
 간단한 통계 기반 예측과 폴백 로직을 제공한다.
+
+- 예측 구간(horizon) 전체를 NumPy 배열 연산으로 한 번에 생성한다.
+- 노이즈는 요청 키(github_url, metric, model_version, 예측 시작 시각)로 시드한
+  np.random.Generator 에서 한 번에 뽑으므로, 같은 시간대의 같은 요청은 같은 결과를 낸다.
+- predict_batch 는 여러 저장소를 (N, H) 배열로 묶어 처리한다.
 """
 
+import hashlib
+import os
 from datetime import datetime, timedelta
+from typing import Mapping, Optional, Sequence
 
 import numpy as np
 
-from app.models.common import MCPContext, PredictionResult, PredictionPoint
-from .base import BasePredictor
+from app.core.forecast import Forecast
+from app.models.common import MCPContext, PredictionResult
+from .base import BasePredictor, BatchItem
 from .data_sources import get_data_source
 from app.core.errors import DataNotFoundError
 
+HORIZON_HOURS = int(os.getenv("BASELINE_HORIZON_HOURS", "24"))
+_SEED_SALT = os.getenv("BASELINE_RANDOM_SEED", "")  # 배포별로 노이즈 패턴을 바꾸고 싶을 때 사용
+_NOISE_RATIO = 0.05  # 표준편차 대비 노이즈 크기
+
+
+def request_seed(github_url: str, metric_name: str, model_version: str, start: datetime) -> int:
+    """요청 키로부터 재현 가능한 64bit 시드를 만든다. (프로세스마다 달라지는 hash() 는 사용하지 않는다)"""
+    key = f"{_SEED_SALT}|{github_url}|{metric_name}|{model_version}|{start.isoformat()}"
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+def _slope_factor(ctx: MCPContext) -> float:
+    if ctx.time_slot == "peak":
+        return 1.2
+    if ctx.time_slot == "low":
+        return 0.8
+    return 1.0
+
+
+def _fallback_params(ctx: MCPContext, metric_name: str) -> tuple[float, float]:
+    """컨텍스트 기반 (base, slope) 추정."""
+    expected_users = ctx.expected_users or 100
+
+    if metric_name == "total_events":
+        # 사용자 수 기반 이벤트 추정
+        base = max(10.0, expected_users * 0.05)  # 사용자당 0.05 이벤트/시간
+        slope = base * 0.01  # 1% 증가
+    elif metric_name in ("avg_cpu", "avg_memory"):
+        # CPU/메모리는 비율이므로 0~1 범위
+        base = 0.2  # 20% 기본 사용량
+        slope = 0.005  # 작은 변동
+    else:
+        base = max(5.0, expected_users * 0.1)
+        slope = base * 0.02
+
+    # 시간대별 배수 조정
+    if ctx.time_slot == "peak":
+        base *= 1.5  # 피크타임은 베이스부터 높게
+        slope *= 2
+    elif ctx.time_slot == "low":
+        base *= 0.7
+        base *= 0.7
+        slope *= 0.5
+    return base, slope
+
 
 class BaselinePredictor(BasePredictor):
-    """최근 데이터의 통계값으로 24시간 예측을 생성한다."""
+    """최근 데이터의 통계값으로 horizon 시간 예측을 생성한다. (요청에서 지정하지 않으면 self.horizon)"""
 
-    def __init__(self) -> None:
+    def __init__(self, horizon: Optional[int] = None) -> None:
+        self.horizon = horizon or HORIZON_HOURS
         try:
             self.data_source = get_data_source()
             print("[정보] Baseline Predictor 초기화 완료")
@@ -31,119 +86,171 @@ class BaselinePredictor(BasePredictor):
         metric_name: str,
         ctx: MCPContext,
         model_version: str,
+        horizon: Optional[int] = None,
     ) -> PredictionResult:
+        return self.predict(
+            github_url=github_url, metric_name=metric_name, ctx=ctx, model_version=model_version, horizon=horizon
+        ).to_result()
+
+    def run_batch(
+        self,
+        items: Sequence[BatchItem],
+        *,
+        metric_name: str,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> list[PredictionResult]:
+        return [
+            fc.to_result()
+            for fc in self.predict_batch(items, metric_name=metric_name, model_version=model_version, horizon=horizon)
+        ]
+
+    def predict(
+        self,
+        *,
+        github_url: str,
+        metric_name: str,
+        ctx: MCPContext,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> Forecast:
+        recent: dict[str, np.ndarray] = {}
         try:
             if self.data_source is not None:
-                recent = self.data_source.fetch_historical_data(
-                    github_url=github_url,
-                    metric_name=metric_name,
-                    hours=24,
-                )
-                return self._statistical_prediction(
-                    github_url, metric_name, ctx, model_version, recent
+                recent[github_url] = np.asarray(
+                    self.data_source.fetch_historical_data(
+                        github_url=github_url,
+                        metric_name=metric_name,
+                        hours=24,
+                    ),
+                    dtype=float,
                 )
         except (DataNotFoundError, Exception) as exc:
             print(f"[경고] 데이터 수집 실패: {exc}, 폴백 경로 사용")
 
-        return self._fallback_prediction(github_url, metric_name, ctx, model_version)
+        return self._forecast_many([(github_url, ctx)], metric_name, model_version, recent, horizon=horizon)[0]
 
-    def _statistical_prediction(
+    def predict_batch(
         self,
-        github_url: str,
+        items: Sequence[BatchItem],
+        *,
         metric_name: str,
-        ctx: MCPContext,
         model_version: str,
-        recent_data: np.ndarray,
-    ) -> PredictionResult:
-        avg = float(recent_data.mean())
-        std = float(recent_data.std())
-        last_value = float(recent_data[-1])
-        trend = float(recent_data[-1] - recent_data[0]) / len(recent_data)
+        horizon: Optional[int] = None,
+    ) -> list[Forecast]:
+        """최근 24시간 데이터를 저장소 전체에 대해 한 번에 조회한 뒤 (N, H) 배열로 예측한다."""
+        if not items:
+            return []
+        recent: Mapping[str, np.ndarray] = {}
+        if self.data_source is not None:
+            try:
+                recent = self.data_source.fetch_many([url for url, _ in items], metric_name, hours=24)
+            except Exception as exc:
+                print(f"[경고] 일괄 데이터 수집 실패: {exc}, 폴백 경로 사용")
+        return self._forecast_many(items, metric_name, model_version, recent, horizon=horizon)
 
-        print(
-            f"[디버그] 통계값: 평균={avg:.2f}, 표준편차={std:.2f}, 추세={trend:.2f}"
-        )
-
-        if ctx.time_slot == "peak":
-            slope_factor = 1.2
-        elif ctx.time_slot == "low":
-            slope_factor = 0.8
-        else:
-            slope_factor = 1.0
+    # ------------------------------------------------------------------
+    # 내부 헬퍼
+    # ------------------------------------------------------------------
+    def _forecast_many(
+        self,
+        items: Sequence[BatchItem],
+        metric_name: str,
+        model_version: str,
+        recent: Mapping[str, np.ndarray],
+        *,
+        horizon: Optional[int] = None,
+    ) -> list[Forecast]:
+        horizon = horizon or self.horizon
+        now = datetime.utcnow()
+        start = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
 
-        now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-        predictions = []
+        stat_idx = [i for i, (url, _) in enumerate(items) if len(recent.get(url, ())) > 0]
+        fallback_idx = [i for i, (url, _) in enumerate(items) if len(recent.get(url, ())) == 0]
 
-        for step in range(1, 25):
-            value = last_value + trend * step * slope_factor
-            noise = np.random.normal(0, std * 0.05)
-            value = max(0, value + noise)
+        out: list[Optional[Forecast]] = [None] * len(items)
+        if stat_idx:
+            group = [items[i] for i in stat_idx]
+            values = self._statistical_values(
+                [np.asarray(recent[url], dtype=float) for url, _ in group],
+                [ctx for _, ctx in group],
+                metric_name,
+                horizon=horizon,
+                seeds=[request_seed(url, metric_name, model_version, start) for url, _ in group],
+            )
+            for i, row in zip(stat_idx, values):
+                out[i] = self._make_forecast(
+                    items[i][0], metric_name, f"{model_version}_statistical", now, start, row,
+                    sequence_length=len(recent[items[i][0]]),
+                )
+        if fallback_idx:
+            print(f"[경고] 데이터 부족으로 폴백 예측 실행 ({len(fallback_idx)}건)")
+            values = self._fallback_values([items[i][1] for i in fallback_idx], metric_name, horizon=horizon)
+            for i, row in zip(fallback_idx, values):
+                out[i] = self._make_forecast(items[i][0], metric_name, f"{model_version}_fallback", now, start, row)
+        return out  # type: ignore[return-value]
 
-            if metric_name == "total_events":
-                value = round(value)
+    def _statistical_values(
+        self,
+        recent: Sequence[np.ndarray],
+        ctxs: Sequence[MCPContext],
+        metric_name: str,
+        *,
+        horizon: int,
+        seeds: Sequence[int],
+    ) -> np.ndarray:
+        """
+        저장소별 (last, trend, std) 로 (N, H) 예측을 만든다.
+        value = max(0, last + trend * step * slope_factor + N(0, std * 0.05))
+        """
+        last = np.array([r[-1] for r in recent])
+        trend = np.array([(r[-1] - r[0]) / len(r) for r in recent])
+        std = np.array([r.std() for r in recent])
+        slope = np.array([_slope_factor(ctx) for ctx in ctxs])
 
-            predictions.append(
-                PredictionPoint(time=now + timedelta(hours=step), value=float(value))
+        if len(recent) == 1:
+            print(
+                f"[디버그] 통계값: 평균={float(recent[0].mean()):.2f}, 표준편차={std[0]:.2f}, 추세={trend[0]:.2f}"
             )
 
-        return PredictionResult(
-            github_url=github_url,
-            metric_name=metric_name,
-            model_version=f"{model_version}_statistical",
-            generated_at=datetime.utcnow(),
-            predictions=predictions,
-        )
+        steps = np.arange(1, horizon + 1, dtype=float)
+        noise = np.stack([np.random.default_rng(seed).normal(size=horizon) for seed in seeds])
+        values = last[:, None] + (trend * slope)[:, None] * steps + noise * (std * _NOISE_RATIO)[:, None]
+        values = np.maximum(values, 0.0)
+
+        if metric_name == "total_events":
+            values = np.round(values)
+        return values
+
+    def _fallback_values(self, ctxs: Sequence[MCPContext], metric_name: str, *, horizon: int) -> np.ndarray:
+        """컨텍스트 기반 선형 추정 (N, H). value = base + slope * step"""
+        params = np.array([_fallback_params(ctx, metric_name) for ctx in ctxs], dtype=float).reshape(-1, 2)
+        steps = np.arange(1, horizon + 1, dtype=float)
+        values = params[:, :1] + params[:, 1:] * steps
 
-    def _fallback_prediction(
+        if metric_name == "total_events":
+            values = np.round(values)
+        return values
+
+    def _make_forecast(
         self,
         github_url: str,
         metric_name: str,
-        ctx: MCPContext,
         model_version: str,
-    ) -> PredictionResult:
-        print("[경고] 데이터 부족으로 폴백 예측 실행")
-
-        # 컨텍스트 기반 베이스라인 추정
-        expected_users = ctx.expected_users or 100
-        
-        if metric_name == "total_events":
-            # 사용자 수 기반 이벤트 추정
-            base = max(10.0, expected_users * 0.05)  # 사용자당 0.05 이벤트/시간
-            slope = base * 0.01  # 1% 증가
-        elif metric_name in ("avg_cpu", "avg_memory"):
-            # CPU/메모리는 비율이므로 0~1 범위
-            base = 0.2  # 20% 기본 사용량
-            slope = 0.005  # 작은 변동
-        else:
-            base = max(5.0, expected_users * 0.1)
-            slope = base * 0.02
-
-        # 시간대별 배수 조정
-        if ctx.time_slot == "peak":
-            base *= 1.5  # 피크타임은 베이스부터 높게
-            slope *= 2
-        elif ctx.time_slot == "low":
-            base *= 0.7
-            base *= 0.7
-            slope *= 0.5
-
-        now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-        predictions = []
-
-        for step in range(1, 25):
-            value = base + slope * step
-
-            if metric_name == "total_events":
-                value = round(value)
-
-            predictions.append(
-                PredictionPoint(time=now + timedelta(hours=step), value=float(value))
-            )
-
-        return PredictionResult(
+        generated_at: datetime,
+        start: datetime,
+        values: np.ndarray,
+        *,
+        sequence_length: Optional[int] = None,
+    ) -> Forecast:
+        # 통계 경로는 해당 metric 하나의 최근 값만 입력으로 쓰고, 폴백 경로는 입력 데이터가 없다
+        return Forecast(
             github_url=github_url,
             metric_name=metric_name,
-            model_version=f"{model_version}_fallback",
-            generated_at=datetime.utcnow(),
-            predictions=predictions,
+            model_version=model_version,
+            generated_at=generated_at,
+            start=start,
+            values=values,
+            sequence_length=sequence_length,
+            feature_count=1 if sequence_length else None,
         )
@@ -6,11 +6,13 @@ Data Sources Package
 from .base import DataSource
 from .csv_source import CSVDataSource
 from .mysql_source import MySQLDataSource
+from .sqlite_source import SQLiteDataSource
 from .factory import get_data_source
 
 __all__ = [
     "DataSource",
     "CSVDataSource",
     "MySQLDataSource",
+    "SQLiteDataSource",
     "get_data_source",
 ]
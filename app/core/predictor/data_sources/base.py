@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
 import numpy as np
 from app.core.errors import DataSourceError, DataNotFoundError
 
@@ -19,6 +19,48 @@ class DataSource(ABC):
         """최근 N시간 데이터 조회 (168개 값 반환)"""
         pass
     
+    def fetch_many(
+        self,
+        github_urls: Sequence[str],
+        metric_name: str,
+        hours: int = 168,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        여러 저장소의 최근 N시간 데이터를 한 번에 조회한다. (배치 플랜용)
+
+        기본 구현은 저장소별로 fetch_historical_data 를 호출한다. 백엔드가 한 번의
+        쿼리로 가져올 수 있으면 오버라이드한다. 데이터가 없는 저장소는 결과에서 빠진다.
+        """
+        result: Dict[str, np.ndarray] = {}
+        for url in dict.fromkeys(github_urls):
+            try:
+                result[url] = self.fetch_historical_data(url, metric_name, hours=hours, end_time=end_time)
+            except (DataNotFoundError, DataSourceError):
+                continue
+        return result
+
+    def append(self, points: Iterable[Mapping[str, Any]]) -> int:
+        """
+        {"github_url", "metric_name", "ts", "value"} 점들을 적재하고 적재 시도한 행 수를 반환한다.
+
+        쓰기를 지원하지 않는 백엔드(CSV)는 DataSourceError. (/metrics/ingest 참고)
+        """
+        raise DataSourceError(f"{type(self).__name__} 는 적재를 지원하지 않음")
+
+    @staticmethod
+    def _fit(values: np.ndarray, hours: int) -> np.ndarray:
+        """hours 길이로 맞춘다. (부족하면 첫 값으로 앞쪽 패딩, 넘치면 최근 값만)"""
+        if len(values) < hours:
+            pad_len = hours - len(values)
+            pad_val = values[0] if len(values) > 0 else 0.0
+            pad = np.full(pad_len, pad_val, dtype=float)
+            values = np.concatenate([pad, values])
+        elif len(values) > hours:
+            values = values[-hours:]
+
+        return values
+
     @abstractmethod
     def is_available(self) -> bool:
         """사용 가능 여부"""
@@ -2,7 +2,7 @@ import numpy as np
 import pandas as pd
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Sequence
 
 from .base import DataSource
 from app.core.errors import DataNotFoundError, DataSourceError
@@ -47,6 +47,11 @@ class CSVDataSource(DataSource):
         if metric_name not in df.columns:
             raise DataNotFoundError(f"{metric_name} 컬럼이 CSV에 존재하지 않음")
 
+        return self._tail(df, metric_name, hours)
+
+    @staticmethod
+    def _tail(df: pd.DataFrame, metric_name: str, hours: int) -> np.ndarray:
+        """마지막 hours 행의 값을 반환하고, 부족하면 첫 값으로 앞쪽을 채운다."""
         end_idx = len(df) - 1
         start_idx = max(0, end_idx - hours + 1)
         data = np.asarray(df.iloc[start_idx : end_idx + 1][metric_name].values)
@@ -59,5 +64,33 @@ class CSVDataSource(DataSource):
 
         return data
 
+    def fetch_many(
+        self,
+        github_urls: Sequence[str],
+        metric_name: str,
+        hours: int = 168,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """여러 저장소를 한 번의 필터/그룹핑으로 조회한다. (저장소별 전체 스캔 없음)"""
+        if self.df is None:
+            raise DataSourceError("CSV 데이터가 로드되지 않음")
+        if metric_name not in self.df.columns:
+            raise DataNotFoundError(f"{metric_name} 컬럼이 CSV에 존재하지 않음")
+
+        urls = list(dict.fromkeys(github_urls))
+        if "github_url" not in self.df.columns:
+            # 저장소 구분이 없는 CSV: 모든 저장소가 같은 데이터를 사용
+            shared = self._tail(self.df, metric_name, hours)
+            return {url: shared for url in urls}
+
+        subset = self.df[self.df["github_url"].isin(urls)]
+        grouped = {url: self._tail(g, metric_name, hours) for url, g in subset.groupby("github_url", sort=False)}
+        # fetch_historical_data 와 동일하게, 해당 저장소 행이 없으면 전체 데이터로 대체
+        missing = [url for url in urls if url not in grouped]
+        if missing:
+            shared = self._tail(self.df, metric_name, hours)
+            grouped.update({url: shared for url in missing})
+        return grouped
+
     def is_available(self) -> bool:
         return self.csv_path.exists()
@@ -2,6 +2,7 @@ import os
 
 from .csv_source import CSVDataSource
 from .mysql_source import MySQLDataSource
+from .sqlite_source import SQLiteDataSource
 from app.core.errors import DataSourceError
 
 
@@ -16,6 +17,8 @@ def _create_data_source():
     if backend == "csv":
         csv_path = os.getenv("CSV_DATA_PATH", "data/lstm_ready_cluster_data.csv")
         return CSVDataSource(csv_path=csv_path)
+    if backend == "sqlite":
+        return SQLiteDataSource()
 
     raise DataSourceError(f"Unknown data source backend: {backend}")
 
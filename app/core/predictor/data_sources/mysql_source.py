@@ -1,12 +1,12 @@
 import os
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
 from urllib.parse import quote_plus
 
 import numpy as np
 
 try:
-    from sqlalchemy import create_engine, text
+    from sqlalchemy import bindparam, create_engine, text
     from sqlalchemy.engine import Engine
     SQLALCHEMY_AVAILABLE = True
 except Exception:  # pragma: no cover
@@ -19,11 +19,29 @@ if TYPE_CHECKING:
     from sqlalchemy.engine import Engine as EngineType
 
 from .base import DataSource
+from app.core import id_registry
+from app.core.bulk_writer import insert_rows
+from app.core.metric_history import MetricHistory
+from app.core.metric_rollup import refresh_rollups
 from app.core.errors import DataSourceError, DataNotFoundError
 
 
+# 조회 원본별 (테이블, 시각 컬럼, 값 식). hourly 는 롤업 평균으로 시간당 한 점을 돌려준다.
+_HISTORY_SOURCES = {
+    "raw": ("metric_history", "ts", "value"),
+    "hourly": ("metric_history_hourly", "bucket_ts", "value_sum / sample_count"),
+}
+
+
 class MySQLDataSource(DataSource):
-    """SQLAlchemy를 사용해 MySQL에서 시계열 데이터를 조회한다."""
+    """
+    SQLAlchemy를 사용해 MySQL에서 시계열 데이터를 조회한다.
+
+    github_url / metric_name 을 id_registry 로 정수 ID 로 바꾼 뒤 조회한다. 조회 조건
+    (service_id, metric_id, ts 범위)은 metric_history PK 의 앞부분과 같아
+    기록이 쌓여도 범위 스캔 비용은 조회 구간 크기에만 비례한다.
+    MYSQL_HISTORY_SOURCE=hourly 이면 시간 롤업(metric_history_hourly)에서 읽는다.
+    """
 
     def __init__(
         self,
@@ -36,11 +54,16 @@ class MySQLDataSource(DataSource):
         database: Optional[str] = None,
         table: Optional[str] = None,
         ssl_ca: Optional[str] = None,
+        history_source: Optional[str] = None,
     ) -> None:
         if create_engine is None or Engine is None:
             raise DataSourceError("SQLAlchemy가 설치되지 않아 MySQL을 초기화할 수 없음")
 
-        self.table = table or os.getenv("MYSQL_TABLE", "metric_history")
+        source = (history_source or os.getenv("MYSQL_HISTORY_SOURCE", "raw")).strip().lower()
+        if source not in _HISTORY_SOURCES:
+            raise DataSourceError(f"Unknown MYSQL_HISTORY_SOURCE: {source}")
+        default_table, self.ts_column, self.value_expr = _HISTORY_SOURCES[source]
+        self.table = table or os.getenv("MYSQL_TABLE", default_table)
 
         if connection_url:
             url = connection_url
@@ -72,6 +95,30 @@ class MySQLDataSource(DataSource):
         except Exception as exc:
             raise DataSourceError(f"SQLAlchemy 엔진 생성 실패: {exc}")
 
+    def append(self, points: Iterable[Mapping[str, Any]]) -> int:
+        """
+        원본 metric_history 에 적재한다. 같은 (서비스, 메트릭, ts) 가 이미 있으면 무시한다.
+
+        같은 트랜잭션에서 배치가 걸친 서비스별 ts 범위의 시간/일 롤업도 다시 계산한다.
+        (MYSQL_HISTORY_SOURCE=hourly 조회가 적재 직후 plan_cache 무효화와 함께 새 값을 보도록)
+        """
+        points = list(points)
+        if not points:
+            return 0
+        try:
+            rows = id_registry.history_rows(self.engine, points)
+            ranges: Dict[int, tuple] = {}
+            for row in rows:
+                lo, hi = ranges.get(row["service_id"], (row["ts"], row["ts"]))
+                ranges[row["service_id"]] = (min(lo, row["ts"]), max(hi, row["ts"]))
+            with self.engine.begin() as conn:
+                insert_rows(conn, MetricHistory.__table__, rows, ignore_duplicates=True)
+                for service_id, (start, end) in ranges.items():
+                    refresh_rollups(conn, start, end, service_id=service_id)
+        except Exception as exc:
+            raise DataSourceError(f"MySQL 적재 실패: {exc}")
+        return len(rows)
+
     def fetch_historical_data(
         self,
         github_url: str,
@@ -87,27 +134,31 @@ class MySQLDataSource(DataSource):
 
         stmt = text(
             f"""
-            SELECT ts, value
+            SELECT {self.ts_column} AS ts, {self.value_expr} AS value
             FROM {self.table}
-            WHERE github_url = :github_url
-              AND metric_name = :metric_name
-              AND ts BETWEEN :start_ts AND :end_ts
-            ORDER BY ts ASC
+            WHERE service_id = :service_id
+              AND metric_id = :metric_id
+              AND {self.ts_column} BETWEEN :start_ts AND :end_ts
+            ORDER BY {self.ts_column} ASC
             """
         )
 
         try:
-            with self.engine.begin() as conn:
-                result = conn.execute(
-                    stmt,
-                    {
-                        "github_url": github_url,
-                        "metric_name": metric_name,
-                        "start_ts": start_ts,
-                        "end_ts": end_ts,
-                    },
-                )
-                rows = result.fetchall()
+            sid = id_registry.service_id(self.engine, github_url, create=False)
+            mid = id_registry.metric_id(self.engine, metric_name, create=False)
+            rows = []
+            if sid is not None and mid is not None:
+                with self.engine.begin() as conn:
+                    result = conn.execute(
+                        stmt,
+                        {
+                            "service_id": sid,
+                            "metric_id": mid,
+                            "start_ts": start_ts,
+                            "end_ts": end_ts,
+                        },
+                    )
+                    rows = result.fetchall()
         except Exception as exc:
             raise DataSourceError(f"MySQL 조회 실패: {exc}")
 
@@ -115,16 +166,59 @@ class MySQLDataSource(DataSource):
             raise DataNotFoundError(f"{github_url}/{metric_name} 데이터 없음")
 
         values = np.array([float(row[1]) for row in rows], dtype=float)  # row[1] = value column
+        return self._fit(values, hours)
+
+    def fetch_many(
+        self,
+        github_urls: Sequence[str],
+        metric_name: str,
+        hours: int = 168,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """여러 저장소를 IN 조건 단일 쿼리로 조회한다. 데이터가 없는 저장소는 결과에서 빠진다."""
+        if hours <= 0:
+            raise ValueError("hours 값은 양수여야 함")
+        urls = list(dict.fromkeys(github_urls))
+        if not urls:
+            return {}
+
+        end_ts = end_time or datetime.utcnow()
+        start_ts = end_ts - timedelta(hours=hours - 1)
+
+        stmt = text(
+            f"""
+            SELECT service_id, {self.ts_column} AS ts, {self.value_expr} AS value
+            FROM {self.table}
+            WHERE service_id IN :service_ids
+              AND metric_id = :metric_id
+              AND {self.ts_column} BETWEEN :start_ts AND :end_ts
+            ORDER BY service_id, {self.ts_column} ASC
+            """
+        ).bindparams(bindparam("service_ids", expanding=True))
 
-        if len(values) < hours:
-            pad_len = hours - len(values)
-            pad_val = values[0] if len(values) > 0 else 0.0
-            pad = np.full(pad_len, pad_val, dtype=float)
-            values = np.concatenate([pad, values])
-        elif len(values) > hours:
-            values = values[-hours:]
+        try:
+            sids = id_registry.service_ids(self.engine, urls, create=False)
+            mid = id_registry.metric_id(self.engine, metric_name, create=False)
+            if not sids or mid is None:
+                return {}
+            with self.engine.begin() as conn:
+                rows = conn.execute(
+                    stmt,
+                    {
+                        "service_ids": list(sids.values()),
+                        "metric_id": mid,
+                        "start_ts": start_ts,
+                        "end_ts": end_ts,
+                    },
+                ).fetchall()
+        except Exception as exc:
+            raise DataSourceError(f"MySQL 조회 실패: {exc}")
 
-        return values
+        url_of = {sid: url for url, sid in sids.items()}
+        grouped: Dict[str, list] = {}
+        for row in rows:
+            grouped.setdefault(url_of[row[0]], []).append(float(row[2]))
+        return {url: self._fit(np.array(vals, dtype=float), hours) for url, vals in grouped.items()}
 
     def is_available(self) -> bool:
         try:
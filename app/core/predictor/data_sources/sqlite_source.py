@@ -0,0 +1,148 @@
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import create_engine, event, select, text
+
+from .base import DataSource
+from app.core import id_registry
+from app.core.bulk_writer import insert_rows
+from app.core.errors import DataNotFoundError, DataSourceError
+from app.core.metric_history import MetricHistory
+from app.core.persistence_models import Metric, Service
+
+
+DEFAULT_SQLITE_PATH = "data/metric_history.db"
+
+_TABLES = (Service.__table__, Metric.__table__, MetricHistory.__table__)
+
+
+def _configure(dbapi_conn, _record) -> None:
+    # WAL: 적재(쓰기) 중에도 조회(읽기)가 막히지 않는다. NORMAL 은 WAL 에서 커밋마다 fsync 하지 않는다.
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.close()
+
+
+class SQLiteDataSource(DataSource):
+    """
+    로컬 SQLite 파일에 시계열을 저장·조회하는 내장형 데이터 소스. (단일 노드/엣지 배포용)
+
+    스키마는 MySQL 과 같은 services / metrics / metric_history 모델을 그대로 쓴다.
+    PK (service_id, metric_id, ts) 가 조회 조건과 일치하므로 범위 조회는 인덱스 스캔 한 번이고,
+    값 컬럼만 읽어 바로 NumPy 배열로 만든다. CSV 와 달리 append() 로 실행 중 적재가 가능하다.
+    파일이 없으면 테이블과 함께 새로 만든다.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = Path(path or os.getenv("SQLITE_DATA_PATH", DEFAULT_SQLITE_PATH))
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.engine = create_engine(
+                f"sqlite:///{self.path}",
+                connect_args={"check_same_thread": False},
+            )
+            event.listen(self.engine, "connect", _configure)
+            with self.engine.begin() as conn:
+                for table in _TABLES:
+                    table.create(conn, checkfirst=True)
+        except Exception as exc:
+            raise DataSourceError(f"SQLite 초기화 실패 ({self.path}): {exc}")
+
+    def append(self, points: Iterable[Mapping[str, Any]]) -> int:
+        """점들을 적재한다. 같은 (서비스, 메트릭, ts) 가 이미 있으면 무시한다. (재전송에 안전)"""
+        points = list(points)
+        if not points:
+            return 0
+        try:
+            rows = id_registry.history_rows(self.engine, points)
+            with self.engine.begin() as conn:
+                insert_rows(conn, MetricHistory.__table__, rows, ignore_duplicates=True)
+        except Exception as exc:
+            raise DataSourceError(f"SQLite 적재 실패: {exc}")
+        return len(rows)
+
+    @staticmethod
+    def _window(hours: int, end_time: Optional[datetime]):
+        if hours <= 0:
+            raise ValueError("hours 값은 양수여야 함")
+        end_ts = end_time or datetime.utcnow()
+        return end_ts - timedelta(hours=hours - 1), end_ts
+
+    def fetch_historical_data(
+        self,
+        github_url: str,
+        metric_name: str,
+        hours: int = 168,
+        end_time: Optional[datetime] = None,
+    ) -> np.ndarray:
+        start_ts, end_ts = self._window(hours, end_time)
+        t = MetricHistory.__table__
+
+        try:
+            sid = id_registry.service_id(self.engine, github_url, create=False)
+            mid = id_registry.metric_id(self.engine, metric_name, create=False)
+            values = np.empty(0, dtype=float)
+            if sid is not None and mid is not None:
+                stmt = (
+                    select(t.c.value)
+                    .where(t.c.service_id == sid, t.c.metric_id == mid, t.c.ts.between(start_ts, end_ts))
+                    .order_by(t.c.ts)
+                )
+                with self.engine.connect() as conn:
+                    values = np.fromiter(conn.execute(stmt).scalars(), dtype=float)
+        except Exception as exc:
+            raise DataSourceError(f"SQLite 조회 실패: {exc}")
+
+        if values.size == 0:
+            raise DataNotFoundError(f"{github_url}/{metric_name} 데이터 없음")
+        return self._fit(values, hours)
+
+    def fetch_many(
+        self,
+        github_urls: Sequence[str],
+        metric_name: str,
+        hours: int = 168,
+        end_time: Optional[datetime] = None,
+    ) -> Dict[str, np.ndarray]:
+        """여러 저장소를 IN 조건 단일 쿼리로 조회하고, 서비스 경계에서 배열을 나눈다."""
+        start_ts, end_ts = self._window(hours, end_time)
+        urls = list(dict.fromkeys(github_urls))
+        if not urls:
+            return {}
+        t = MetricHistory.__table__
+
+        try:
+            sids = id_registry.service_ids(self.engine, urls, create=False)
+            mid = id_registry.metric_id(self.engine, metric_name, create=False)
+            if not sids or mid is None:
+                return {}
+            stmt = (
+                select(t.c.service_id, t.c.value)
+                .where(
+                    t.c.service_id.in_(list(sids.values())),
+                    t.c.metric_id == mid,
+                    t.c.ts.between(start_ts, end_ts),
+                )
+                .order_by(t.c.service_id, t.c.ts)
+            )
+            with self.engine.connect() as conn:
+                rows = np.array(conn.execute(stmt).all(), dtype=float).reshape(-1, 2)
+        except Exception as exc:
+            raise DataSourceError(f"SQLite 조회 실패: {exc}")
+
+        url_of = {sid: url for url, sid in sids.items()}
+        ids, starts = np.unique(rows[:, 0].astype(np.int64), return_index=True)
+        chunks = np.split(rows[:, 1], starts[1:])
+        return {url_of[int(sid)]: self._fit(chunk, hours) for sid, chunk in zip(ids, chunks)}
+
+    def is_available(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
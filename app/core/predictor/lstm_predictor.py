@@ -2,17 +2,18 @@ from __future__ import annotations
 import os
 import pickle
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Sequence
 import numpy as np
 import pandas as pd
 import tensorflow as tf
-from app.models.common import MCPContext, PredictionResult, PredictionPoint
-from app.core.predictor.base import BasePredictor
+from app.core.forecast import Forecast
+from app.models.common import DEFAULT_HORIZON_HOURS, MCPContext, PredictionResult
+from app.core.predictor.base import BasePredictor, BatchItem
 from app.core.errors import PredictionError
 
 
 class LSTMPredictor(BasePredictor):
-    """LSTM 모델을 사용해 24시간 예측을 수행"""
+    """LSTM 모델을 사용해 horizon 시간(기본 24시간) 예측을 수행"""
 
     def __init__(
         self,
@@ -107,7 +108,59 @@ class LSTMPredictor(BasePredictor):
         metric_name: str,
         ctx: MCPContext,
         model_version: str,
+        horizon: Optional[int] = None,
     ) -> PredictionResult:
+        return self.predict(
+            github_url=github_url, metric_name=metric_name, ctx=ctx, model_version=model_version, horizon=horizon
+        ).to_result()
+
+    def predict(
+        self,
+        *,
+        github_url: str,
+        metric_name: str,
+        ctx: MCPContext,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> Forecast:
+        raw_predictions = self._rollout(horizon or DEFAULT_HORIZON_HOURS)
+        return self._build_forecast(raw_predictions, github_url, metric_name, ctx, model_version)
+
+    def run_batch(
+        self,
+        items: Sequence[BatchItem],
+        *,
+        metric_name: str,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> list[PredictionResult]:
+        return [
+            fc.to_result()
+            for fc in self.predict_batch(items, metric_name=metric_name, model_version=model_version, horizon=horizon)
+        ]
+
+    def predict_batch(
+        self,
+        items: Sequence[BatchItem],
+        *,
+        metric_name: str,
+        model_version: str,
+        horizon: Optional[int] = None,
+    ) -> list[Forecast]:
+        """
+        입력 시퀀스는 저장소와 무관하게 같은 CSV 마지막 구간이므로, 롤아웃을 한 번만
+        계산하고 저장소별로는 컨텍스트 스케일만 다르게 적용한다.
+        """
+        if not items:
+            return []
+        raw_predictions = self._rollout(horizon or DEFAULT_HORIZON_HOURS)
+        return [
+            self._build_forecast(raw_predictions, url, metric_name, ctx, model_version)
+            for url, ctx in items
+        ]
+
+    def _rollout(self, horizon: int) -> np.ndarray:
+        """CSV 최근 구간으로 horizon 시간 원시 예측(컨텍스트 스케일 전)을 만든다."""
         if self.df is None:
             raise PredictionError("CSV 데이터가 로드되지 않음")
         
@@ -134,29 +187,33 @@ class LSTMPredictor(BasePredictor):
         except Exception as exc:
             raise PredictionError(f"특징 스케일링 실패: {exc}")
 
-        raw_predictions = self._generate_predictions(X)
-        
+        return self._generate_predictions(X, horizon)
+
+    def _build_forecast(
+        self,
+        raw_predictions: np.ndarray,
+        github_url: str,
+        metric_name: str,
+        ctx: MCPContext,
+        model_version: str,
+    ) -> Forecast:
         # 컨텍스트 기반 스케일링: 입력 컨텍스트를 반영하여 예측값 조정
         scale_factor = self._compute_context_scale(ctx, metric_name)
-        predictions = [pred * scale_factor for pred in raw_predictions]
+        predictions = np.asarray(raw_predictions, dtype=float) * scale_factor
         
         print(f"[디버그] 컨텍스트 스케일 팩터: {scale_factor:.2f} (users={ctx.expected_users}, slot={ctx.time_slot})")
 
         now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
-        prediction_points = [
-            PredictionPoint(
-                time=now + timedelta(hours=i + 1),
-                value=float(value),
-            )
-            for i, value in enumerate(predictions)
-        ]
-
-        return PredictionResult(
+        return Forecast(
             github_url=github_url,
             metric_name=metric_name,
             model_version=model_version,
             generated_at=datetime.utcnow(),
-            predictions=prediction_points,
+            start=now + timedelta(hours=1),
+            values=predictions,
+            sequence_length=self.sequence_length,
+            feature_count=len(self.feature_names) if self.feature_names is not None else None,
+            scale_factor=scale_factor,
         )
 
     # 내부 헬퍼
@@ -198,35 +255,39 @@ class LSTMPredictor(BasePredictor):
         
         return float(final_scale)
 
-    def _generate_predictions(self, X: np.ndarray) -> list[float]:
+    def _generate_predictions(self, X: np.ndarray, horizon: int) -> np.ndarray:
+        """
+        자기회귀 롤아웃으로 horizon 개의 예측을 만든다.
+
+        - model.predict() 는 호출마다 데이터 파이프라인을 새로 만들기 때문에 시점마다 부르면
+          horizon 에 비례해 고정 비용이 커진다. 모델을 직접 호출(model(x, training=False))한다.
+        - 모델 출력이 여러 시점(direct multi-step, 출력 폭 k > 1)이면 한 번 호출로 k 시점을 얻고
+          k 칸씩 시퀀스를 밀어 호출 횟수를 ceil(H / k) 로 줄인다.
+        - 역스케일/로그 역변환/하한 처리는 마지막에 배열 전체에 한 번만 적용한다.
+        """
         if self.model is None:
             raise PredictionError("모델이 로드되지 않음")
         if self.target_scaler is None:
             raise PredictionError("target_scaler가 로드되지 않음")
-        
-        try:
-            results = []
-            current_sequence = X.copy()
 
-            for _ in range(24):
-                pred_scaled = self.model.predict(current_sequence, verbose=0)[0, 0]  # type: ignore
-                pred = self.target_scaler.inverse_transform([[pred_scaled]])[0, 0]
-
-                if self.use_log_transform:
-                    pred = np.expm1(pred)
-
-                pred = max(pred, 0)
-                results.append(pred)
-
-                new_features = current_sequence[0, -1, :].copy()
-                new_row = np.concatenate([[pred_scaled], new_features[1:]])
-                current_sequence = np.append(
-                    current_sequence[:, 1:, :],
-                    new_row.reshape(1, 1, -1),
-                    axis=1,
-                )
-
-            return results
+        try:
+            scaled: list[float] = []
+            current_sequence = np.asarray(X, dtype=np.float32)
+
+            while len(scaled) < horizon:
+                out = np.asarray(self.model(current_sequence, training=False)).reshape(-1)  # type: ignore
+                steps = out[: horizon - len(scaled)]
+                scaled.extend(float(v) for v in steps)
+
+                # 예측 시점들을 다음 입력으로 추가 (첫 번째 특징만 예측값, 나머지는 마지막 행 유지)
+                new_rows = np.repeat(current_sequence[:, -1:, :], len(steps), axis=1)
+                new_rows[0, :, 0] = steps
+                current_sequence = np.concatenate([current_sequence[:, len(steps):, :], new_rows], axis=1)
+
+            preds = self.target_scaler.inverse_transform(np.asarray(scaled).reshape(-1, 1))[:, 0]
+            if self.use_log_transform:
+                preds = np.expm1(preds)
+            return np.maximum(preds, 0.0)
         except Exception as exc:
             raise PredictionError(f"예측 생성 실패: {exc}")
 
@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from datetime import datetime
 from itertools import count
-from threading import Lock
+from threading import RLock
 from typing import Any, Dict, List, Optional
 
 ProjectStatus = str
 
-_lock = Lock()
+_lock = RLock()  # upsert_project → create_project 재진입 허용
 _id_counter = count(1)
 _projects: Dict[int, Dict[str, Any]] = {}
 
@@ -17,7 +17,10 @@ def _now() -> datetime:
 
 
 def _clone(record: Dict[str, Any]) -> Dict[str, Any]:
-  return {**record}
+  clone = {**record}
+  if "instance_ids" in clone:
+    clone["instance_ids"] = list(clone["instance_ids"])
+  return clone
 
 
 def list_projects() -> List[Dict[str, Any]]:
@@ -40,6 +43,7 @@ def create_project(
   last_deployment: Optional[datetime] = None,
   service_id: Optional[str] = None,
   instance_id: Optional[str] = None,
+  instance_ids: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
   with _lock:
     record_id = next(_id_counter)
@@ -53,6 +57,8 @@ def create_project(
       "lastDeployment": last_deployment,
       "service_id": service_id,
       "instance_id": instance_id,
+      # fleet 배포의 전체 인스턴스 (instance_id 는 대표 = 첫 번째)
+      "instance_ids": list(instance_ids) if instance_ids else ([instance_id] if instance_id else []),
       "created_at": now,
       "updated_at": now,
     }
@@ -78,6 +84,24 @@ def delete_project(project_id: int) -> bool:
     return _projects.pop(project_id, None) is not None
 
 
+def remove_instance(instance_id: str) -> Optional[Dict[str, Any]]:
+  """
+  삭제된 인스턴스를 프로젝트에서 뺀다. 대표 인스턴스였으면 fleet 의 다음 인스턴스로 바꾼다.
+  해당 인스턴스를 가진 프로젝트가 없으면 None.
+  """
+  with _lock:
+    for record in _projects.values():
+      ids = record.get("instance_ids") or ([record["instance_id"]] if record.get("instance_id") else [])
+      if instance_id not in ids:
+        continue
+      record["instance_ids"] = [i for i in ids if i != instance_id]
+      if record.get("instance_id") == instance_id:
+        record["instance_id"] = record["instance_ids"][0] if record["instance_ids"] else None
+      record["updated_at"] = _now()
+      return _clone(record)
+    return None
+
+
 def upsert_project(
   *,
   name: Optional[str],
@@ -87,6 +111,7 @@ def upsert_project(
   last_deployment: Optional[datetime] = None,
   service_id: Optional[str] = None,
   instance_id: Optional[str] = None,
+  instance_ids: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
   """
   service_id 또는 repository 기준으로 기존 프로젝트가 있으면 업데이트,
@@ -119,6 +144,9 @@ def upsert_project(
         existing["service_id"] = service_id
       if instance_id is not None:
         existing["instance_id"] = instance_id
+        existing["instance_ids"] = [instance_id]
+      if instance_ids:
+        existing["instance_ids"] = list(instance_ids)
       existing["updated_at"] = _now()
       return _clone(existing)
 
@@ -132,6 +160,7 @@ def upsert_project(
         last_deployment=last_deployment,
         service_id=service_id,
         instance_id=instance_id,
+        instance_ids=instance_ids,
       )
     )
 
@@ -0,0 +1,76 @@
+"""
+Single-flight 요청 병합 유틸.
+
+동일 키로 동시에 들어온 호출 중 하나만 실제 계산을 수행하고,
+나머지 호출은 그 계산이 끝날 때까지 기다렸다가 같은 결과(또는 같은 예외)를 공유한다.
+
+/plans 라우트는 FastAPI threadpool 위의 동기 함수로 실행되므로 threading 기반으로 구현한다.
+결과를 저장하지 않는다는 점에서 plan_cache와 역할이 다르다. (진행 중인 호출만 병합)
+"""
+
+from __future__ import annotations
+
+from threading import Event, Lock
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight(Generic[T]):
+    """키 단위로 진행 중인 계산을 병합한다."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: Dict[Hashable, _Call[T]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        fn()을 실행하거나, 같은 키의 진행 중인 호출 결과를 기다린다.
+
+        Returns
+        -------
+        (result, shared)
+            shared가 True면 다른 호출이 계산한 결과를 공유받은 것이다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as exc:  # noqa: BLE001 - 대기 중인 호출에도 동일 예외 전달
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
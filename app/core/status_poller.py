@@ -0,0 +1,200 @@
+"""
+OpenStack 서버 상태/사용량 백그라운드 폴러.
+
+/status 요청마다 Nova를 조회하지 않도록, projects_store에 등록된 인스턴스들의
+상태를 주기적으로 한 번에 갱신해 메모리 스냅샷으로 보관한다.
+
+- 서버 상태: compute.servers(details=True) 목록 호출 1회로 전체 조회 (서버별 GET 없음)
+- 사용량(cpu/mem): 별도 텔레메트리 서비스가 없으므로 데이터 소스의 최신
+  avg_cpu / avg_memory 값을 사용한다. 주기마다 metric 당 fetch_many 1회. (조회 실패 시 None)
+- 스냅샷은 주기마다 통째로 교체되어 projects_store 에서 빠진 인스턴스는 다음 주기에 사라진다.
+
+/status 는 스냅샷만 읽으므로 OpenStack 호출 없이 즉시 응답한다.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core import projects_store
+
+logger = logging.getLogger(__name__)
+
+_HEALTHY_STATES = {"ACTIVE"}
+
+_lock = threading.Lock()
+_by_repo: Dict[str, Dict[str, Any]] = {}
+_by_instance: Dict[str, Dict[str, Any]] = {}
+_last_refresh: Optional[datetime] = None
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+_INTERVAL = float(os.getenv("STATUS_POLL_INTERVAL", "30"))
+
+
+def is_configured() -> bool:
+    """OpenStack 접속 정보가 있을 때만 폴러를 켠다. STATUS_POLL_ENABLED로 강제 가능."""
+    flag = os.getenv("STATUS_POLL_ENABLED")
+    if flag is not None:
+        return flag.strip().lower() not in ("0", "false", "no")
+    from app.core.openstack.client import is_openstack_configured
+
+    return is_openstack_configured()
+
+
+def _latest_usage(github_urls: List[str], metric_name: str) -> Dict[str, float]:
+    """저장소들의 최신 값. 한 주기에 metric 당 fetch_many 한 번만 조회한다. (실패/데이터 없음은 빠짐)"""
+    try:
+        from app.core.predictor.data_sources import get_data_source
+
+        found = get_data_source().fetch_many(github_urls, metric_name, hours=1)
+        return {url: float(values[-1]) for url, values in found.items() if len(values)}
+    except Exception:
+        return {}
+
+
+def _instance_ids(project: Dict[str, Any]) -> List[str]:
+    # fleet 배포는 instance_ids 에 전체가, instance_id 에 대표(첫 번째)가 들어 있다
+    return list(project.get("instance_ids") or ([project["instance_id"]] if project.get("instance_id") else []))
+
+
+def _build_entries(
+    project: Dict[str, Any],
+    servers: Dict[str, Any],
+    now: datetime,
+    usage: Dict[str, Dict[str, float]],
+) -> List[Dict[str, Any]]:
+    repo = project["repository"]
+    # 사용량은 저장소 단위 지표라 fleet 인스턴스들이 같은 값을 공유한다
+    cpu_usage = usage["avg_cpu"].get(repo)
+    mem_usage = usage["avg_memory"].get(repo)
+    return [_build_entry(repo, iid, servers.get(iid), now, cpu_usage, mem_usage) for iid in _instance_ids(project)]
+
+
+def _build_entry(
+    repo: str,
+    instance_id: str,
+    server: Any,
+    now: datetime,
+    cpu_usage: Optional[float],
+    mem_usage: Optional[float],
+) -> Dict[str, Any]:
+    server_status = getattr(server, "status", None) if server is not None else "NOT_FOUND"
+    return {
+        "github_url": repo,
+        "instance_id": instance_id,
+        "server_status": server_status,
+        "is_healthy": server_status in _HEALTHY_STATES,
+        "cpu_usage": cpu_usage,
+        "mem_usage": mem_usage,
+        "refreshed_at": now,
+    }
+
+
+def _build_repo_entry(instances: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # 저장소 단위 상태는 대표 인스턴스 기준이고, fleet 전체가 정상이어야 healthy
+    return {
+        **instances[0],
+        "is_healthy": all(e["is_healthy"] for e in instances),
+        "instances": [
+            {"instance_id": e["instance_id"], "server_status": e["server_status"], "is_healthy": e["is_healthy"]}
+            for e in instances
+        ],
+    }
+
+
+def refresh_once(conn: Any = None, projects: Optional[Iterable[Dict[str, Any]]] = None) -> int:
+    """
+    추적 중인 모든 인스턴스의 상태를 한 번 갱신한다. 갱신된 인스턴스 수를 반환.
+
+    conn/projects 는 테스트 주입용이며, 기본값은 공유 연결 풀과 projects_store.
+    """
+
+    tracked: List[Dict[str, Any]] = [
+        p for p in (projects if projects is not None else projects_store.list_projects())
+        if _instance_ids(p)
+    ]
+    if not tracked:
+        _replace({}, {}, datetime.utcnow())
+        return 0
+
+    if conn is None:
+        from app.core.openstack.client import get_connection
+
+        with get_connection() as pooled:
+            servers = {s.id: s for s in pooled.compute.servers(details=True)}  # type: ignore[attr-defined]
+    else:
+        servers = {s.id: s for s in conn.compute.servers(details=True)}  # type: ignore[attr-defined]
+    now = datetime.utcnow()
+    repos = list(dict.fromkeys(p["repository"] for p in tracked))
+    usage = {metric: _latest_usage(repos, metric) for metric in ("avg_cpu", "avg_memory")}
+    by_project = [_build_entries(p, servers, now, usage) for p in tracked]
+
+    # 매 주기 새로 만들어 바꿔 끼운다. (삭제된 프로젝트/인스턴스가 스냅샷에 남지 않도록)
+    # 한 저장소를 여러 프로젝트가 배포할 수 있으므로 저장소별로 인스턴스를 모은 뒤 항목을 만든다
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    by_instance: Dict[str, Dict[str, Any]] = {}
+    for instances in by_project:
+        for entry in instances:
+            grouped.setdefault(entry["github_url"], []).append(entry)
+            by_instance[entry["instance_id"]] = entry
+    by_repo = {repo: _build_repo_entry(instances) for repo, instances in grouped.items()}
+    _replace(by_repo, by_instance, now)
+    return sum(len(instances) for instances in by_project)
+
+
+def _replace(by_repo: Dict[str, Dict[str, Any]], by_instance: Dict[str, Dict[str, Any]], now: datetime) -> None:
+    global _by_repo, _by_instance, _last_refresh
+    with _lock:
+        _by_repo, _by_instance, _last_refresh = by_repo, by_instance, now
+
+
+def get_status(github_url: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        entry = _by_repo.get(github_url)
+        return {**entry} if entry else None
+
+
+def get_instance_status(instance_id: str) -> Optional[Dict[str, Any]]:
+    with _lock:
+        entry = _by_instance.get(instance_id)
+        return {**entry} if entry else None
+
+
+def last_refresh() -> Optional[datetime]:
+    with _lock:
+        return _last_refresh
+
+
+def _loop(interval: float) -> None:
+    while not _stop.is_set():
+        try:
+            refresh_once()
+        except Exception:
+            logger.exception("Status poll failed (will retry)")
+        _stop.wait(interval)
+
+
+def start(interval: float | None = None) -> None:
+    """백그라운드 폴링 스레드를 시작한다. 이미 실행 중이면 무시."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(
+        target=_loop, args=(interval or _INTERVAL,), name="status-poller", daemon=True
+    )
+    _thread.start()
+
+
+def stop() -> None:
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=5)
+        _thread = None
@@ -8,7 +8,10 @@ from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
-from app.routes import deploy
+from app.core import deploy_jobs, status_poller
+from app.core.openstack import catalog
+from app.core.openstack.client import get_pool, is_openstack_configured
+from app.routes import deploy, status
 
 # 배포 전용 FastAPI 앱 생성
 app = FastAPI(title="MCP Deploy Server", version="0.1.0")
@@ -27,8 +30,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# /deploy 라우터만 포함
+# /deploy 라우터 + /status (배포 job 상태 조회 /status/jobs 포함)
+# (배포 job은 이 프로세스 메모리에 있으므로 같은 프로세스에서 조회해야 한다)
 app.include_router(deploy.router, prefix="/deploy", tags=["deploy"])
+app.include_router(status.router, prefix="/status", tags=["status"])
+
+# 이 프로세스에는 /plans 파이프라인이 없으므로 MCP Core의 /plans를 HTTP(keep-alive 풀)로 호출
+deploy.use_remote_plans(os.getenv("MCP_CORE_URL", "http://localhost:8000"))
+
+
+@app.on_event("startup")
+def _preload_catalog() -> None:
+    # /status 스냅샷 폴러 (status.router 를 함께 노출하므로 이 프로세스에서도 돌린다)
+    if status_poller.is_configured():
+        status_poller.start()
+    # OpenStack flavor/image/network 카탈로그 미리 로드 (배포 시 find_* 호출 제거)
+    if is_openstack_configured():
+        catalog.preload_in_background()
+
+
+@app.on_event("shutdown")
+def _close_clients() -> None:
+    status_poller.stop()
+    deploy.close_plans_client()
+    deploy_jobs.shutdown(wait=False)
+    get_pool().close()
 
 @app.get("/health")
 def health():
@@ -3,7 +3,17 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routes import plans, status, destroy, deploy
+from app.routes import plans, status, destroy, deploy, hourly_plans, metrics
+from app.core import (
+    deploy_jobs,
+    hourly_scheduler,
+    metric_ingest,
+    plan_materializer,
+    prediction_persister,
+    status_poller,
+)
+from app.core.openstack import catalog
+from app.core.openstack.client import get_pool, is_openstack_configured
 # from app.routes import router_auth
 from dotenv import load_dotenv
 load_dotenv()
@@ -27,6 +37,38 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+def _start_background_workers() -> None:
+    # /status 스냅샷 폴러 (OpenStack 설정이 있을 때만)
+    if status_poller.is_configured():
+        status_poller.start()
+    # OpenStack flavor/image/network 카탈로그 미리 로드 (배포 시 find_* 호출 제거)
+    if is_openstack_configured():
+        catalog.preload_in_background()
+    # /hourly-flavor/schedule 로 등록된 리사이즈를 정시마다 실행
+    hourly_scheduler.start()
+    # 예측 결과 write-behind 저장 (PREDICTION_PERSIST_ENABLED=1 일 때만)
+    if prediction_persister.is_enabled():
+        prediction_persister.start()
+    # /metrics/ingest 버퍼 적재 (METRIC_INGEST_ENABLED=1 이고 백엔드가 쓰기를 지원할 때만)
+    if metric_ingest.is_enabled():
+        metric_ingest.start()
+    # 최근 요청된 /plans 를 매 정시 미리 계산 (PLAN_MATERIALIZE_ENABLED=1 일 때만)
+    if plan_materializer.is_enabled():
+        plan_materializer.start()
+
+
+@app.on_event("shutdown")
+def _shutdown_background_workers() -> None:
+    status_poller.stop()
+    hourly_scheduler.stop()
+    prediction_persister.stop()
+    metric_ingest.stop()
+    plan_materializer.stop()
+    deploy_jobs.shutdown(wait=False)
+    get_pool().close()
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
@@ -36,6 +78,8 @@ app.include_router(plans.router, prefix="/plans", tags=["plans"])
 app.include_router(deploy.router, prefix="/deploy", tags=["deploy"])
 app.include_router(status.router, prefix="/status", tags=["status"])
 app.include_router(destroy.router, prefix="/destroy", tags=["destroy"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+app.include_router(hourly_plans.router)
 app.include_router(router_auth.router)
 
 @app.exception_handler(Exception)
@@ -1,6 +1,6 @@
 # API 전체에서 공통으로 쓰이는 스키마 모아둔 곳
 
-from typing import Optional, Literal
+from typing import Annotated, Optional, Literal
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -8,6 +8,12 @@ TimeSlot = Literal["peak", "normal", "low", "weekend"]
 RuntimeEnv = Literal["prod", "dev"]
 ServiceType = Literal["web", "api", "db"]
 
+# 예측 구간(시간). 요청별로 1시간 ~ 7일까지 지정할 수 있다.
+DEFAULT_HORIZON_HOURS = 24
+MAX_HORIZON_HOURS = 168
+HorizonHours = Annotated[int, Field(ge=1, le=MAX_HORIZON_HOURS)]
+
+
 class MCPContext(BaseModel):
     context_id: str
     timestamp: datetime
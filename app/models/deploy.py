@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 class InstanceInfo(BaseModel):
@@ -31,12 +31,29 @@ class DeployRequest(BaseModel):
     repo_id: Optional[str] = None
     image_tag: Optional[str] = "latest"
     plan_id: Optional[str] = None  # Plans에서 넘어온 plan_id
+    instance_count: int = Field(default=1, ge=1, le=50)  # 동시에 생성할 VM 수 (fleet)
     env_config: Dict[str, Any] = {}
 
 class DeployResponse(BaseModel):
     accepted: bool
     plan_id: Optional[str] = None
+    job_id: Optional[str] = None  # 비동기 배포 job 식별자 (/status/jobs/{job_id})
+    status: Optional[str] = None  # queued | running | succeeded | failed
     instance_id: Optional[str] = None
     instance: Optional[InstanceInfo] = None  # 생성된 인스턴스 정보
+    instances: Optional[List[InstanceInfo]] = None  # instance_count > 1 일 때 전체 목록
     message: str
     deployed_at: Optional[datetime] = None
+
+class DeployJob(BaseModel):
+    job_id: str
+    github_url: str
+    plan_id: Optional[str] = None
+    server_name: Optional[str] = None
+    status: str
+    instance: Optional[InstanceInfo] = None
+    instances: List[InstanceInfo] = []
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
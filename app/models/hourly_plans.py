@@ -5,7 +5,7 @@ from typing import Literal, Optional
 
 from pydantic import BaseModel, Field
 
-from app.models.common import MCPContext
+from app.models.common import DEFAULT_HORIZON_HOURS, HorizonHours, MCPContext
 
 FlavorType = Literal["small", "medium", "large"]
 
@@ -19,7 +19,7 @@ class FlavorBreakpoints(BaseModel):
 
 
 class HourlyFlavorRecommendation(BaseModel):
-    hour_index: int = Field(ge=0, le=23)
+    hour_index: int = Field(ge=0)
     timestamp: datetime
     predicted_value: float
     percentile: float = Field(ge=0.0, le=1.0)
@@ -33,6 +33,9 @@ class HourlyPlansRequest(BaseModel):
     context: MCPContext
     model_version: Optional[str] = None
     fallback_to_baseline: bool = True
+    # threshold: 시간별 임계값, optimal: 비용 + 리사이즈 페널티 최소화(DP)
+    strategy: Literal["threshold", "optimal"] = "threshold"
+    horizon_hours: HorizonHours = DEFAULT_HORIZON_HOURS  # 추천할 시간 수 (1시간 ~ 7일)
 
 
 class HourlyPlansResponse(BaseModel):
@@ -42,5 +45,56 @@ class HourlyPlansResponse(BaseModel):
     generated_at: datetime
     hourly_recommendations: list[HourlyFlavorRecommendation]
     breakpoints: FlavorBreakpoints
-    total_expected_cost_24h: float
+    total_expected_cost_24h: float  # 처음 24시간 비용 (horizon_hours 가 24 미만이면 그 구간 전체)
+    total_expected_cost: float  # 요청한 horizon_hours 전체 비용
+    horizon_hours: int = DEFAULT_HORIZON_HOURS
     notes: Optional[str] = None
+
+
+class ScheduleSegment(BaseModel):
+    """같은 플레이버가 연속되는 구간. end_hour는 포함하지 않는다."""
+
+    start_hour: int = Field(ge=0)
+    end_hour: int = Field(ge=1)
+    start_time: datetime
+    end_time: datetime
+    flavor: FlavorType
+    hours: int
+    cost: float
+
+
+class ScheduledResize(BaseModel):
+    at: datetime
+    instance_id: Optional[str] = None
+    from_flavor: Optional[FlavorType] = None
+    to_flavor: FlavorType
+    status: Literal["pending", "done", "skipped", "failed"] = "pending"
+    error: Optional[str] = None
+
+
+class HourlyScheduleRequest(HourlyPlansRequest):
+    instance_id: Optional[str] = None  # 없으면 projects_store에서 github_url로 찾는다
+    min_hold_hours: Optional[int] = Field(default=None, ge=1, le=24)
+    apply: bool = False  # True면 실행기에 등록해 정시마다 리사이즈 수행
+
+
+class HourlyScheduleResponse(BaseModel):
+    github_url: str
+    instance_id: Optional[str] = None
+    instance_ids: list[str] = []  # apply 시 스케줄이 등록되는 인스턴스 (fleet 이면 전체)
+    model_version: str
+    generated_at: datetime
+    segments: list[ScheduleSegment]
+    actions: list[ScheduledResize]
+    resize_count: int
+    # *_24h 필드는 처음 24시간 기준, 접미사 없는 필드는 horizon_hours 전체 기준이다
+    horizon_hours: int = DEFAULT_HORIZON_HOURS
+    planned_cost_24h: float
+    hourly_cost_24h: float  # 시간별 추천을 그대로 따를 때 24시간 비용 (total_expected_cost_24h)
+    static_peak_cost_24h: float  # 24시간 중 최대 플레이버를 24시간 동안 유지할 때 비용
+    estimated_savings_24h: float
+    planned_cost: float
+    hourly_cost: float  # 시간별 추천을 그대로 따를 때 비용 (total_expected_cost)
+    static_peak_cost: float  # 최대 플레이버를 전체 구간 동안 유지할 때 비용
+    estimated_savings: float
+    applied: bool = False
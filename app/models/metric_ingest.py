@@ -0,0 +1,79 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+MAX_POINTS_PER_REQUEST = 50_000
+
+
+def _to_naive_utc(ts: datetime) -> datetime:
+    # metric_history.ts 는 naive UTC. 숫자(epoch 초)나 오프셋이 붙은 값은 UTC 로 바꾼다.
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class MetricPoint(BaseModel):
+    github_url: str = Field(min_length=1, max_length=500)
+    metric_name: str = Field(min_length=1, max_length=100)
+    ts: datetime  # ISO-8601 또는 epoch 초
+    value: float = Field(allow_inf_nan=False)
+
+    _utc = field_validator("ts")(_to_naive_utc)
+
+
+class MetricSeries(BaseModel):
+    # 한 서비스 × 메트릭의 여러 시점을 열 단위로 보내는 압축 형식
+    github_url: str = Field(min_length=1, max_length=500)
+    metric_name: str = Field(min_length=1, max_length=100)
+    ts: list[datetime]
+    values: list[float]
+
+    @field_validator("ts")
+    @classmethod
+    def _utc(cls, v: list[datetime]) -> list[datetime]:
+        return [_to_naive_utc(t) for t in v]
+
+    @field_validator("values")
+    @classmethod
+    def _finite(cls, v: list[float]) -> list[float]:
+        if any(x != x or x in (float("inf"), float("-inf")) for x in v):
+            raise ValueError("values 에 NaN/Inf 가 있음")
+        return v
+
+    @model_validator(mode="after")
+    def _same_length(self):
+        if len(self.ts) != len(self.values):
+            raise ValueError(f"ts({len(self.ts)})와 values({len(self.values)}) 길이가 다름")
+        return self
+
+
+class MetricIngestRequest(BaseModel):
+    points: list[MetricPoint] = Field(default_factory=list)
+    series: list[MetricSeries] = Field(default_factory=list)
+
+    @model_validator(mode="after")
+    def _size(self):
+        total = self.count()
+        if total == 0:
+            raise ValueError("points 또는 series 가 비어 있음")
+        if total > MAX_POINTS_PER_REQUEST:
+            raise ValueError(f"요청당 최대 {MAX_POINTS_PER_REQUEST}개 점 ({total}개)")
+        return self
+
+    def count(self) -> int:
+        return len(self.points) + sum(len(s.ts) for s in self.series)
+
+    def rows(self) -> list[dict]:
+        """적재용 {"github_url", "metric_name", "ts", "value"} 목록 (DataSource.append 입력)."""
+        out = [p.model_dump() for p in self.points]
+        for s in self.series:
+            out.extend(
+                {"github_url": s.github_url, "metric_name": s.metric_name, "ts": t, "value": v}
+                for t, v in zip(s.ts, s.values)
+            )
+        return out
+
+
+class MetricIngestResponse(BaseModel):
+    accepted: int
+    buffered: int  # 응답 시점에 저장 대기 중인 점 수 (이번 요청 포함)
@@ -1,13 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional
-from .common import MCPContext, PredictionResult
+from .common import DEFAULT_HORIZON_HOURS, HorizonHours, MCPContext, PredictionResult
 
 class PlansRequest(BaseModel):
     github_url: str
     metric_name: str = "total_events"
     context: MCPContext
     requirements: Optional[str] = None  # 자연어 요청사항 (프론트엔드에서 전송)
+    horizon_hours: HorizonHours = DEFAULT_HORIZON_HOURS  # 예측 구간 (1시간 ~ 7일)
 
 class PlansResponse(BaseModel):
     prediction: PredictionResult
@@ -22,8 +23,38 @@ class MultiPlansRequest(BaseModel):
     metric_names: list[str]
     context: MCPContext
     requirements: Optional[str] = None
+    horizon_hours: HorizonHours = DEFAULT_HORIZON_HOURS
 
 class MultiPlansResponse(BaseModel):
     # Mapping of metric_name -> PlansResponse (keeps original contract per metric)
     results: dict[str, PlansResponse]
     generated_at: datetime
+
+# --- Batch variants (/plans/batch) ---
+class BatchPlanItem(BaseModel):
+    github_url: str
+    context: MCPContext
+
+class BatchPlansRequest(BaseModel):
+    items: list[BatchPlanItem] = Field(min_length=1, max_length=1000)
+    metric_names: list[str] = Field(default_factory=lambda: ["total_events"], min_length=1)
+    horizon_hours: HorizonHours = DEFAULT_HORIZON_HOURS
+
+class BatchPlanResult(BaseModel):
+    github_url: str
+    context_id: str
+    # metric_name -> PlansResponse (/plans 와 동일한 형태, 같은 캐시 공유)
+    results: dict[str, PlansResponse] = Field(default_factory=dict)
+    error: Optional[str] = None
+
+class BatchPlansResponse(BaseModel):
+    results: list[BatchPlanResult]
+    generated_at: datetime
+
+class PlanStreamLine(BaseModel):
+    # NDJSON 스트리밍 모드(stream=true)의 한 줄: 저장소 × metric 결과 1건
+    github_url: str
+    context_id: Optional[str] = None
+    metric_name: Optional[str] = None
+    result: Optional[PlansResponse] = None
+    error: Optional[str] = None
@@ -1,11 +1,22 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 class StatusQuery(BaseModel):
     github_url: str
 
+class InstanceStatus(BaseModel):
+    instance_id: str
+    server_status: Optional[str] = None
+    is_healthy: bool
+
 class StatusResponse(BaseModel):
     github_url: str
     instance_id: str
-    cpu_usage: float
-    mem_usage: float
+    cpu_usage: Optional[float] = None  # 최신 avg_cpu (데이터 없으면 None)
+    mem_usage: Optional[float] = None  # 최신 avg_memory (데이터 없으면 None)
     is_healthy: bool
+    server_status: Optional[str] = None  # Nova 서버 상태 (ACTIVE, BUILD, ERROR, ...)
+    refreshed_at: Optional[datetime] = None  # 폴러 스냅샷 갱신 시각
+    instances: List[InstanceStatus] = []  # fleet 배포의 인스턴스별 상태 (instance_id 는 대표)
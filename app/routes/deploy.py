@@ -2,6 +2,7 @@
 from fastapi import APIRouter, HTTPException
 from typing import Optional, Dict, Any
 import logging
+import threading
 import httpx
 import os
 from datetime import datetime
@@ -9,11 +10,11 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 from app.models.deploy import DeployRequest, DeployResponse, InstanceInfo
-from app.core.openstack.deployer import create_server
+from app.core.openstack.deployer import create_server, create_servers
 from app.core.openstack.flavor_mapper import get_openstack_flavor
-from app.core.openstack.client import get_connection
 from app.models.common import MCPContext
-from app.core import projects_store
+from app.models.plans import PlansRequest
+from app.core import deploy_jobs, projects_store
 
 # .env 파일 로드 (OPENSTACK_* 및 MCP_CORE_URL 등)
 load_dotenv()
@@ -21,16 +22,73 @@ load_dotenv()
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# /plans 호출 경로
+# - 기본: 같은 프로세스의 plan_service를 직접 호출 (loopback HTTP 없음)
+# - deploy_main 처럼 /deploy만 별도 프로세스로 띄운 경우: use_remote_plans()로 원격 /plans 호출
+_plans_base_url: Optional[str] = None
+_plans_client: Optional[httpx.Client] = None
+_plans_client_lock = threading.Lock()
+
+
+def use_remote_plans(base_url: str) -> None:
+    """/plans 를 원격 MCP Core 로 호출하도록 전환한다. (deploy_main 전용)"""
+    global _plans_base_url
+    _plans_base_url = base_url.rstrip("/")
+
+
+def _get_plans_client() -> httpx.Client:
+    """keep-alive 커넥션을 재사용하는 공유 httpx.Client (요청마다 새로 만들지 않음)."""
+    global _plans_client
+    with _plans_client_lock:
+        if _plans_client is None:
+            _plans_client = httpx.Client(
+                base_url=_plans_base_url or "",
+                timeout=httpx.Timeout(30.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("PLANS_HTTP_MAX_CONNECTIONS", "20")),
+                    max_keepalive_connections=int(os.getenv("PLANS_HTTP_MAX_KEEPALIVE", "10")),
+                ),
+            )
+        return _plans_client
+
+
+def close_plans_client() -> None:
+    global _plans_client
+    with _plans_client_lock:
+        if _plans_client is not None:
+            _plans_client.close()
+            _plans_client = None
+
+
+def _request_plan(plans_request: PlansRequest) -> Dict[str, Any]:
+    """예측 플랜을 받아 JSON 호환 dict로 반환한다."""
+    if _plans_base_url is None:
+        # 지연 import: deploy_main 단독 실행 시 predictor(tensorflow)를 로드하지 않기 위함
+        from app.core import plan_service
+
+        return plan_service.build_plan(plans_request).model_dump(mode="json")
+
+    plans_response = _get_plans_client().post("/plans", json=plans_request.model_dump(mode="json"))
+    if plans_response.status_code != 200:
+        raise HTTPException(
+            status_code=plans_response.status_code,
+            detail=f"Plans API failed: {plans_response.text}"
+        )
+    return plans_response.json()
+
 
 @router.post("", response_model=DeployResponse)
-def deploy(req: DeployRequest) -> DeployResponse:
+def deploy(req: DeployRequest, wait: bool = False) -> DeployResponse:
     """
     GitHub URL과 자연어를 받아서 예측 후 OpenStack에 VM을 생성하는 엔드포인트.
     
     플로우:
-    1. /plans 엔드포인트를 내부적으로 호출하여 예측 및 recommended_flavor 받기
+    1. plan_service로 예측 및 recommended_flavor 받기 (별도 프로세스면 /plans HTTP 호출)
     2. recommended_flavor를 OpenStack flavor로 변환
-    3. OpenStack에 VM 생성
+    3. OpenStack에 VM 생성 (백그라운드 job, 제한된 동시성)
+
+    기본 동작은 job_id를 즉시 반환하며, 진행 상태는 /status/jobs/{job_id} 로 조회한다.
+    wait=true 이면 VM 생성 완료까지 기다린 뒤 instance 정보를 반환한다.
     """
     try:
         env_config: Dict[str, Any] = req.env_config or {}
@@ -56,9 +114,6 @@ def deploy(req: DeployRequest) -> DeployResponse:
 
         context_id = env_config.get("context_id") or f"deploy-{req.github_url.replace('/', '-')}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
 
-        # 1. Plans 엔드포인트 호출 (내부 호출)
-        mcp_core_url = os.getenv("MCP_CORE_URL", "http://localhost:8000")
-        
         # Plans 요청을 위한 컨텍스트 생성 (Predict 응답 기반 값 우선 사용)
         context = MCPContext(
             context_id=context_id,
@@ -90,29 +145,13 @@ def deploy(req: DeployRequest) -> DeployResponse:
         plan_id = req.plan_id or env_config.get("plan_id") or context.context_id
 
         if recommended_flavor is None:
-            plans_request = {
-                "github_url": req.github_url,
-                "metric_name": "total_events",
-                "context": context.model_dump(mode='json')  # datetime을 ISO 문자열로 변환
-            }
-            
-            # 내부 호출 (동기)
-            with httpx.Client(timeout=30.0) as client:
-                plans_response = client.post(
-                    f"{mcp_core_url}/plans",
-                    json=plans_request
-                )
-                
-                if plans_response.status_code != 200:
-                    raise HTTPException(
-                        status_code=plans_response.status_code,
-                        detail=f"Plans API failed: {plans_response.text}"
-                    )
-                
-                plans_data = plans_response.json()
-                recommended_flavor = plans_data.get("recommended_flavor", "small")
-                plan_prediction = plans_data.get("prediction", {}) or {}
-                plan_id = plan_prediction.get("plan_id") or plan_prediction.get("github_url", req.github_url)
+            # 1. Plans 파이프라인 호출 (in-process, deploy_main 단독 실행 시에만 HTTP)
+            plans_data = _request_plan(
+                PlansRequest(github_url=req.github_url, metric_name="total_events", context=context)
+            )
+            recommended_flavor = plans_data.get("recommended_flavor", "small")
+            plan_prediction = plans_data.get("prediction", {}) or {}
+            plan_id = plan_prediction.get("plan_id") or plan_prediction.get("github_url", req.github_url)
         else:
             logger.info("Using recommended_flavor from Predict response: %s", recommended_flavor)
         
@@ -122,55 +161,118 @@ def deploy(req: DeployRequest) -> DeployResponse:
             runtime_env=context.runtime_env
         )
         
-        # 3. OpenStack 연결 및 리소스 확인
-        conn = get_connection()
-        
-        # OpenStack 리소스 이름 (환경변수 또는 기본값)
+        # 3. OpenStack 리소스 이름 (환경변수 또는 기본값)
+        #    연결은 job 실행 시 deployer가 공유 풀에서 빌려 쓴다.
         image_name = os.getenv("OPENSTACK_IMAGE_NAME", "cirros-0.6.3-x86_64-disk")
         network_name = os.getenv("OPENSTACK_NETWORK_NAME", "private")
         key_name = os.getenv("OPENSTACK_KEY_NAME", "default")  # 기본값 설정
         
-        # 4. VM 생성
+        # 4. VM 생성 (백그라운드 job) - Nova가 ACTIVE가 될 때까지 요청 스레드를 잡지 않는다
         server_name = f"mcp-{req.github_url.split('/')[-1]}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
-        
-        instance_info = create_server(
-            name=server_name,
-            image_ref=image_name,
-            flavor_name=openstack_flavor,
-            network_name=network_name,
-            key_name=key_name or "default",
-            metadata={
-                "github_url": req.github_url,
-                "plan_id": plan_id,
-                "recommended_flavor": recommended_flavor,
-                "service_id": service_id or "",
-                "deployed_at": datetime.utcnow().isoformat(),
+        server_metadata = {
+            "github_url": req.github_url,
+            "plan_id": plan_id,
+            "recommended_flavor": recommended_flavor,
+            "service_id": service_id or "",
+            "deployed_at": datetime.utcnow().isoformat(),
+        }
+
+        def _provision() -> Dict[str, Any]:
+            if req.instance_count > 1:
+                # 여러 대는 동시에 생성하고 한 번의 목록 조회로 함께 대기
+                instances = create_servers(
+                    name_prefix=server_name,
+                    count=req.instance_count,
+                    image_ref=image_name,
+                    flavor_name=openstack_flavor,
+                    network_name=network_name,
+                    key_name=key_name or "default",
+                    metadata=server_metadata,
+                )
+            else:
+                instances = [
+                    create_server(
+                        name=server_name,
+                        image_ref=image_name,
+                        flavor_name=openstack_flavor,
+                        network_name=network_name,
+                        key_name=key_name or "default",
+                        metadata=server_metadata,
+                    )
+                ]
+            instance_info = instances[0]
+
+            # fleet 은 모든 인스턴스가 떠 있어야 deployed
+            status_label = "deployed"
+            if any(not i.status or i.status.upper() not in {"ACTIVE", "RUNNING"} for i in instances):
+                status_label = "building"
+
+            projects_store.upsert_project(
+                name=server_name,
+                repository=req.github_url,
+                status=status_label,
+                url=env_config.get("public_url"),
+                last_deployment=datetime.utcnow(),
+                service_id=service_id,
+                instance_id=instance_info.instance_id,
+                instance_ids=[i.instance_id for i in instances],
+            )
+            return {
+                "instance": instance_info.model_dump(),
+                "instances": [i.model_dump() for i in instances],
             }
-        )
 
-        status_label = "deployed"
-        if not instance_info.status or instance_info.status.upper() not in {"ACTIVE", "RUNNING"}:
-            status_label = "building"
+        if wait:
+            # 하위 호환: ?wait=true 이면 기존처럼 VM 생성 완료까지 기다린 뒤 응답
+            result = _provision()
+            instance_info = InstanceInfo(**result["instance"])
+            return DeployResponse(
+                accepted=True,
+                plan_id=plan_id,
+                instance_id=instance_info.instance_id,
+                instance=instance_info,
+                instances=[InstanceInfo(**i) for i in result["instances"]],
+                status="succeeded",
+                message=f"VM created successfully: {instance_info.name} ({instance_info.status})",
+                deployed_at=datetime.utcnow(),
+            )
 
         projects_store.upsert_project(
             name=server_name,
             repository=req.github_url,
-            status=status_label,
+            status="building",
             url=env_config.get("public_url"),
-            last_deployment=datetime.utcnow(),
             service_id=service_id,
-            instance_id=instance_info.instance_id,
         )
-        
+
+        def _provision_job() -> Dict[str, Any]:
+            # job 실패는 deploy_jobs 가 job 상태로만 남기므로, 프로젝트도 building 에서 failed 로 바꾼다
+            try:
+                return _provision()
+            except Exception:
+                projects_store.upsert_project(
+                    name=server_name,
+                    repository=req.github_url,
+                    status="failed",
+                    service_id=service_id,
+                )
+                raise
+
+        job = deploy_jobs.submit(
+            _provision_job,
+            github_url=req.github_url,
+            plan_id=plan_id,
+            server_name=server_name,
+        )
+
         return DeployResponse(
             accepted=True,
             plan_id=plan_id,
-            instance_id=instance_info.instance_id,
-            instance=instance_info,
-            message=f"VM created successfully: {instance_info.name} ({instance_info.status})",
-            deployed_at=datetime.utcnow(),
+            job_id=job["job_id"],
+            status=job["status"],
+            message=f"Deployment queued: {server_name} (poll /status/jobs/{job['job_id']})",
         )
-        
+
     except HTTPException:
         raise
     except Exception as e:
@@ -3,78 +3,184 @@ from __future__ import annotations
 import logging
 import os
 from datetime import datetime
+from typing import Optional
 
 from fastapi import APIRouter, HTTPException
 
+from app.core import hourly_scheduler, plan_cache, projects_store
 from app.core.errors import PredictionError
 from app.core.hourly_flavor_mapper import map_predictions_to_flavors
 from app.core.policy import postprocess_predictions
-from app.core.predictor.base import BasePredictor
-from app.core.predictor.baseline_predictor import BaselinePredictor
-from app.core.predictor.lstm_predictor import LSTMPredictor
-from app.models.hourly_plans import HourlyPlansRequest, HourlyPlansResponse
+from app.core.plan_service import get_predictor
+from app.core.singleflight import SingleFlight
+from app.models.common import PredictionResult
+from app.models.hourly_plans import (
+    HourlyPlansRequest,
+    HourlyPlansResponse,
+    HourlyScheduleRequest,
+    HourlyScheduleResponse,
+    ScheduledResize,
+)
 
 router = APIRouter(prefix="/hourly-flavor", tags=["hourly-flavor"])
 
-_PREDICTOR_CACHE: dict[str, BasePredictor] = {}
+_PREDICTION_FLIGHT: SingleFlight[PredictionResult] = SingleFlight()
 
 
-def _get_predictor(kind: str) -> BasePredictor:
-    if kind not in _PREDICTOR_CACHE:
-        if kind == "baseline":
-            _PREDICTOR_CACHE[kind] = BaselinePredictor()
-        else:
-            _PREDICTOR_CACHE[kind] = LSTMPredictor()
-    return _PREDICTOR_CACHE[kind]
-
-
-@router.post("", response_model=HourlyPlansResponse)
-async def recommend_hourly_flavor(req: HourlyPlansRequest) -> HourlyPlansResponse:
-    """
-    모델의 시간별 예측을 그대로 사용해 24개의 시간별 플레이버를 추천한다.
-
-    기존 /plans 흐름과 독립적으로 동작하며, 필요한 경우 FastAPI에 따로 연결해 사용한다.
-    """
-    model_version = req.model_version or os.getenv("MODEL_VERSION", "lstm_v1")
-
+def _run_hourly_prediction(req: HourlyPlansRequest, model_version: str) -> PredictionResult:
     try:
-        predictor = _get_predictor("lstm")
-        raw_pred = predictor.run(
+        predictor = get_predictor("lstm")
+        return predictor.run(
             github_url=req.github_url,
             metric_name=req.metric_name,
             ctx=req.context,
             model_version=model_version,
+            horizon=req.horizon_hours,
         )
     except PredictionError as exc:
         logging.exception("LSTM hourly prediction failed: %s", exc)
         if not req.fallback_to_baseline:
             raise HTTPException(status_code=500, detail="Hourly prediction failed") from exc
 
-        fallback = _get_predictor("baseline")
-        raw_pred = fallback.run(
+        fallback = get_predictor("baseline")
+        return fallback.run(
             github_url=req.github_url,
             metric_name=req.metric_name,
             ctx=req.context,
             model_version=f"{model_version}_baseline",
+            horizon=req.horizon_hours,
         )
 
+
+@router.post("", response_model=HourlyPlansResponse)
+def recommend_hourly_flavor(req: HourlyPlansRequest) -> HourlyPlansResponse:
+    """
+    모델의 시간별 예측을 그대로 사용해 horizon_hours(기본 24)개의 시간별 플레이버를 추천한다.
+
+    기존 /plans 흐름과 독립적으로 동작한다. 리사이즈 실행은 /hourly-flavor/schedule 참고.
+    예측 단계가 블로킹 호출이고 single-flight 대기를 포함하므로 threadpool에서 실행되도록 동기 함수로 둔다.
+    """
+    model_version = req.model_version or os.getenv("MODEL_VERSION", "lstm_v1")
+
+    cache_key = plan_cache.make_key(
+        "hourly",
+        github_url=req.github_url,
+        metrics=req.metric_name,
+        ctx=req.context,
+        model_version=model_version,
+        extra=(req.fallback_to_baseline, req.strategy, req.horizon_hours),
+    )
+    cached = plan_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # 동시에 들어온 동일 요청은 하나의 예측 결과를 공유 (캐시 키와 동일한 정규화 키 사용)
+    raw_pred, _ = _PREDICTION_FLIGHT.do(cache_key, lambda: _run_hourly_prediction(req, model_version))
+
     final_pred = postprocess_predictions(raw_pred, req.context)
 
     try:
         recommendations, breakpoints, total_cost = map_predictions_to_flavors(
-            final_pred.predictions
+            final_pred.predictions, strategy=req.strategy
         )
     except Exception as exc:
         logging.exception("Hourly flavor mapping failed: %s", exc)
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    return HourlyPlansResponse(
+    response = HourlyPlansResponse(
         github_url=req.github_url,
         metric_name=req.metric_name,
         model_version=final_pred.model_version,
         generated_at=datetime.utcnow(),
         hourly_recommendations=recommendations,
         breakpoints=breakpoints,
-        total_expected_cost_24h=round(total_cost, 3),
-        notes="24 hourly flavors derived directly from model outputs.",
+        total_expected_cost_24h=round(sum(r.hourly_cost for r in recommendations[:24]), 3),
+        total_expected_cost=round(total_cost, 3),
+        horizon_hours=len(recommendations),
+        notes=f"{len(recommendations)} hourly flavors derived from model outputs ({req.strategy} strategy).",
     )
+    plan_cache.put(cache_key, response)
+    return response
+
+
+def _resolve_instance_ids(req: HourlyScheduleRequest) -> list[str]:
+    if req.instance_id:
+        return [req.instance_id]
+    # 같은 저장소의 가장 최근 배포 인스턴스 (fleet 이면 전체, 첫 번째가 대표)
+    projects = [
+        p for p in projects_store.list_projects()
+        if p["repository"] == req.github_url and p.get("instance_id")
+    ]
+    if not projects:
+        return []
+    latest = max(projects, key=lambda p: p["updated_at"])
+    return list(latest.get("instance_ids") or [latest["instance_id"]])
+
+
+@router.post("/schedule", response_model=HourlyScheduleResponse)
+def schedule_hourly_flavor(req: HourlyScheduleRequest) -> HourlyScheduleResponse:
+    """
+    시간별 추천을 리사이즈 타임라인으로 변환한다.
+
+    인접한 같은 플레이버 시간을 합치고 min_hold_hours 미만 구간은 흡수해 리사이즈 횟수를 줄인다.
+    apply=true 이면 대상 인스턴스의 스케줄을 실행기에 등록해 각 구간 시작 정시에 리사이즈한다.
+    """
+    plan = recommend_hourly_flavor(req)
+
+    segments = hourly_scheduler.build_segments(plan.hourly_recommendations, min_hold_hours=req.min_hold_hours)
+    instance_ids = _resolve_instance_ids(req)
+    instance_id = instance_ids[0] if instance_ids else None
+    actions = hourly_scheduler.plan_actions(segments, instance_id=instance_id)
+
+    if req.apply:
+        if instance_id is None:
+            raise HTTPException(status_code=404, detail=f"No deployed instance for {req.github_url}")
+        for target in instance_ids:
+            hourly_scheduler.register(
+                instance_id=target,
+                github_url=req.github_url,
+                actions=actions,
+                runtime_env=req.context.runtime_env,
+            )
+
+    recs = plan.hourly_recommendations
+    planned = hourly_scheduler.planned_cost(segments)
+    planned_24h = hourly_scheduler.planned_cost(segments, hours=24)
+    static_peak = round(max((r.hourly_cost for r in recs), default=0.0) * len(recs), 3)
+    static_peak_24h = round(max((r.hourly_cost for r in recs[:24]), default=0.0) * len(recs[:24]), 3)
+
+    return HourlyScheduleResponse(
+        github_url=req.github_url,
+        instance_id=instance_id,
+        instance_ids=instance_ids,
+        model_version=plan.model_version,
+        generated_at=datetime.utcnow(),
+        segments=segments,
+        actions=actions,
+        resize_count=sum(1 for a in actions if a.from_flavor is not None),
+        horizon_hours=plan.horizon_hours,
+        planned_cost_24h=planned_24h,
+        hourly_cost_24h=plan.total_expected_cost_24h,
+        static_peak_cost_24h=static_peak_24h,
+        estimated_savings_24h=round(static_peak_24h - planned_24h, 3),
+        planned_cost=planned,
+        hourly_cost=plan.total_expected_cost,
+        static_peak_cost=static_peak,
+        estimated_savings=round(static_peak - planned, 3),
+        applied=req.apply,
+    )
+
+
+@router.get("/schedule/{instance_id}", response_model=list[ScheduledResize])
+def get_hourly_schedule(instance_id: str) -> list[ScheduledResize]:
+    record = hourly_scheduler.get_schedule(instance_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"No schedule for instance {instance_id}")
+    return record["actions"]
+
+
+@router.delete("/schedule/{instance_id}")
+def cancel_hourly_schedule(instance_id: str) -> dict:
+    if not hourly_scheduler.cancel(instance_id):
+        raise HTTPException(status_code=404, detail=f"No schedule for instance {instance_id}")
+    return {"ok": True, "instance_id": instance_id}
@@ -0,0 +1,90 @@
+"""
+/metrics 라우트.
+
+에이전트가 수집한 메트릭 점을 받아 metric_history 에 적재한다. 요청은 검증 후 메모리 버퍼에
+넣기만 하고 바로 202 를 돌려준다. 적재/캐시 무효화는 app/core/metric_ingest.py 가 묶어서 처리한다.
+
+본문 형식:
+- application/json: {"points": [{github_url, metric_name, ts, value}, ...],
+                     "series": [{github_url, metric_name, ts: [...], values: [...]}, ...]}
+  series 는 한 서비스 × 메트릭의 여러 시점을 열 단위로 보내는 압축 형식이다.
+- application/x-ndjson: 한 줄에 점 하나 ({github_url, metric_name, ts, value})
+ts 는 ISO-8601 또는 epoch 초이며 UTC 로 저장된다.
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from app.core import metric_ingest
+from app.models.metric_ingest import (
+    MAX_POINTS_PER_REQUEST,
+    MetricIngestRequest,
+    MetricIngestResponse,
+    MetricPoint,
+)
+
+router = APIRouter()
+
+_NDJSON = "application/x-ndjson"
+
+
+def _parse_ndjson(body: bytes) -> MetricIngestRequest:
+    points = []
+    for lineno, line in enumerate(body.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            points.append(MetricPoint.model_validate_json(line))
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail=f"line {lineno}: {exc.errors(include_url=False)}")
+        if len(points) > MAX_POINTS_PER_REQUEST:
+            raise HTTPException(status_code=422, detail=f"요청당 최대 {MAX_POINTS_PER_REQUEST}개 점")
+    try:
+        return MetricIngestRequest(points=points)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
+
+
+def _accept(body: bytes, content_type: str) -> MetricIngestResponse:
+    # 최대 MAX_POINTS_PER_REQUEST 개 점의 파싱/검증과 버퍼 락 대기는 이벤트 루프 밖(스레드풀)에서 한다
+    if _NDJSON in content_type:
+        req = _parse_ndjson(body)
+    else:
+        try:
+            req = MetricIngestRequest.model_validate_json(body)
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False))
+
+    rows = req.rows()
+    buffered = metric_ingest.submit(rows)
+    if buffered is None:
+        raise HTTPException(
+            status_code=429,
+            detail="Metric ingest buffer is full, retry later",
+            headers={"Retry-After": str(metric_ingest.retry_after_seconds())},
+        )
+    return MetricIngestResponse(accepted=len(rows), buffered=buffered)
+
+
+@router.post("/ingest", response_model=MetricIngestResponse, status_code=202)
+async def ingest(request: Request) -> MetricIngestResponse:
+    """
+    메트릭 점을 적재 버퍼에 넣는다.
+
+    - 적재기가 꺼져 있으면(METRIC_INGEST_ENABLED, 쓰기 불가 백엔드) 503
+    - 버퍼가 가득 차면 요청 전체를 거절하고 429 + Retry-After (일부만 받지 않는다)
+    """
+    if not metric_ingest.is_running():
+        raise HTTPException(status_code=503, detail="Metric ingestion is not enabled")
+
+    body = await request.body()
+    return await run_in_threadpool(_accept, body, request.headers.get("content-type", ""))
+
+
+@router.get("/ingest/stats")
+def ingest_stats() -> Dict[str, Any]:
+    """적재 카운터 (accepted / rejected / written / failed / buffered)."""
+    return metric_ingest.stats()
@@ -1,15 +1,65 @@
-from fastapi import APIRouter
-from app.models.status import StatusQuery, StatusResponse
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, HTTPException
+from app.core import deploy_jobs, status_poller
+from app.models.deploy import DeployJob, InstanceInfo
+from app.models.status import InstanceStatus, StatusQuery, StatusResponse
 
 router = APIRouter()
 
 @router.post("", response_model=StatusResponse)
 def status(q: StatusQuery):
-    # TODO: 실제 모니터링 소스 조회
+    """
+    저장소에 배포된 인스턴스 상태를 반환한다.
+
+    status_poller가 주기적으로 갱신한 메모리 스냅샷만 읽으므로 Nova를 호출하지 않는다.
+    """
+    entry = status_poller.get_status(q.github_url)
+    if entry is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No tracked instance status for {q.github_url} (not deployed or not polled yet)",
+        )
     return StatusResponse(
-        github_url=q.github_url,
-        instance_id="vm-123456",
-        cpu_usage=0.42,
-        mem_usage=0.63,
-        is_healthy=True
+        github_url=entry["github_url"],
+        instance_id=entry["instance_id"],
+        cpu_usage=entry["cpu_usage"],
+        mem_usage=entry["mem_usage"],
+        is_healthy=entry["is_healthy"],
+        server_status=entry["server_status"],
+        refreshed_at=entry["refreshed_at"],
+        instances=[InstanceStatus(**i) for i in entry.get("instances") or []],
+    )
+
+
+def _to_job(record: Dict[str, Any]) -> DeployJob:
+    result = record.get("result") or {}
+    instance = result.get("instance")
+    return DeployJob(
+        job_id=record["job_id"],
+        github_url=record["github_url"],
+        plan_id=record.get("plan_id"),
+        server_name=record.get("server_name"),
+        status=record["status"],
+        instance=InstanceInfo(**instance) if instance else None,
+        instances=[InstanceInfo(**i) for i in result.get("instances") or []],
+        error=record.get("error"),
+        created_at=record["created_at"],
+        started_at=record.get("started_at"),
+        finished_at=record.get("finished_at"),
     )
+
+
+@router.get("/jobs", response_model=List[DeployJob])
+def list_deploy_jobs(github_url: Optional[str] = None) -> List[DeployJob]:
+    """비동기 배포 job 목록 (github_url로 필터 가능)."""
+    return [_to_job(r) for r in deploy_jobs.list_jobs(github_url)]
+
+
+@router.get("/jobs/{job_id}", response_model=DeployJob)
+def get_deploy_job(job_id: str) -> DeployJob:
+    """/deploy 가 반환한 job_id 의 진행 상태를 조회한다."""
+    record = deploy_jobs.get_job(job_id)
+    if not record:
+        raise HTTPException(status_code=404, detail=f"Deploy job not found: {job_id}")
+    return _to_job(record)
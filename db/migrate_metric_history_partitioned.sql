@@ -0,0 +1,84 @@
+-- metric_history 전환 (MySQL 8)
+--   이전: 단일 테이블, id PK + github_url/metric_name 문자열 + 단일 컬럼 인덱스
+--   이후: services/metrics 정수 ID, (service_id, metric_id, ts) PK, ts 월별 파티션
+-- 먼저 schema_unified.sql 의 0번(services, metrics)과 5-1(롤업) 테이블을 만든다.
+-- 전환 후 롤업 채우기: python scripts/metric_history_retention.py --refresh-hours <원본 보관 시간>
+USE mcp_core;
+
+-- 1) 사전 테이블 채우기
+INSERT IGNORE INTO services (github_url) SELECT DISTINCT github_url FROM metric_history;
+INSERT IGNORE INTO services (github_url) SELECT DISTINCT github_url FROM predictions;
+INSERT IGNORE INTO services (github_url) SELECT DISTINCT github_url FROM anomaly_detections;
+INSERT IGNORE INTO metrics (metric_name) SELECT DISTINCT metric_name FROM metric_history;
+INSERT IGNORE INTO metrics (metric_name) SELECT DISTINCT metric_name FROM predictions;
+
+-- 2) metric_history 재작성
+CREATE TABLE metric_history_new (
+  service_id INT UNSIGNED NOT NULL COMMENT 'services.service_id',
+  metric_id SMALLINT UNSIGNED NOT NULL COMMENT 'metrics.metric_id',
+  ts DATETIME NOT NULL COMMENT 'UTC 타임스탬프',
+  value DOUBLE NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (service_id, metric_id, ts)
+) ENGINE=InnoDB COMMENT='모델 feature 시계열'
+PARTITION BY RANGE COLUMNS (ts) (
+  PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+  PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+  PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+  PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+  PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+  PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+  PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+  PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+  PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+  PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+  PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+  PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- 복사 중 들어온 행은 이름 교체 직전에 같은 INSERT IGNORE 를 한 번 더 실행해 따라잡는다.
+INSERT IGNORE INTO metric_history_new (service_id, metric_id, ts, value, created_at)
+SELECT s.service_id, m.metric_id, h.ts, h.value, h.created_at
+FROM metric_history h
+JOIN services s ON s.github_url = h.github_url
+JOIN metrics m ON m.metric_name = h.metric_name;
+
+RENAME TABLE metric_history TO metric_history_old, metric_history_new TO metric_history;
+-- 확인 후: DROP TABLE metric_history_old;
+
+-- 3) predictions / anomaly_detections 정수 ID 컬럼
+ALTER TABLE predictions
+  ADD COLUMN service_id INT UNSIGNED NULL AFTER feature_snapshot_id,
+  ADD COLUMN metric_id SMALLINT UNSIGNED NULL AFTER service_id;
+UPDATE predictions p
+JOIN services s ON s.github_url = p.github_url
+JOIN metrics m ON m.metric_name = p.metric_name
+SET p.service_id = s.service_id, p.metric_id = m.metric_id;
+ALTER TABLE predictions
+  MODIFY service_id INT UNSIGNED NOT NULL,
+  MODIFY metric_id SMALLINT UNSIGNED NOT NULL,
+  ADD CONSTRAINT fk_predictions_service FOREIGN KEY (service_id) REFERENCES services(service_id),
+  ADD CONSTRAINT fk_predictions_metric FOREIGN KEY (metric_id) REFERENCES metrics(metric_id),
+  ADD INDEX idx_service_metric (service_id, metric_id, generated_at DESC),
+  DROP INDEX idx_github_metric;
+
+ALTER TABLE anomaly_detections ADD COLUMN service_id INT UNSIGNED NULL AFTER prediction_id;
+UPDATE anomaly_detections a JOIN services s ON s.github_url = a.github_url SET a.service_id = s.service_id;
+ALTER TABLE anomaly_detections
+  MODIFY service_id INT UNSIGNED NOT NULL,
+  ADD CONSTRAINT fk_anomaly_service FOREIGN KEY (service_id) REFERENCES services(service_id),
+  ADD INDEX idx_service_time (service_id, detected_at),
+  DROP INDEX idx_repo_time;
@@ -0,0 +1,10 @@
+-- prediction_features 입력 정보 컬럼 NULL 허용 (MySQL 8)
+--   predictor 가 입력 구간/특징 수를 알려주지 않는 경우(폴백 예측 등) 고정값 대신 NULL 로 저장한다.
+--   schema_unified.sql 로 새로 만든 DB 는 이미 반영되어 있다.
+USE mcp_core;
+
+ALTER TABLE prediction_features
+  MODIFY window_start DATETIME NULL COMMENT '사용된 feature 시작 (모르면 NULL)',
+  MODIFY window_end DATETIME NULL COMMENT '사용된 feature 종료 (모르면 NULL)',
+  MODIFY sequence_length INT NULL COMMENT '시퀀스 길이 (예: 24, 모르면 NULL)',
+  MODIFY feature_count INT NULL COMMENT 'feature 개수 (예: 79, 모르면 NULL)';
@@ -8,6 +8,21 @@ CREATE DATABASE IF NOT EXISTS mcp_core
   COLLATE utf8mb4_unicode_ci;
 USE mcp_core;
 
+-- 0. 사전(dictionary) 테이블: 시계열/예측 테이블은 문자열 대신 정수 ID 를 저장한다 (app/core/id_registry.py)
+CREATE TABLE IF NOT EXISTS services (
+  service_id INT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  github_url VARCHAR(500) NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE KEY uk_service_url (github_url)
+) ENGINE=InnoDB COMMENT='github_url 사전';
+
+CREATE TABLE IF NOT EXISTS metrics (
+  metric_id SMALLINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+  metric_name VARCHAR(100) NOT NULL,
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE KEY uk_metric_name (metric_name)
+) ENGINE=InnoDB COMMENT='metric_name 사전';
+
 -- 1. MCP Context snapshots
 CREATE TABLE IF NOT EXISTS mcp_contexts (
   context_id CHAR(36) PRIMARY KEY COMMENT 'UUID',
@@ -33,10 +48,10 @@ CREATE TABLE IF NOT EXISTS prediction_features (
   feature_snapshot_id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
   context_id CHAR(36) NOT NULL,
   github_url VARCHAR(500) NOT NULL,
-  window_start DATETIME NOT NULL COMMENT '사용된 feature 시작',
-  window_end DATETIME NOT NULL COMMENT '사용된 feature 종료',
-  sequence_length INT NOT NULL COMMENT '시퀀스 길이 (예: 24)',
-  feature_count INT NOT NULL COMMENT 'feature 개수 (예: 79)',
+  window_start DATETIME NULL COMMENT '사용된 feature 시작 (모르면 NULL)',
+  window_end DATETIME NULL COMMENT '사용된 feature 종료 (모르면 NULL)',
+  sequence_length INT NULL COMMENT '시퀀스 길이 (예: 24, 모르면 NULL)',
+  feature_count INT NULL COMMENT 'feature 개수 (예: 79, 모르면 NULL)',
   features_json JSON NOT NULL COMMENT 'feature 이름/값 묶음',
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (context_id) REFERENCES mcp_contexts(context_id) ON DELETE CASCADE,
@@ -49,6 +64,8 @@ CREATE TABLE IF NOT EXISTS predictions (
   prediction_id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
   context_id CHAR(36) NOT NULL,
   feature_snapshot_id BIGINT UNSIGNED NOT NULL,
+  service_id INT UNSIGNED NOT NULL,
+  metric_id SMALLINT UNSIGNED NOT NULL,
   user_id VARCHAR(100) NULL COMMENT '예측 요청 사용자',
   github_url VARCHAR(500) NOT NULL,
   metric_name VARCHAR(100) NOT NULL,
@@ -64,8 +81,10 @@ CREATE TABLE IF NOT EXISTS predictions (
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   FOREIGN KEY (context_id) REFERENCES mcp_contexts(context_id) ON DELETE CASCADE,
   FOREIGN KEY (feature_snapshot_id) REFERENCES prediction_features(feature_snapshot_id) ON DELETE CASCADE,
+  FOREIGN KEY (service_id) REFERENCES services(service_id),
+  FOREIGN KEY (metric_id) REFERENCES metrics(metric_id),
   INDEX idx_user_time (user_id, generated_at DESC),
-  INDEX idx_github_metric (github_url, metric_name, generated_at DESC),
+  INDEX idx_service_metric (service_id, metric_id, generated_at DESC),
   INDEX idx_model (model_version)
 ) ENGINE=InnoDB COMMENT='후처리된 예측 결과';
 
@@ -83,23 +102,75 @@ CREATE TABLE IF NOT EXISTS prediction_points (
 ) ENGINE=InnoDB COMMENT='시간별 예측값';
 
 -- 5. 모델 학습/특징 소스용 시계열
+-- PK (service_id, metric_id, ts) 가 예측 조회(service=?, metric=?, ts BETWEEN) 를 그대로 덮는다.
+-- 행당 문자열 대신 정수 ID (4 + 2 바이트). 파티션 테이블은 외래키를 지원하지 않아 FK 제약은 없다.
+-- ts 월별 RANGE 파티션: 미래 파티션 생성/만료 파티션 삭제는 scripts/metric_history_retention.py
+-- (파티션 테이블의 모든 UNIQUE/PK 는 ts 를 포함해야 하므로 AUTO_INCREMENT id 는 두지 않는다)
 CREATE TABLE IF NOT EXISTS metric_history (
-  id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
-  github_url VARCHAR(200) NOT NULL,
+  service_id INT UNSIGNED NOT NULL COMMENT 'services.service_id',
+  metric_id SMALLINT UNSIGNED NOT NULL COMMENT 'metrics.metric_id',
   ts DATETIME NOT NULL COMMENT 'UTC 타임스탬프',
-  metric_name VARCHAR(100) NOT NULL,
   value DOUBLE NOT NULL,
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-  UNIQUE KEY uk_metric (github_url, ts, metric_name),
-  INDEX idx_github_url (github_url),
-  INDEX idx_metric_name (metric_name),
-  INDEX idx_ts (ts)
-) ENGINE=InnoDB COMMENT='모델 feature 시계열';
+  PRIMARY KEY (service_id, metric_id, ts)
+) ENGINE=InnoDB COMMENT='모델 feature 시계열'
+PARTITION BY RANGE COLUMNS (ts) (
+  PARTITION p202501 VALUES LESS THAN ('2025-02-01'),
+  PARTITION p202502 VALUES LESS THAN ('2025-03-01'),
+  PARTITION p202503 VALUES LESS THAN ('2025-04-01'),
+  PARTITION p202504 VALUES LESS THAN ('2025-05-01'),
+  PARTITION p202505 VALUES LESS THAN ('2025-06-01'),
+  PARTITION p202506 VALUES LESS THAN ('2025-07-01'),
+  PARTITION p202507 VALUES LESS THAN ('2025-08-01'),
+  PARTITION p202508 VALUES LESS THAN ('2025-09-01'),
+  PARTITION p202509 VALUES LESS THAN ('2025-10-01'),
+  PARTITION p202510 VALUES LESS THAN ('2025-11-01'),
+  PARTITION p202511 VALUES LESS THAN ('2025-12-01'),
+  PARTITION p202512 VALUES LESS THAN ('2026-01-01'),
+  PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+  PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+  PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+  PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+  PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+  PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+  PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+  PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+  PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+  PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+  PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+  PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+  PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- 5-1. metric_history 롤업 (평균 = value_sum / sample_count)
+-- 적재 시 청크 범위만 증분 갱신 (app/core/metric_rollup.py)
+CREATE TABLE IF NOT EXISTS metric_history_hourly (
+  service_id INT UNSIGNED NOT NULL,
+  metric_id SMALLINT UNSIGNED NOT NULL,
+  bucket_ts DATETIME NOT NULL COMMENT '시간 구간 시작 (UTC)',
+  sample_count INT NOT NULL,
+  value_sum DOUBLE NOT NULL,
+  value_min DOUBLE NOT NULL,
+  value_max DOUBLE NOT NULL,
+  PRIMARY KEY (service_id, metric_id, bucket_ts)
+) ENGINE=InnoDB COMMENT='metric_history 시간 단위 롤업';
+
+CREATE TABLE IF NOT EXISTS metric_history_daily (
+  service_id INT UNSIGNED NOT NULL,
+  metric_id SMALLINT UNSIGNED NOT NULL,
+  bucket_ts DATETIME NOT NULL COMMENT '일 구간 시작 (UTC)',
+  sample_count INT NOT NULL,
+  value_sum DOUBLE NOT NULL,
+  value_min DOUBLE NOT NULL,
+  value_max DOUBLE NOT NULL,
+  PRIMARY KEY (service_id, metric_id, bucket_ts)
+) ENGINE=InnoDB COMMENT='metric_history 일 단위 롤업';
 
 -- 6. 이상 탐지 기록 – 확장용
 CREATE TABLE IF NOT EXISTS anomaly_detections (
   anomaly_id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
   prediction_id BIGINT UNSIGNED NULL,
+  service_id INT UNSIGNED NOT NULL,
   github_url VARCHAR(500) NOT NULL,
   detected_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP(3),
   anomaly_type VARCHAR(50) DEFAULT 'deviation',
@@ -108,7 +179,8 @@ CREATE TABLE IF NOT EXISTS anomaly_detections (
   detail_json JSON NULL,
   alert_sent BOOLEAN DEFAULT FALSE,
   FOREIGN KEY (prediction_id) REFERENCES predictions(prediction_id) ON DELETE SET NULL,
-  INDEX idx_repo_time (github_url, detected_at)
+  FOREIGN KEY (service_id) REFERENCES services(service_id),
+  INDEX idx_service_time (service_id, detected_at)
 ) ENGINE=InnoDB COMMENT='이상 탐지 기록';
 
 -- 7. 알림 발송 이력 – 확장용
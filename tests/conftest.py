@@ -5,9 +5,66 @@ pytest 설정 및 공통 fixture.
 """
 
 import sys
+from datetime import datetime
 from pathlib import Path
 
+import pytest
+
 # 프로젝트 루트를 PYTHONPATH에 추가
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+
+@pytest.fixture
+def make_ctx():
+    """
+    요청 컨텍스트(app.models.common.MCPContext) 팩토리.
+
+    기본값은 dev / normal / 사용자 300명이며, 키워드 인자로 필드를 덮어쓴다.
+    """
+    from app.models.common import MCPContext
+
+    def _make(**overrides) -> MCPContext:
+        fields = dict(
+            context_id="ctx-1",
+            timestamp=datetime.utcnow(),
+            service_type="web",
+            runtime_env="dev",
+            time_slot="normal",
+            weight=1.0,
+            expected_users=300,
+        )
+        fields.update(overrides)
+        return MCPContext(**fields)
+
+    return _make
+
+
+@pytest.fixture
+def make_engine():
+    """
+    테스트용 SQLite 엔진 팩토리.
+
+    make_engine(tables, url="sqlite://", **engine_kwargs) 는 주어진 테이블을 만든 엔진을 돌려주고,
+    실행된 SQL 문을 engine.statements 에 모은다. 만든 엔진은 테스트가 끝나면 정리한다.
+    MySQL 과 달리 SQLite 는 인덱스 이름이 DB 전역이라(idx_user_time 중복) 인덱스 없이 테이블만 만든다.
+    """
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.schema import CreateTable
+
+    engines = []
+
+    def _make(tables, url: str = "sqlite://", **engine_kwargs):
+        eng = create_engine(url, **engine_kwargs)
+        engines.append(eng)
+        with eng.begin() as conn:
+            for table in tables:
+                conn.execute(CreateTable(table))
+        statements = []
+        event.listen(eng, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        eng.statements = statements
+        return eng
+
+    yield _make
+    for eng in engines:
+        eng.dispose()
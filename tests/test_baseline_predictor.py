@@ -4,6 +4,7 @@
 baseline_predictor 모듈 단위 테스트.
 """
 
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
 from typing import cast
@@ -172,3 +173,50 @@ def test_baseline_predictor_predictions_time_sequence(sample_context):
         # 각 예측은 1시간 간격
         assert (times[i + 1] - times[i]) == timedelta(hours=1)
 
+
+
+def _history_source(histories):
+    source = Mock()
+    source.fetch_historical_data.side_effect = lambda github_url, metric_name, hours: histories[github_url]
+    source.fetch_many.side_effect = lambda urls, metric_name, hours: {
+        u: np.asarray(histories[u], dtype=float) for u in urls if u in histories
+    }
+    return source
+
+
+def test_baseline_predictor_noise_is_reproducible_per_request_key(sample_context):
+    """같은 요청 키는 같은 노이즈, 다른 저장소는 다른 노이즈를 사용한다."""
+    predictor = BaselinePredictor()
+    predictor.data_source = _history_source({"a": [10.0, 30.0, 20.0] * 8, "b": [10.0, 30.0, 20.0] * 8})
+
+    first = predictor.predict(github_url="a", metric_name="avg_cpu", ctx=sample_context, model_version="v1")
+    second = predictor.predict(github_url="a", metric_name="avg_cpu", ctx=sample_context, model_version="v1")
+    other = predictor.predict(github_url="b", metric_name="avg_cpu", ctx=sample_context, model_version="v1")
+
+    np.testing.assert_array_equal(first.values, second.values)
+    assert not np.array_equal(first.values, other.values)
+    assert first.model_version == "v1_statistical"
+
+
+def test_baseline_predictor_horizon_is_configurable(sample_context):
+    predictor = BaselinePredictor(horizon=48)
+    predictor.data_source = None
+
+    result = predictor.run(github_url="a", metric_name="total_events", ctx=sample_context, model_version="v1")
+
+    assert len(result.predictions) == 48
+    assert result.predictions[-1].time - result.predictions[0].time == timedelta(hours=47)
+
+
+def test_baseline_predictor_batch_matches_single(sample_context):
+    """배치 예측은 단건 예측과 같은 값을 입력 순서대로 반환한다. (데이터 없는 저장소는 폴백)"""
+    predictor = BaselinePredictor()
+    predictor.data_source = _history_source({"a": [1.0, 2.0, 4.0, 3.0], "c": [5.0, 5.0, 9.0]})
+    items = [("a", sample_context), ("missing", sample_context), ("c", sample_context)]
+
+    batch = predictor.predict_batch(items, metric_name="total_events", model_version="v1")
+
+    assert [fc.model_version for fc in batch] == ["v1_statistical", "v1_fallback", "v1_statistical"]
+    for (url, ctx), fc in zip(items, batch):
+        single = predictor.predict(github_url=url, metric_name="total_events", ctx=ctx, model_version="v1")
+        np.testing.assert_array_equal(fc.values, single.values)
@@ -0,0 +1,154 @@
+# tests/test_bulk_writer.py
+
+"""
+bulk_writer 모듈 및 scripts/ingest_metric_history.py 단위 테스트.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.bulk_writer import insert_rows
+from app.core.metric_history import MetricHistory, MetricHistoryDaily, MetricHistoryHourly
+from app.core.persistence_models import Metric, Service
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "ingest_metric_history.py"
+
+
+_TABLES = [m.__table__ for m in (Service, Metric, MetricHistory, MetricHistoryHourly, MetricHistoryDaily)]
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine(_TABLES)
+
+
+@pytest.fixture
+def ingest_module():
+    spec = importlib.util.spec_from_file_location("ingest_metric_history", _SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+
+def _count(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(MetricHistory.__table__)).scalar_one()
+
+
+def _row(i):
+    return {"service_id": 1, "metric_id": 1, "ts": f"2025-01-01 {i:02d}:00:00", "value": float(i)}
+
+
+def test_insert_rows_sends_fixed_size_multi_row_statements(engine):
+    from datetime import datetime
+
+    rows = [{**_row(i), "ts": datetime(2025, 1, 1, i)} for i in range(10)]
+    with engine.begin() as conn:
+        sent = insert_rows(conn, MetricHistory.__table__, rows, batch_size=4)
+
+    inserts = [s for s in engine.statements if s.startswith("INSERT")]
+    assert sent == 10
+    assert len(inserts) == 3  # 4 + 4 + 2
+    assert _count(engine) == 10
+
+
+def test_insert_rows_ignores_duplicates(engine):
+    from datetime import datetime
+
+    rows = [{**_row(1), "ts": datetime(2025, 1, 1, 1)}]
+    with engine.begin() as conn:
+        insert_rows(conn, MetricHistory.__table__, rows, ignore_duplicates=True)
+        insert_rows(conn, MetricHistory.__table__, rows, ignore_duplicates=True)
+
+    assert _count(engine) == 1
+
+
+def test_ingest_streams_chunks_and_resumes(engine, ingest_module, tmp_path, capsys):
+    csv_path = tmp_path / "metrics.csv"
+    csv_path.write_text(
+        "timestamp,total_events\n" + "".join(f"2025-01-01T{h:02d}:00:00Z,{h}\n" for h in range(10))
+    )
+    progress = tmp_path / "progress.json"
+    kwargs = dict(
+        github_url="repo", metric_name="total_events", time_column="timestamp", value_column="total_events",
+        chunk_rows=4, batch_size=3, progress_file=str(progress),
+    )
+
+    # 첫 실행은 6행에서 중단된 것처럼 limit 으로 끊는다
+    assert ingest_module.ingest(engine, str(csv_path), limit=6, **kwargs) == 6
+    assert json.loads(progress.read_text())["rows_done"] == 6
+    assert "rows/s" in capsys.readouterr().out
+
+    # 재실행은 커밋된 6행을 건너뛰고 나머지만 적재한다
+    assert ingest_module.ingest(engine, str(csv_path), **kwargs) == 4
+    assert json.loads(progress.read_text())["rows_done"] == 10
+    assert _count(engine) == 10
+
+    with engine.connect() as conn:
+        ts = conn.execute(select(MetricHistory.__table__.c.ts).order_by(MetricHistory.__table__.c.ts)).scalars().all()
+    assert str(ts[0]) == "2025-01-01 00:00:00" and str(ts[-1]) == "2025-01-01 09:00:00"
+
+
+def test_parse_timestamps_is_vectorized_for_epoch_and_iso(ingest_module):
+    import pandas as pd
+
+    epoch = ingest_module.parse_timestamps(pd.Series([1735689600, 1735693200]))
+    iso = ingest_module.parse_timestamps(pd.Series(["2025-01-01T00:00:00Z", "2025-01-01T10:00:00+09:00"]))
+
+    assert [str(t) for t in epoch] == ["2025-01-01 00:00:00", "2025-01-01 01:00:00"]
+    assert [str(t) for t in iso] == ["2025-01-01 00:00:00", "2025-01-01 01:00:00"]
+
+
+def test_ingest_rejects_missing_columns(engine, ingest_module, tmp_path):
+    csv_path = tmp_path / "bad.csv"
+    csv_path.write_text("time,value\n1,2\n")
+
+    with pytest.raises(ValueError, match="Missing required columns"):
+        ingest_module.ingest(engine, str(csv_path), "repo", "m", "timestamp", "value")
+
+
+def test_ingest_columns_melts_wide_csv_in_one_pass(engine, ingest_module, tmp_path):
+    csv_path = tmp_path / "wide.csv"
+    csv_path.write_text("hour_offset,avg_cpu,avg_memory,total_events\n0,0.5,0.25,10\n1,0.6,,11\n2,0.7,0.35,12\n")
+    columns = ingest_module.resolve_columns(str(csv_path), "hour_offset", all_columns=True, exclude=["total_events"])
+    assert columns == {"avg_cpu": "avg_cpu", "avg_memory": "avg_memory"}
+
+    processed = ingest_module.ingest_columns(
+        engine, str(csv_path), "repo", columns, "hour_offset", offset_base="2025-01-01T00:00:00", chunk_rows=2,
+    )
+
+    t, m = MetricHistory.__table__, Metric.__table__
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(m.c.metric_name, t.c.ts, t.c.value).join(m, m.c.metric_id == t.c.metric_id).order_by(m.c.metric_name, t.c.ts)
+        ).all()
+    assert processed == 3
+    # 빈 셀(avg_memory @ 1h)은 건너뛴다
+    assert [(m, str(ts), v) for m, ts, v in rows] == [
+        ("avg_cpu", "2025-01-01 00:00:00", 0.5),
+        ("avg_cpu", "2025-01-01 01:00:00", 0.6),
+        ("avg_cpu", "2025-01-01 02:00:00", 0.7),
+        ("avg_memory", "2025-01-01 00:00:00", 0.25),
+        ("avg_memory", "2025-01-01 02:00:00", 0.35),
+    ]
+    # 파일은 청크 단위로 한 번만 읽는다 (컬럼 수와 무관하게 청크당 INSERT 배치 1개)
+    assert len([s for s in engine.statements if s.startswith("INSERT OR IGNORE INTO metric_history ")]) == 2
+
+
+def test_ingest_columns_with_parallel_writers(ingest_module, make_engine, tmp_path):
+    eng = make_engine(_TABLES, url=f"sqlite:///{tmp_path / 'mh.db'}", connect_args={"timeout": 30})
+    csv_path = tmp_path / "wide.csv"
+    csv_path.write_text("hour_offset,a,b,c\n" + "".join(f"{h},{h},{h * 2},{h * 3}\n" for h in range(50)))
+
+    processed = ingest_module.ingest_columns(
+        eng, str(csv_path), "repo", {"a": "m_a", "b": "m_b", "c": "m_c"}, "hour_offset",
+        offset_base="2025-01-01", chunk_rows=20, batch_size=7, workers=3,
+    )
+
+    assert processed == 50
+    assert _count(eng) == 150
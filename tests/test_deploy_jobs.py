@@ -0,0 +1,114 @@
+# tests/test_deploy_jobs.py
+
+"""
+deploy_jobs 모듈 단위 테스트.
+"""
+
+import threading
+import time
+
+from app.core import deploy_jobs
+
+
+def _wait_for(job_id: str, timeout: float = 2.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = deploy_jobs.get_job(job_id)
+        if job and job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_submit_returns_immediately_and_succeeds():
+    """submit은 즉시 queued 레코드를 반환하고, 완료 후 result가 채워진다."""
+    release = threading.Event()
+
+    def provision() -> dict:
+        release.wait(1.0)
+        return {"instance": None, "ok": True}
+
+    job = deploy_jobs.submit(provision, github_url="https://github.com/org/repo", plan_id="p1")
+
+    assert job["status"] == "queued"
+    assert deploy_jobs.get_job(job["job_id"])["status"] in ("queued", "running")
+
+    release.set()
+    done = _wait_for(job["job_id"])
+    assert done["status"] == "succeeded"
+    assert done["result"] == {"instance": None, "ok": True}
+    assert done["finished_at"] is not None
+
+
+def test_failed_job_records_error():
+    """프로비저닝 예외는 failed 상태와 error 메시지로 기록된다."""
+
+    def provision() -> dict:
+        raise RuntimeError("nova down")
+
+    job = deploy_jobs.submit(provision, github_url="https://github.com/org/failing")
+    done = _wait_for(job["job_id"])
+
+    assert done["status"] == "failed"
+    assert "nova down" in done["error"]
+    assert any(j["job_id"] == job["job_id"] for j in deploy_jobs.list_jobs("https://github.com/org/failing"))
+
+
+def test_unknown_job_returns_none():
+    assert deploy_jobs.get_job("does-not-exist") is None
+
+
+def test_async_deploy_failure_marks_project_failed(monkeypatch):
+    """비동기 /deploy 의 프로비저닝이 실패하면 프로젝트도 building 으로 남지 않고 failed 가 된다."""
+    from app.core import projects_store
+    from app.models.deploy import DeployRequest
+    from app.routes import deploy as deploy_route
+
+    def _fail(**kwargs):
+        raise RuntimeError("nova down")
+
+    monkeypatch.setattr(deploy_route, "create_server", _fail)
+    repo = "https://github.com/org/deploy-fails"
+    resp = deploy_route.deploy(
+        DeployRequest(github_url=repo, env_config={"recommended_flavor": "small", "service_id": "svc-fail"})
+    )
+
+    assert _wait_for(resp.job_id)["status"] == "failed"
+    project = next(p for p in projects_store.list_projects() if p["service_id"] == "svc-fail")
+    assert project["status"] == "failed"
+
+
+def test_async_fleet_deploy_records_every_instance(monkeypatch):
+    """fleet 배포는 대표 instance_id 와 함께 전체 인스턴스를 프로젝트에 기록한다."""
+    from app.core import projects_store
+    from app.models.deploy import DeployRequest, InstanceInfo
+    from app.routes import deploy as deploy_route
+
+    def _fleet(*, name_prefix, count, **kwargs):
+        return [
+            InstanceInfo(
+                instance_id=f"vm-{n}", name=f"{name_prefix}-{n}", image_name="img", flavor_name="m1.small",
+                network_name="net", key_name="default", status="ACTIVE", addresses={},
+            )
+            for n in range(1, count + 1)
+        ]
+
+    monkeypatch.setattr(deploy_route, "create_servers", _fleet)
+    resp = deploy_route.deploy(
+        DeployRequest(
+            github_url="https://github.com/org/fleet",
+            instance_count=3,
+            env_config={"recommended_flavor": "small", "service_id": "svc-fleet"},
+        )
+    )
+
+    assert _wait_for(resp.job_id)["status"] == "succeeded"
+    project = next(p for p in projects_store.list_projects() if p["service_id"] == "svc-fleet")
+    assert project["status"] == "deployed"
+    assert project["instance_id"] == "vm-1"
+    assert project["instance_ids"] == ["vm-1", "vm-2", "vm-3"]
+
+    # 한 대를 지우면 나머지는 계속 추적되고 대표가 다음 인스턴스로 바뀐다
+    projects_store.remove_instance("vm-1")
+    project = projects_store.get_project(project["id"])
+    assert project["instance_id"] == "vm-2" and project["instance_ids"] == ["vm-2", "vm-3"]
@@ -0,0 +1,200 @@
+# tests/test_deployer_fleet.py
+
+"""
+deployer.create_servers (fleet 동시 생성) 단위 테스트.
+"""
+
+import itertools
+import threading
+from contextlib import contextmanager, nullcontext
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.errors import DeploymentError
+from app.core.openstack import deployer
+from app.core.openstack.catalog import CatalogEntry, ResourceCatalog
+
+
+class _FakeCompute:
+    """create_server 는 BUILD 로 만들고, 목록 조회 2번째부터 ACTIVE 로 바뀐다."""
+
+    def __init__(self, fail_names=()):
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.servers_by_id = {}
+        self.list_calls = 0
+        self.get_calls = 0
+        self.fail_names = set(fail_names)
+        self.stuck = False
+        self.error_names = set()
+        self.hidden = set()
+        self.name_filters = []
+        self.deleted = []
+
+    def create_server(self, **kwargs):
+        if kwargs["name"] in self.fail_names:
+            raise RuntimeError("quota exceeded")
+        with self._lock:
+            sid = f"vm-{next(self._ids)}"
+            server = SimpleNamespace(
+                id=sid,
+                name=kwargs["name"],
+                image=SimpleNamespace(id=kwargs["image_id"]),
+                metadata=dict(kwargs["metadata"]),
+                status="BUILD",
+                addresses={},
+            )
+            self.servers_by_id[sid] = server
+        return server
+
+    def get_server(self, server_id):
+        # 두 번째 조회부터 ACTIVE
+        self.get_calls += 1
+        server = self.servers_by_id[server_id]
+        if self.get_calls >= 2:
+            server.status = "ACTIVE"
+        return server
+
+    def servers(self, details=False, name=None):
+        self.list_calls += 1
+        self.name_filters.append(name)
+        if self.list_calls >= 2 and not self.stuck:
+            for s in self.servers_by_id.values():
+                s.status = "ERROR" if s.name in self.error_names else "ACTIVE"
+        # 다른 fleet 서버가 섞여 있어도 fleet_id 로 걸러져야 한다
+        other = SimpleNamespace(id="vm-other", name="x-1", metadata={"fleet_id": "other"}, status="BUILD")
+        return [*(s for s in self.servers_by_id.values() if s.name not in self.hidden), other]
+
+    def delete_server(self, server_id, ignore_missing=True):
+        self.deleted.append(server_id)
+        self.servers_by_id.pop(server_id, None)
+
+
+@pytest.fixture
+def fake_env(monkeypatch):
+    catalog = ResourceCatalog(ttl=10**9)
+    catalog._images = {"cirros": CatalogEntry(id="img-1", name="cirros")}
+    catalog._flavors = {"m1.small": CatalogEntry(id="f-1", name="m1.small")}
+    catalog._networks = {"private": CatalogEntry(id="net-1", name="private")}
+    catalog._loaded_at = float("inf")
+
+    compute = _FakeCompute()
+    monkeypatch.setattr(deployer, "get_catalog", lambda: catalog)
+    monkeypatch.setattr(deployer, "get_connection", lambda: nullcontext(SimpleNamespace(compute=compute)))
+    return compute
+
+
+def _create(count):
+    return deployer.create_servers(
+        name_prefix="mcp-repo",
+        count=count,
+        image_ref="cirros",
+        flavor_name="m1.small",
+        network_name="private",
+        key_name="default",
+        metadata={"github_url": "repo"},
+        timeout=5,
+        poll_interval=0,
+    )
+
+
+def test_create_servers_waits_with_list_polling(fake_env):
+    """N대를 만들고 목록 조회 몇 번으로 전체 ACTIVE를 기다린다."""
+    instances = _create(5)
+
+    assert [i.name for i in instances] == [f"mcp-repo-{n}" for n in range(1, 6)]
+    assert all(i.status == "ACTIVE" for i in instances)
+    assert all(i.flavor_name == "m1.small" for i in instances)
+    assert len({i.metadata["fleet_id"] for i in instances}) == 1
+    assert fake_env.list_calls == 2
+
+
+def test_create_servers_all_failed_raises(fake_env):
+    """모든 create 요청이 실패하면 DeploymentError."""
+    fake_env.fail_names.update({"mcp-repo-1", "mcp-repo-2"})
+    with pytest.raises(DeploymentError):
+        _create(2)
+
+
+def test_create_servers_partial_failure_returns_created(fake_env):
+    """일부 실패 시 생성된 서버만 반환한다."""
+    fake_env.fail_names.add("mcp-repo-2")
+    instances = _create(3)
+    assert [i.name for i in instances] == ["mcp-repo-1", "mcp-repo-3"]
+
+
+def test_create_servers_timeout_deletes_partial_fleet(fake_env):
+    """timeout 이 나면 이미 생성된 서버를 삭제하고 DeploymentError."""
+    fake_env.stuck = True
+    with pytest.raises(DeploymentError):
+        deployer.create_servers(
+            name_prefix="mcp-repo", count=3, image_ref="cirros", flavor_name="m1.small",
+            network_name="private", key_name="default", timeout=0, poll_interval=0,
+        )
+    assert sorted(fake_env.deleted) == ["vm-1", "vm-2", "vm-3"]
+    assert fake_env.servers_by_id == {}
+
+
+def test_create_servers_error_member_fails_fleet(fake_env):
+    """한 대라도 ERROR 가 되면 fleet 전체를 삭제하고 실패 id 를 담아 DeploymentError."""
+    fake_env.error_names.add("mcp-repo-2")
+    with pytest.raises(DeploymentError, match="vm-2"):
+        _create(3)
+    assert sorted(fake_env.deleted) == ["vm-1", "vm-2", "vm-3"]
+
+
+def test_create_servers_vanished_server_fails_fast(fake_env):
+    """목록에서 연속으로 사라진 서버는 timeout 까지 기다리지 않고 실패한다."""
+    fake_env.stuck = True
+    fake_env.hidden.add("mcp-repo-1")
+    with pytest.raises(DeploymentError, match="disappeared"):
+        deployer.create_servers(
+            name_prefix="mcp-repo", count=2, image_ref="cirros", flavor_name="m1.small",
+            network_name="private", key_name="default", timeout=60, poll_interval=0,
+        )
+    assert fake_env.list_calls == 2
+    assert sorted(fake_env.deleted) == ["vm-1", "vm-2"]
+
+
+def test_create_servers_escapes_name_prefix(fake_env):
+    """목록 조회 name 필터는 prefix 의 정규식 특수문자를 이스케이프한다."""
+    deployer.create_servers(
+        name_prefix="mcp-repo.v1", count=1, image_ref="cirros", flavor_name="m1.small",
+        network_name="private", key_name="default", timeout=5, poll_interval=0,
+    )
+    assert fake_env.name_filters[0] == r"^mcp\-repo\.v1-"
+
+
+def test_create_server_releases_connection_while_waiting(fake_env, monkeypatch):
+    """부팅 대기 중에는 연결을 붙잡지 않고, 조회할 때만 잠깐 빌린다."""
+    held = []
+    checkouts = []
+
+    @contextmanager
+    def _conn():
+        held.append(1)
+        checkouts.append(len(held))
+        try:
+            yield SimpleNamespace(compute=fake_env)
+        finally:
+            held.pop()
+
+    monkeypatch.setattr(deployer, "get_connection", _conn)
+    monkeypatch.setenv("OPENSTACK_SERVER_POLL_INTERVAL", "0")
+
+    info = deployer.create_server(
+        name="mcp-repo", image_ref="cirros", flavor_name="m1.small", network_name="private", key_name="default"
+    )
+
+    assert info.status == "ACTIVE"
+    assert fake_env.get_calls == 2
+    assert len(checkouts) == 3 and max(checkouts) == 1  # 생성 1회 + 상태 조회 2회, 동시에 하나만
+
+
+def test_wait_for_status_raises_on_error(fake_env):
+    server = fake_env.create_server(name="x", image_id="img-1", metadata={})
+    server.status = "ERROR"
+    fake_env.get_calls = -10  # ACTIVE 로 바뀌지 않게
+    with pytest.raises(DeploymentError):
+        deployer.wait_for_status(server.id, "ACTIVE", timeout=5, poll_interval=0)
@@ -0,0 +1,63 @@
+# tests/test_forecast.py
+
+"""
+forecast 모듈 단위 테스트.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.forecast import Forecast, dumps
+from app.core.policy import postprocess_forecast, postprocess_predictions
+from app.models.common import PredictionPoint, PredictionResult
+
+_T0 = datetime(2025, 1, 1, 1, 0)
+
+
+def _result(values, metric_name="total_events") -> PredictionResult:
+    return PredictionResult(
+        github_url="repo",
+        metric_name=metric_name,
+        model_version="v1",
+        generated_at=_T0,
+        predictions=[PredictionPoint(time=_T0 + timedelta(hours=i), value=v) for i, v in enumerate(values)],
+    )
+
+
+def test_round_trip_preserves_public_contract():
+    original = _result([1.0, 2.5, 3.0])
+    fc = Forecast.from_result(original)
+
+    assert fc.start == _T0
+    assert fc.times[-1] == _T0 + timedelta(hours=2)
+    assert fc.to_result().model_dump() == original.model_dump()
+
+
+def test_values_are_read_only():
+    fc = Forecast.from_result(_result([1.0, 2.0]))
+    with pytest.raises(ValueError):
+        fc.values[0] = 10.0
+
+
+@pytest.mark.parametrize("metric_name", ["total_events", "avg_cpu"])
+def test_postprocess_forecast_matches_scalar_policy(metric_name, make_ctx):
+    values = [-1.0, 0.3, 0.8, 5.0, float("nan")]
+    ctx = make_ctx(weight=1.5)
+
+    expected = [p.value for p in postprocess_predictions(_result(values, metric_name), ctx).predictions]
+    actual = postprocess_forecast(Forecast.from_result(_result(values, metric_name)), ctx).values
+
+    np.testing.assert_allclose(actual, expected)
+
+
+def test_dumps_matches_pydantic_json():
+    result = Forecast.from_result(_result([1.0, 2.0])).to_result()
+
+    assert json.loads(dumps(result)) == json.loads(result.model_dump_json())
+    assert json.loads(dumps({"values": np.array([1.5, 2.0]), "at": _T0})) == {
+        "values": [1.5, 2.0],
+        "at": "2025-01-01T01:00:00",
+    }
@@ -0,0 +1,107 @@
+# tests/test_hourly_flavor_mapper.py
+
+"""
+hourly_flavor_mapper 모듈 단위 테스트.
+"""
+
+import itertools
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core import hourly_flavor_mapper as hfm
+from app.models.common import PredictionPoint
+
+
+def _schedule_cost(flavors, penalty):
+    cost = sum(hfm.HOURLY_COST[f] for f in flavors)
+    return cost + penalty * sum(1 for a, b in zip(flavors, flavors[1:]) if a != b)
+
+
+def _feasible(flavors, values, headroom):
+    return all(v * headroom <= hfm._flavor_capacity(f) for f, v in zip(flavors, values))
+
+
+def test_zero_penalty_matches_threshold():
+    values = [100, 500, 1200, 250, 899, 901, 0, 300]
+    expected = [hfm.pick_flavor_by_threshold(v) for v in values]
+    assert hfm.optimize_flavor_schedule(values, resize_penalty=0.0, headroom=1.0) == expected
+
+
+def test_penalty_suppresses_flapping():
+    # small/medium 경계를 오가는 부하: 임계값 방식은 매시간 바뀐다
+    values = [280, 320] * 6
+    threshold = [hfm.pick_flavor_by_threshold(v) for v in values]
+    optimal = hfm.optimize_flavor_schedule(values, resize_penalty=0.5, headroom=1.0)
+
+    assert optimal == ["medium"] * len(values)
+    assert _schedule_cost(optimal, 0.5) < _schedule_cost(threshold, 0.5)
+
+
+def test_headroom_respected():
+    values = [280] * 4
+    assert hfm.optimize_flavor_schedule(values, resize_penalty=0.0, headroom=1.2) == ["medium"] * 4
+
+
+def test_matches_brute_force_on_small_horizon():
+    values = [50, 400, 950, 100, 600, 20]
+    penalty, headroom = 0.08, 1.1
+    optimal = hfm.optimize_flavor_schedule(values, resize_penalty=penalty, headroom=headroom)
+
+    candidates = [
+        c for c in itertools.product(hfm.HOURLY_COST, repeat=len(values)) if _feasible(c, values, headroom)
+    ]
+    best = min(_schedule_cost(c, penalty) for c in candidates)
+
+    assert _feasible(optimal, values, headroom)
+    assert abs(_schedule_cost(optimal, penalty) - best) < 1e-9
+
+
+def test_map_predictions_optimal_strategy():
+    t0 = datetime(2025, 1, 1)
+    preds = [PredictionPoint(time=t0 + timedelta(hours=i), value=280 if i % 2 else 320) for i in range(24)]
+
+    recs, _, total = hfm.map_predictions_to_flavors(preds, strategy="optimal")
+
+    assert len(recs) == 24
+    assert {r.recommended_flavor for r in recs} == {"medium"}
+    assert abs(total - 24 * hfm.HOURLY_COST["medium"]) < 1e-9
+
+
+def test_flavor_matrix_matches_scalar_path():
+    rng = np.random.default_rng(0)
+    values = rng.uniform(0, 1500, size=(5, 24))
+    values[0, :3] = [hfm.SMALL_MAX, hfm.MEDIUM_MAX, hfm.MEDIUM_MAX + 1e-6]  # 경계값 포함
+
+    matrix = hfm.map_flavor_matrix(values)
+
+    for row in range(values.shape[0]):
+        expected = [hfm.pick_flavor_by_threshold(v) for v in values[row]]
+        assert matrix.flavors(row) == expected
+        assert matrix.totals[row] == pytest.approx(sum(hfm.HOURLY_COST[f] for f in expected))
+        assert matrix.breakpoints[row][:3] == pytest.approx(np.percentile(values[row], [25, 50, 75]))
+
+
+def test_percentile_rank_bounds_and_ties():
+    matrix = hfm.map_flavor_matrix(np.array([[1.0, 5.0, 5.0, 9.0]]))
+    assert matrix.percentiles[0].tolist() == [0.0, 0.5, 0.5, 1.0]
+
+
+def test_percentile_rank_matches_pairwise_definition():
+    """정렬 기반 순위가 (작은 값 수 + 동률 수 / 2) / (H - 1) 정의와 같다."""
+    values = np.random.default_rng(1).integers(0, 6, size=(8, 30)).astype(float)
+    below = (values[:, None, :] < values[:, :, None]).sum(axis=2)
+    ties = (values[:, None, :] == values[:, :, None]).sum(axis=2) - 1
+    np.testing.assert_allclose(hfm._percentile_rank(values), (below + ties / 2.0) / 29)
+
+
+def test_map_predictions_accepts_longer_horizon():
+    t0 = datetime(2025, 1, 1)
+    preds = [PredictionPoint(time=t0 + timedelta(hours=i), value=100.0 * (i % 12)) for i in range(72)]
+
+    recs, breakpoints, total = hfm.map_predictions_to_flavors(preds)
+
+    assert [r.hour_index for r in recs] == list(range(72))
+    assert abs(total - sum(r.hourly_cost for r in recs)) < 1e-9
+    assert breakpoints.p50 == 550.0
@@ -0,0 +1,144 @@
+# tests/test_hourly_scheduler.py
+
+"""
+hourly_scheduler 모듈 단위 테스트.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import hourly_scheduler
+from app.core.hourly_flavor_mapper import HOURLY_COST
+from app.models.hourly_plans import HourlyFlavorRecommendation
+
+_T0 = datetime(2025, 1, 1, 0, 0)
+
+
+def _recs(flavors):
+    return [
+        HourlyFlavorRecommendation(
+            hour_index=i,
+            timestamp=_T0 + timedelta(hours=i),
+            predicted_value=0.0,
+            percentile=0.0,
+            recommended_flavor=f,
+            hourly_cost=HOURLY_COST[f],
+        )
+        for i, f in enumerate(flavors)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    hourly_scheduler._schedules.clear()
+    backend = hourly_scheduler.DryRunResizeBackend()
+    hourly_scheduler.set_backend(backend)
+    yield backend
+    hourly_scheduler._schedules.clear()
+    hourly_scheduler.set_backend(None)
+
+
+def test_adjacent_equal_flavors_are_merged():
+    flavors = ["small"] * 8 + ["large"] * 10 + ["small"] * 6
+    segments = hourly_scheduler.build_segments(_recs(flavors), min_hold_hours=1)
+
+    assert [(s.flavor, s.start_hour, s.end_hour) for s in segments] == [
+        ("small", 0, 8), ("large", 8, 18), ("small", 18, 24),
+    ]
+    assert segments[1].start_time == _T0 + timedelta(hours=8)
+    assert segments[-1].end_time == _T0 + timedelta(hours=24)
+
+
+def test_planned_cost_can_be_limited_to_leading_hours():
+    flavors = ["small"] * 20 + ["large"] * 28
+    segments = hourly_scheduler.build_segments(_recs(flavors), min_hold_hours=1)
+
+    assert hourly_scheduler.planned_cost(segments) == round(20 * HOURLY_COST["small"] + 28 * HOURLY_COST["large"], 3)
+    assert hourly_scheduler.planned_cost(segments, hours=24) == round(
+        20 * HOURLY_COST["small"] + 4 * HOURLY_COST["large"], 3
+    )
+
+
+def test_short_dip_is_absorbed_into_larger_neighbor():
+    """잠깐 small 로 떨어지는 구간은 리사이즈하지 않고 medium 유지."""
+    flavors = ["medium"] * 10 + ["small"] + ["medium"] * 13
+    segments = hourly_scheduler.build_segments(_recs(flavors), min_hold_hours=3)
+
+    assert [(s.flavor, s.hours) for s in segments] == [("medium", 24)]
+
+
+def test_short_spike_never_loses_capacity():
+    """짧은 large 피크는 없어지지 않고 인접 구간이 large 로 늘어난다."""
+    flavors = ["small"] * 10 + ["large"] + ["small"] * 13
+    recs = _recs(flavors)
+    segments = hourly_scheduler.build_segments(recs, min_hold_hours=3)
+
+    rank = hourly_scheduler._FLAVOR_RANK
+    for seg in segments:
+        assert seg.hours >= 3
+        for r in recs[seg.start_hour:seg.end_hour]:
+            assert rank[seg.flavor] >= rank[r.recommended_flavor]
+
+
+def test_plan_actions_only_on_flavor_change():
+    flavors = ["small"] * 8 + ["large"] * 10 + ["small"] * 6
+    segments = hourly_scheduler.build_segments(_recs(flavors), min_hold_hours=1)
+
+    actions = hourly_scheduler.plan_actions(segments, instance_id="vm-1", current_flavor="small")
+
+    assert [(a.from_flavor, a.to_flavor, a.at.hour) for a in actions] == [
+        ("small", "large", 8), ("large", "small", 18),
+    ]
+
+
+def test_run_due_executes_latest_due_action_only(_reset):
+    flavors = ["small"] * 8 + ["large"] * 10 + ["small"] * 6
+    segments = hourly_scheduler.build_segments(_recs(flavors), min_hold_hours=1)
+    actions = hourly_scheduler.plan_actions(segments)
+    hourly_scheduler.register(instance_id="vm-1", github_url="https://github.com/org/a", actions=actions)
+
+    executed = hourly_scheduler.run_due(_T0 + timedelta(hours=9))
+
+    assert executed == 1
+    assert _reset.calls == [("vm-1", "m1.large")]
+    statuses = [a.status for a in hourly_scheduler.get_schedule("vm-1")["actions"]]
+    assert statuses == ["skipped", "done", "pending"]
+
+    # 같은 시각에 다시 실행해도 중복 리사이즈 없음
+    assert hourly_scheduler.run_due(_T0 + timedelta(hours=9)) == 0
+
+
+def test_run_due_records_backend_failure():
+    class _Failing:
+        def resize(self, instance_id, flavor_name):
+            raise RuntimeError("nova down")
+
+    hourly_scheduler.set_backend(_Failing())
+    actions = hourly_scheduler.plan_actions(hourly_scheduler.build_segments(_recs(["medium"] * 24)))
+    hourly_scheduler.register(instance_id="vm-2", github_url="https://github.com/org/b", actions=actions)
+
+    hourly_scheduler.run_due(_T0)
+
+    action = hourly_scheduler.get_schedule("vm-2")["actions"][0]
+    assert action.status == "failed"
+    assert "nova down" in action.error
+
+
+def test_run_due_resizes_instances_concurrently():
+    """여러 인스턴스가 같은 시각에 도래하면 동시에 리사이즈한다. (순차면 barrier 가 타임아웃)"""
+    barrier = threading.Barrier(3, timeout=5)
+
+    class _Blocking:
+        def resize(self, instance_id, flavor_name):
+            barrier.wait()
+            return True
+
+    hourly_scheduler.set_backend(_Blocking())
+    actions = hourly_scheduler.plan_actions(hourly_scheduler.build_segments(_recs(["medium"] * 24)))
+    for n in range(3):
+        hourly_scheduler.register(instance_id=f"vm-c{n}", github_url="https://github.com/org/c", actions=actions)
+
+    assert hourly_scheduler.run_due(_T0, max_parallel=3) == 3
+    assert all(hourly_scheduler.get_schedule(f"vm-c{n}")["actions"][0].status == "done" for n in range(3))
@@ -0,0 +1,120 @@
+# tests/test_id_registry.py
+
+"""
+id_registry 모듈 단위 테스트.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+
+from app.core import id_registry
+from app.core.bulk_writer import insert_rows
+from app.core.metric_history import MetricHistory, MetricHistoryDaily, MetricHistoryHourly
+from app.core.metric_rollup import refresh_rollups
+from app.core.persistence_models import Metric, Service
+from app.core.predictor.data_sources.mysql_source import MySQLDataSource
+
+
+@pytest.fixture
+def engine(make_engine, tmp_path):
+    models = (Service, Metric, MetricHistory, MetricHistoryHourly, MetricHistoryDaily)
+    return make_engine([m.__table__ for m in models], url=f"sqlite:///{tmp_path / 'registry.db'}")
+
+
+@pytest.fixture
+def db_url(engine):
+    # MySQLDataSource 는 URL 로 자기 엔진을 만든다 (같은 파일 DB)
+    return str(engine.url)
+
+
+def test_ids_are_registered_once_and_cached(engine):
+    ids = id_registry.service_ids(engine, ["repo-a", "repo-b", "repo-a"])
+    assert sorted(ids) == ["repo-a", "repo-b"] and len(set(ids.values())) == 2
+
+    engine.statements.clear()
+    assert id_registry.service_ids(engine, ["repo-b", "repo-a"]) == ids
+    assert id_registry.service_id(engine, "repo-a") == ids["repo-a"]
+    assert engine.statements == []  # 캐시 적중은 DB 를 조회하지 않는다
+
+    assert id_registry.metric_ids(engine, ["avg_cpu"]) == {"avg_cpu": 1}
+
+
+def test_lookup_without_create_does_not_register(engine):
+    assert id_registry.service_id(engine, "unknown", create=False) is None
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Service.__table__)).scalar_one() == 0
+
+
+def test_missing_lookups_are_cached_until_registered(engine, monkeypatch):
+    assert id_registry.service_id(engine, "ghost", create=False) is None
+    engine.statements.clear()
+    assert id_registry.service_id(engine, "ghost", create=False) is None
+    assert engine.statements == []  # 미등록 결과도 TTL 동안은 DB 를 조회하지 않는다
+
+    sid = id_registry.service_id(engine, "ghost")
+    assert sid is not None
+    engine.statements.clear()
+    assert id_registry.service_id(engine, "ghost", create=False) == sid
+    assert engine.statements == []
+
+    # TTL 이 지나면 다시 조회한다 (다른 프로세스의 등록 반영)
+    assert id_registry.metric_id(engine, "later", create=False) is None
+    monkeypatch.setattr(id_registry.time, "monotonic", lambda: float("inf"))
+    engine.statements.clear()
+    assert id_registry.metric_id(engine, "later", create=False) is None
+    assert engine.statements != []
+
+
+def test_registration_survives_caller_rollback(engine):
+    with engine.connect() as conn:
+        conn.begin()
+        sid = id_registry.service_id(conn, "repo")
+        conn.rollback()
+
+    id_registry.clear_cache()
+    assert id_registry.service_id(engine, "repo", create=False) == sid
+
+
+def test_mysql_source_reads_by_integer_ids(db_url, engine):
+    end = datetime(2025, 1, 2, 0)
+    sids = id_registry.service_ids(engine, ["repo-a", "repo-b"])
+    mid = id_registry.metric_id(engine, "avg_cpu")
+    rows = [
+        {"service_id": sids[url], "metric_id": mid, "ts": end - timedelta(hours=h), "value": float(h + offset)}
+        for url, offset in (("repo-a", 0), ("repo-b", 100))
+        for h in range(3)
+    ]
+    with engine.begin() as conn:
+        insert_rows(conn, MetricHistory.__table__, rows)
+        refresh_rollups(conn, end - timedelta(hours=2), end)
+
+    # SQLite 는 datetime 을 문자열로 비교하므로 경계값이 저장 시각과 겹치지 않게 30분 어긋난 창으로 조회한다
+    window = dict(hours=4, end_time=end + timedelta(minutes=30))
+    raw = MySQLDataSource(connection_url=db_url, history_source="raw")
+    np.testing.assert_array_equal(raw.fetch_historical_data("repo-a", "avg_cpu", **window), [2, 2, 1, 0])
+    many = raw.fetch_many(["repo-a", "repo-b", "repo-c"], "avg_cpu", **window)
+    assert sorted(many) == ["repo-a", "repo-b"]
+    np.testing.assert_array_equal(many["repo-b"], [102, 102, 101, 100])
+
+    hourly = MySQLDataSource(connection_url=db_url, history_source="hourly")
+    np.testing.assert_array_equal(hourly.fetch_historical_data("repo-b", "avg_cpu", **window), [102, 102, 101, 100])
+
+
+def test_mysql_append_refreshes_rollups(db_url):
+    """append 는 적재한 서비스·구간의 시간 롤업을 같이 갱신해 hourly 조회가 바로 새 값을 본다."""
+    end = datetime(2025, 1, 2, 0)
+    hourly = MySQLDataSource(connection_url=db_url, history_source="hourly")
+    window = dict(hours=3, end_time=end + timedelta(minutes=30))
+
+    hourly.append([
+        {"github_url": "repo-a", "metric_name": "avg_cpu", "ts": end - timedelta(hours=1), "value": 1.0},
+        {"github_url": "repo-a", "metric_name": "avg_cpu", "ts": end, "value": 2.0},
+    ])
+    np.testing.assert_array_equal(hourly.fetch_historical_data("repo-a", "avg_cpu", **window), [1, 1, 2])
+
+    hourly.append([{"github_url": "repo-a", "metric_name": "avg_cpu", "ts": end + timedelta(minutes=20), "value": 4.0}])
+    np.testing.assert_array_equal(hourly.fetch_historical_data("repo-a", "avg_cpu", **window), [1, 1, 3])
+    hourly.engine.dispose()
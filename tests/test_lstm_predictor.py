@@ -0,0 +1,60 @@
+# tests/test_lstm_predictor.py
+
+"""
+lstm_predictor 모듈 단위 테스트.
+"""
+
+import numpy as np
+import pytest
+
+from app.core.predictor.lstm_predictor import LSTMPredictor
+
+
+class _IdentityScaler:
+    def inverse_transform(self, x):
+        return np.asarray(x, dtype=float)
+
+
+class _LastValueModel:
+    """입력 시퀀스 마지막 시점의 첫 번째 특징 + 1 을 width 개 시점으로 반환하는 가짜 모델."""
+
+    def __init__(self, width=1):
+        self.width = width
+        self.calls = 0
+
+    def __call__(self, x, training=False):
+        self.calls += 1
+        last = float(np.asarray(x)[0, -1, 0])
+        return np.array([[last + 1 + i for i in range(self.width)]])
+
+    def predict(self, *args, **kwargs):
+        raise AssertionError("rollout must call the model directly")
+
+
+def _predictor(model) -> LSTMPredictor:
+    predictor = LSTMPredictor.__new__(LSTMPredictor)
+    predictor.model = model
+    predictor.target_scaler = _IdentityScaler()
+    predictor.use_log_transform = False
+    return predictor
+
+
+@pytest.mark.parametrize("horizon", [6, 24, 168])
+def test_rollout_feeds_predictions_back(horizon):
+    model = _LastValueModel()
+    X = np.zeros((1, 4, 3))
+
+    out = _predictor(model)._generate_predictions(X, horizon)
+
+    np.testing.assert_allclose(out, np.arange(1, horizon + 1))
+    assert model.calls == horizon
+
+
+def test_multi_step_model_reduces_calls():
+    """출력 폭이 k 인 모델은 ceil(H / k) 번만 호출하고, 결과는 1-step 롤아웃과 같다."""
+    model = _LastValueModel(width=8)
+
+    out = _predictor(model)._generate_predictions(np.zeros((1, 4, 3)), 30)
+
+    np.testing.assert_allclose(out, np.arange(1, 31))
+    assert model.calls == 4
@@ -0,0 +1,130 @@
+# tests/test_metric_ingest.py
+
+"""
+metric_ingest 모듈 및 /metrics/ingest 라우트 단위 테스트.
+"""
+
+import asyncio
+import threading
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import metric_ingest, plan_cache
+from app.core.predictor.data_sources.sqlite_source import SQLiteDataSource
+from app.routes import metrics
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(metrics.router, prefix="/metrics")
+    yield TestClient(app)
+    metric_ingest.stop()
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = SQLiteDataSource(str(tmp_path / "history.db"))
+    yield src
+    metric_ingest.stop()
+    src.engine.dispose()
+
+
+def test_ingest_returns_503_when_not_running(client):
+    resp = client.post("/metrics/ingest", json={"points": [
+        {"github_url": "repo", "metric_name": "avg_cpu", "ts": "2025-01-01T00:00:00Z", "value": 1.0}
+    ]})
+    assert resp.status_code == 503
+
+
+def test_json_and_ndjson_points_are_flushed_and_invalidate_cache(client, source):
+    before = plan_cache.data_version("repo-a")
+    metric_ingest.start(writer=source.append, batch_size=1000, flush_ms=50)
+
+    resp = client.post("/metrics/ingest", json={
+        "points": [{"github_url": "repo-a", "metric_name": "avg_cpu", "ts": "2025-01-01T09:00:00+09:00", "value": 1.0}],
+        "series": [{"github_url": "repo-a", "metric_name": "avg_cpu", "ts": [1735693200, 1735696800], "values": [2.0, 3.0]}],
+    })
+    assert resp.status_code == 202 and resp.json()["accepted"] == 3
+
+    ndjson = (
+        '{"github_url": "repo-b", "metric_name": "avg_cpu", "ts": "2025-01-01T00:00:00", "value": 7}\n'
+        "\n"
+        '{"github_url": "repo-b", "metric_name": "avg_cpu", "ts": "2025-01-01T01:00:00", "value": 8}\n'
+    )
+    resp = client.post("/metrics/ingest", content=ndjson, headers={"content-type": "application/x-ndjson"})
+    assert resp.status_code == 202 and resp.json()["accepted"] == 2
+
+    metric_ingest.stop()
+    end = datetime(2025, 1, 1, 2)
+    np.testing.assert_array_equal(source.fetch_historical_data("repo-a", "avg_cpu", hours=3, end_time=end), [1, 2, 3])
+    np.testing.assert_array_equal(source.fetch_historical_data("repo-b", "avg_cpu", hours=3, end_time=end), [7, 7, 8])
+    assert plan_cache.data_version("repo-a") > before
+
+
+def test_invalid_points_are_rejected(client, source):
+    metric_ingest.start(writer=source.append, flush_ms=50)
+
+    bad_value = {"points": [{"github_url": "r", "metric_name": "m", "ts": "2025-01-01T00:00:00", "value": "nan"}]}
+    assert client.post("/metrics/ingest", json=bad_value).status_code == 422
+    ragged = {"series": [{"github_url": "r", "metric_name": "m", "ts": [0, 3600], "values": [1.0]}]}
+    assert client.post("/metrics/ingest", json=ragged).status_code == 422
+    assert client.post("/metrics/ingest", json={"points": []}).status_code == 422
+    resp = client.post("/metrics/ingest", content='{"github_url": "r"}\n', headers={"content-type": "application/x-ndjson"})
+    assert resp.status_code == 422 and "line 1" in resp.json()["detail"]
+
+
+def test_full_buffer_returns_429_until_writer_catches_up(client):
+    release = threading.Event()
+    written = []
+
+    def slow_writer(batch):
+        release.wait(timeout=5)
+        written.extend(batch)
+
+    metric_ingest.start(writer=slow_writer, batch_size=2, flush_ms=0, max_buffered=3)
+    point = {"github_url": "repo", "metric_name": "avg_cpu", "ts": "2025-01-01T00:00:00", "value": 1.0}
+
+    statuses = [client.post("/metrics/ingest", json={"points": [point, point]}).status_code for _ in range(4)]
+    assert statuses[0] == 202 and 429 in statuses
+    resp = client.post("/metrics/ingest", json={"points": [point] * 4})
+    assert resp.status_code == 429 and resp.headers["Retry-After"] == "1"
+
+    release.set()
+    metric_ingest.stop()
+    stats = metric_ingest.stats()
+    assert len(written) == statuses.count(202) * 2
+    assert stats["rejected"] >= 4
+
+
+def test_retry_after_follows_started_flush_interval():
+    """Retry-After 는 start() 에 넘긴 flush_ms 기준이다."""
+    metric_ingest.start(writer=lambda batch: None, flush_ms=2500)
+    try:
+        assert metric_ingest.retry_after_seconds() == 3
+    finally:
+        metric_ingest.stop()
+
+
+def test_parse_and_submit_run_off_the_event_loop(client, monkeypatch):
+    """검증/버퍼 적재는 이벤트 루프가 아니라 스레드풀에서 실행된다."""
+    on_loop = []
+
+    def submit(rows):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return len(rows)
+
+    metric_ingest.start(writer=lambda batch: None, flush_ms=50)
+    monkeypatch.setattr(metric_ingest, "submit", submit)
+    point = {"github_url": "repo", "metric_name": "avg_cpu", "ts": "2025-01-01T00:00:00", "value": 1.0}
+
+    assert client.post("/metrics/ingest", json={"points": [point]}).status_code == 202
+    assert on_loop == [False]
@@ -0,0 +1,141 @@
+# tests/test_metric_rollup.py
+
+"""
+metric_rollup 모듈 단위 테스트.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.bulk_writer import insert_rows
+from app.core.metric_history import MetricHistory, MetricHistoryDaily, MetricHistoryHourly
+from app.core.metric_rollup import (
+    apply_retention,
+    expired_partitions,
+    future_partitions_sql,
+    purge_before,
+    refresh_rollups,
+)
+
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine([m.__table__ for m in (MetricHistory, MetricHistoryHourly, MetricHistoryDaily)])
+
+
+def _insert(engine, points, service_id=1, metric_id=1):
+    rows = [{"service_id": service_id, "metric_id": metric_id, "ts": ts, "value": v} for ts, v in points]
+    with engine.begin() as conn:
+        insert_rows(conn, MetricHistory.__table__, rows, ignore_duplicates=True)
+
+
+def _rollup(engine, model):
+    t = model.__table__
+    with engine.connect() as conn:
+        return conn.execute(
+            select(t.c.service_id, t.c.bucket_ts, t.c.sample_count, t.c.value_sum, t.c.value_min, t.c.value_max)
+            .order_by(t.c.service_id, t.c.bucket_ts)
+        ).all()
+
+
+def test_refresh_rollups_builds_hourly_and_daily_buckets(engine):
+    _insert(engine, [
+        (datetime(2025, 1, 1, 0, 0), 1.0),
+        (datetime(2025, 1, 1, 0, 30), 3.0),
+        (datetime(2025, 1, 1, 1, 0), 5.0),
+        (datetime(2025, 1, 2, 0, 0), 7.0),
+    ])
+
+    with engine.begin() as conn:
+        refresh_rollups(conn, datetime(2025, 1, 1), datetime(2025, 1, 2))
+
+    assert [tuple(r[1:]) for r in _rollup(engine, MetricHistoryHourly)] == [
+        (datetime(2025, 1, 1, 0), 2, 4.0, 1.0, 3.0),
+        (datetime(2025, 1, 1, 1), 1, 5.0, 5.0, 5.0),
+        (datetime(2025, 1, 2, 0), 1, 7.0, 7.0, 7.0),
+    ]
+    assert [tuple(r[1:]) for r in _rollup(engine, MetricHistoryDaily)] == [
+        (datetime(2025, 1, 1), 3, 9.0, 1.0, 5.0),
+        (datetime(2025, 1, 2), 1, 7.0, 7.0, 7.0),
+    ]
+
+
+def test_refresh_rollups_is_incremental_and_idempotent(engine):
+    _insert(engine, [(datetime(2025, 1, 1, 0), 1.0), (datetime(2025, 1, 1, 5), 2.0)])
+    _insert(engine, [(datetime(2025, 1, 1, 0), 10.0)], service_id=2)
+    with engine.begin() as conn:
+        refresh_rollups(conn, datetime(2025, 1, 1, 0), datetime(2025, 1, 1, 5))
+
+    # 05시에 새 행이 들어오면 그 구간만 다시 계산한다 (00시 구간, 다른 서비스는 그대로)
+    _insert(engine, [(datetime(2025, 1, 1, 5, 30), 4.0)])
+    with engine.begin() as conn:
+        refresh_rollups(conn, datetime(2025, 1, 1, 5, 30), datetime(2025, 1, 1, 5, 30), service_id=1)
+        refresh_rollups(conn, datetime(2025, 1, 1, 5, 30), datetime(2025, 1, 1, 5, 30), service_id=1)
+
+    hourly = {(r[0], r[1].hour): r[2:4] for r in _rollup(engine, MetricHistoryHourly)}
+    assert hourly == {(1, 0): (1, 1.0), (1, 5): (2, 6.0), (2, 0): (1, 10.0)}
+    daily = {r[0]: r[2:4] for r in _rollup(engine, MetricHistoryDaily)}
+    assert daily == {1: (3, 7.0), 2: (1, 10.0)}
+
+
+def test_future_partitions_sql_splits_p_future_up_to_months_ahead():
+    existing = ["p202609", "p202610", "p_future"]
+
+    ddl = future_partitions_sql(existing, datetime(2026, 10, 19), months_ahead=3)
+
+    assert ddl.startswith("ALTER TABLE metric_history REORGANIZE PARTITION p_future INTO (")
+    assert "PARTITION p202611 VALUES LESS THAN ('2026-12-01')" in ddl
+    assert "PARTITION p202612 VALUES LESS THAN ('2027-01-01')" in ddl
+    assert "PARTITION p202701 VALUES LESS THAN ('2027-02-01')" in ddl
+    assert "p202702" not in ddl
+    assert ddl.rstrip().endswith("PARTITION p_future VALUES LESS THAN (MAXVALUE)\n)")
+    assert future_partitions_sql([*existing, "p202611", "p202612", "p202701"], datetime(2026, 10, 19), 3) is None
+
+
+def test_expired_partitions_only_includes_fully_expired_months():
+    existing = ["p202507", "p202508", "p202509", "p_future"]
+
+    assert expired_partitions(existing, datetime(2025, 9, 1)) == ["p202507", "p202508"]
+    assert expired_partitions(existing, datetime(2025, 8, 31, 23)) == ["p202507"]
+
+
+def test_apply_retention_deletes_expired_rows_and_rollups(engine):
+    _insert(engine, [(datetime(2025, 1, 1), 1.0), (datetime(2025, 3, 1), 2.0), (datetime(2025, 4, 1), 3.0)])
+    with engine.begin() as conn:
+        refresh_rollups(conn, datetime(2025, 1, 1), datetime(2025, 4, 1))
+    report = apply_retention(engine, raw_days=30, hourly_days=60, daily_days=None, now=datetime(2025, 4, 15))
+
+    assert report["raw"] == 2 and report["hourly"] == 1 and report["daily"] == 0
+    with engine.connect() as conn:
+        remaining = conn.execute(select(func.min(MetricHistory.__table__.c.ts))).scalar_one()
+    assert remaining == datetime(2025, 4, 1)
+    assert len(_rollup(engine, MetricHistoryHourly)) == 2
+    assert len(_rollup(engine, MetricHistoryDaily)) == 3
+
+
+def test_purge_before_commits_each_mysql_batch():
+    """MySQL 배치 DELETE 는 배치마다 별도 트랜잭션으로 커밋한다."""
+    deleted = iter([3, 3, 1])
+    transactions = []
+
+    class _Conn:
+        def execute(self, stmt, params):
+            transactions[-1].append(str(stmt))
+            return SimpleNamespace(rowcount=next(deleted))
+
+    class _Engine:
+        dialect = SimpleNamespace(name="mysql")
+
+        @contextmanager
+        def begin(self):
+            transactions.append([])
+            yield _Conn()
+
+    t = MetricHistory.__table__
+    assert purge_before(_Engine(), t, t.c.ts, datetime(2025, 1, 1), batch_size=3) == 7
+    assert [len(stmts) for stmts in transactions] == [1, 1, 1]
+    assert "LIMIT 3" in transactions[0][0]
@@ -0,0 +1,66 @@
+# tests/test_openstack_catalog.py
+
+"""
+OpenStack 리소스 카탈로그 캐시 단위 테스트.
+"""
+
+from types import SimpleNamespace
+
+from app.core.openstack.catalog import ResourceCatalog
+
+
+class _Counter:
+    def __init__(self, items):
+        self.items = items
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return list(self.items)
+
+
+def _fake_conn():
+    flavors = _Counter([SimpleNamespace(id="f-1", name="m1.small", vcpus=1, ram=2048, disk=20)])
+    images = _Counter([SimpleNamespace(id="img-1", name="cirros")])
+    networks = _Counter([SimpleNamespace(id="net-1", name="private")])
+    conn = SimpleNamespace(
+        compute=SimpleNamespace(flavors=flavors),
+        image=SimpleNamespace(images=images),
+        network=SimpleNamespace(networks=networks),
+    )
+    return conn, flavors
+
+
+def test_resolve_by_name_and_id():
+    """이름과 ID 모두로 조회된다."""
+    catalog = ResourceCatalog(ttl=600)
+    conn, _ = _fake_conn()
+    catalog.refresh(conn)
+
+    assert catalog.resolve_flavor("m1.small", refresh=False).id == "f-1"
+    assert catalog.resolve_flavor("f-1", refresh=False).name == "m1.small"
+    assert catalog.resolve_image("cirros", refresh=False).id == "img-1"
+    assert catalog.resolve_network("private", refresh=False).id == "net-1"
+    assert catalog.resolve_network("public", refresh=False) is None
+    assert catalog.flavor_specs("m1.small") == {"vcpus": 1, "ram_mb": 2048, "disk_gb": 20}
+
+
+def test_ensure_fresh_respects_ttl(monkeypatch):
+    """TTL 안에서는 다시 목록 호출을 하지 않는다."""
+    catalog = ResourceCatalog(ttl=600)
+    conn, flavors = _fake_conn()
+    monkeypatch.setattr(catalog, "refresh", lambda conn_=None: ResourceCatalog.refresh(catalog, conn))
+
+    catalog.resolve_flavor("m1.small")
+    catalog.resolve_image("cirros")
+    catalog.resolve_network("private")
+
+    assert flavors.calls == 1
+    assert catalog.is_loaded()
+
+
+def test_unloaded_catalog_returns_none():
+    """로드 전에는 메모리 조회 결과가 없다 (호출 측이 폴백 사용)."""
+    catalog = ResourceCatalog()
+    assert catalog.flavor_specs("m1.small") is None
+    assert not catalog.is_loaded()
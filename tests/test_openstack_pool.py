@@ -0,0 +1,110 @@
+# tests/test_openstack_pool.py
+
+"""
+openstack.client.ConnectionPool 단위 테스트.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.core.openstack.client import ConnectionPool, OpenStackPoolTimeout
+
+
+class _FakeConn:
+    def __init__(self, n):
+        self.n = n
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def _pool(size=2, **kwargs):
+    counter = iter(range(1000))
+    return ConnectionPool(size, factory=lambda: _FakeConn(next(counter)), **kwargs)
+
+
+def test_connection_is_reused_after_return():
+    pool = _pool()
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert pool.stats()["created"] == 1
+
+
+def test_concurrent_checkouts_get_distinct_connections():
+    pool = _pool(size=2)
+    with pool.connection() as a, pool.connection() as b:
+        assert a is not b
+    assert pool.stats() == {"size": 2, "created": 2, "idle": 2}
+
+
+def test_checkout_blocks_until_connection_returned():
+    pool = _pool(size=1, timeout=2)
+    seen = []
+
+    def borrower():
+        with pool.connection() as conn:
+            seen.append(conn)
+
+    with pool.connection() as held:
+        t = threading.Thread(target=borrower)
+        t.start()
+        time.sleep(0.05)
+        assert seen == []  # 풀이 가득 차 대기 중
+    t.join(timeout=2)
+    assert seen == [held]
+
+
+def test_checkout_times_out_when_exhausted():
+    pool = _pool(size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(OpenStackPoolTimeout):
+            with pool.connection():
+                pass
+
+
+def test_unhealthy_idle_connection_is_replaced():
+    def failing_check(conn):
+        raise RuntimeError("token expired")
+
+    pool = _pool(size=1, health_interval=0, health_check=failing_check)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert second is not first
+    assert first.closed
+    assert pool.stats()["created"] == 1
+
+
+def test_healthy_idle_connection_is_kept():
+    checked = []
+    pool = _pool(size=1, health_interval=0, health_check=checked.append)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert second is first
+    assert checked == [first]
+
+
+def test_factory_failure_releases_slot():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("auth failed")
+        return _FakeConn(len(calls))
+
+    pool = ConnectionPool(1, timeout=0.05, factory=factory)
+    with pytest.raises(RuntimeError):
+        with pool.connection():
+            pass
+    with pool.connection() as conn:
+        assert conn.n == 2
@@ -0,0 +1,78 @@
+# tests/test_plan_cache.py
+
+"""
+plan_cache 모듈 단위 테스트.
+"""
+
+import pytest
+
+from app.core import plan_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    plan_cache.invalidate()
+    yield
+    plan_cache.invalidate()
+
+
+def test_bucket_users_keeps_flavor_boundaries():
+    """올림 버킷은 flavor 임계값(500, 5000)을 넘나들지 않는다."""
+    assert plan_cache.bucket_users(None) is None
+    assert plan_cache.bucket_users(42) == 42
+    assert plan_cache.bucket_users(500) == 500
+    assert plan_cache.bucket_users(501) == 510
+    assert plan_cache.bucket_users(5000) == 5000
+    assert plan_cache.bucket_users(5001) == 5100
+
+
+def test_make_key_ignores_context_id_and_timestamp(make_ctx):
+    """context_id/timestamp가 달라도 동일 컨텍스트면 같은 키."""
+    ctx = make_ctx(expected_users=1200)
+    k1 = plan_cache.make_key("plans", github_url="repo", metrics="total_events", ctx=ctx, model_version="v1")
+    k2 = plan_cache.make_key(
+        "plans",
+        github_url="repo",
+        metrics="total_events",
+        ctx=make_ctx(context_id="other", expected_users=1190),
+        model_version="v1",
+    )
+    k3 = plan_cache.make_key(
+        "plans", github_url="repo", metrics="total_events", ctx=make_ctx(expected_users=1200, time_slot="peak"), model_version="v1"
+    )
+
+    assert k1 == k2
+    assert k1 != k3
+
+
+def test_get_put_and_invalidate_repo(make_ctx):
+    """저장소 단위 무효화 시 데이터 버전이 올라가 이전 키는 더 이상 맞지 않는다."""
+    key = plan_cache.make_key("plans", github_url="repo", metrics="m", ctx=make_ctx(), model_version="v1")
+    plan_cache.put(key, "result")
+    assert plan_cache.get(key) == "result"
+
+    plan_cache.invalidate("repo")
+
+    assert plan_cache.get(key) is None
+    new_key = plan_cache.make_key("plans", github_url="repo", metrics="m", ctx=make_ctx(), model_version="v1")
+    assert new_key != key
+
+
+def test_ttl_expiry():
+    """TTL이 지나면 캐시 미스."""
+    key = ("plans", "repo")
+    plan_cache.put(key, "result")
+    assert plan_cache.get(key, ttl=-1) is None
+
+
+def test_bounded_size(monkeypatch):
+    """최대 항목 수를 넘으면 LRU 순서로 제거된다."""
+    monkeypatch.setattr(plan_cache, "_MAX_ENTRIES", 2)
+    plan_cache.put(("k", 1), 1)
+    plan_cache.put(("k", 2), 2)
+    plan_cache.get(("k", 1))
+    plan_cache.put(("k", 3), 3)
+
+    assert plan_cache.size() == 2
+    assert plan_cache.get(("k", 2)) is None
+    assert plan_cache.get(("k", 1)) == 1
@@ -0,0 +1,112 @@
+# tests/test_plan_materializer.py
+
+"""
+plan_materializer 모듈 단위 테스트.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import plan_cache, plan_materializer, plan_service
+from app.core.predictor.base import BasePredictor
+from app.models.common import PredictionPoint, PredictionResult
+from app.models.plans import PlansRequest
+
+
+class _Predictor(BasePredictor):
+    def __init__(self) -> None:
+        self.calls = 0
+        self.batches = []
+
+    def _pred(self, url):
+        now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        return PredictionResult(
+            github_url=url,
+            metric_name="total_events",
+            model_version="v1",
+            generated_at=now,
+            predictions=[PredictionPoint(time=now + timedelta(hours=i + 1), value=10.0) for i in range(24)],
+        )
+
+    def run(self, *, github_url, metric_name, ctx, model_version, horizon=None):
+        self.calls += 1
+        return self._pred(github_url)
+
+    def run_batch(self, items, *, metric_name, model_version, horizon=None):
+        self.batches.append([url for url, _ in items])
+        return [self._pred(url) for url, _ in items]
+
+
+@pytest.fixture(autouse=True)
+def running(monkeypatch):
+    plan_cache.invalidate()
+    monkeypatch.setattr(plan_service, "notify_anomaly", lambda *args, **kwargs: None)
+    monkeypatch.setattr(plan_service, "_fetch_history_bulk", lambda urls, metric: {})
+    # 정시 실행은 테스트 중에 돌지 않도록 충분히 뒤로 미룬다 (run_once 로 직접 실행)
+    plan_materializer.start(delay_seconds=7200)
+    yield
+    plan_materializer.stop()
+    plan_cache.invalidate()
+
+
+def test_track_dedupes_by_normalized_context_and_expires(make_ctx):
+    now = datetime(2025, 1, 1, 12)
+    plan_materializer.track("repo", "total_events", make_ctx(expected_users=301), 24, now=now - timedelta(hours=30))
+    plan_materializer.track("repo", "total_events", make_ctx(expected_users=305, context_id="ctx-2"), 24, now=now)
+    plan_materializer.track("repo", "total_events", make_ctx(), 48, now=now - timedelta(hours=30))
+
+    items = plan_materializer.tracked(now)
+
+    # 301/305 는 같은 사용자 버킷이라 한 항목이고, 24시간 넘게 요청이 없던 horizon=48 은 빠진다
+    assert [(url, metric, ctx.context_id, horizon) for url, metric, ctx, horizon in items] == [
+        ("repo", "total_events", "ctx-2", 24)
+    ]
+
+
+def test_tracking_key_uses_cache_context_normalization(make_ctx):
+    """추적 키의 컨텍스트 부분은 plan_cache 키와 같은 정규화를 쓴다."""
+    ctx = make_ctx(expected_users=1190, weight=1.23456)
+    key = plan_materializer._key("repo", "total_events", ctx, 24)
+    assert key == ("repo", "total_events", *plan_cache.normalized_context(ctx), 24)
+    assert plan_cache.normalized_context(ctx) == plan_cache.normalized_context(make_ctx(expected_users=1200, weight=1.2346))
+
+
+def test_run_once_prewarms_plans_served_without_inference(monkeypatch, make_ctx):
+    predictor = _Predictor()
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: predictor)
+    for url in ("repo-a", "repo-b"):
+        plan_service.build_plan(PlansRequest(github_url=url, metric_name="total_events", context=make_ctx()))
+    assert predictor.calls == 2
+
+    # 다음 정시: 이전 결과는 더 이상 유효하지 않다
+    plan_cache.invalidate()
+    assert plan_materializer.run_once() == 2
+    assert predictor.batches == [["repo-a", "repo-b"]]
+
+    resp = plan_service.build_plan(
+        PlansRequest(github_url="repo-b", metric_name="total_events", context=make_ctx(context_id="ctx-9"))
+    )
+    assert predictor.calls == 2 and resp.recommended_flavor == "small"
+    assert plan_materializer.stats()["planned"] == 2
+
+
+def test_run_once_does_not_send_anomaly_alerts(monkeypatch, make_ctx):
+    predictor = _Predictor()
+    alerts = []
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: predictor)
+    monkeypatch.setattr(plan_service, "notify_anomaly", lambda pred, *args, **kwargs: alerts.append(pred.github_url))
+    plan_service.build_plan(PlansRequest(github_url="repo-a", metric_name="total_events", context=make_ctx()))
+    assert alerts == ["repo-a"]
+
+    # 정시 사전 계산은 사용자 요청이 아니므로 알림을 다시 보내지 않는다
+    plan_cache.invalidate()
+    assert plan_materializer.run_once() == 1
+    assert alerts == ["repo-a"]
+
+
+def test_next_run_is_after_the_hour():
+    delay = 30
+    assert plan_materializer._seconds_until_next_run(datetime(2025, 1, 1, 12, 0, 10), delay) == 20
+    assert plan_materializer._seconds_until_next_run(datetime(2025, 1, 1, 12, 0, 30), delay) == 3600
+    assert plan_materializer._seconds_until_next_run(datetime(2025, 1, 1, 12, 59, 0), delay) == 90
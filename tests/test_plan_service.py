@@ -0,0 +1,199 @@
+# tests/test_plan_service.py
+
+"""
+plan_service 모듈 단위 테스트.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import plan_cache, plan_service
+from app.core.predictor.base import BasePredictor
+from app.models.common import PredictionPoint, PredictionResult
+from app.models.plans import BatchPlanItem, BatchPlansRequest, PlansRequest
+
+
+def _pred(values) -> PredictionResult:
+    now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    return PredictionResult(
+        github_url="repo",
+        metric_name="total_events",
+        model_version="v1",
+        generated_at=now,
+        predictions=[PredictionPoint(time=now + timedelta(hours=i + 1), value=v) for i, v in enumerate(values)],
+    )
+
+
+class _CountingPredictor(BasePredictor):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def run(self, *, github_url, metric_name, ctx, model_version, horizon=None):
+        self.calls += 1
+        return _pred([10.0] * 24)
+
+
+class _BatchPredictor(BasePredictor):
+    def __init__(self) -> None:
+        self.batches = []
+
+    def run(self, *, github_url, metric_name, ctx, model_version, horizon=None):
+        raise AssertionError("batch path must not call run()")
+
+    def run_batch(self, items, *, metric_name, model_version, horizon=None):
+        self.batches.append([url for url, _ in items])
+        return [_pred([2000.0 if "big" in url else 10.0] * 24) for url, _ in items]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    plan_cache.invalidate()
+    yield
+    plan_cache.invalidate()
+
+
+def test_recommend_flavor_rules(make_ctx):
+    """사용자 수/시간대/예측값 기반 추천 규칙."""
+    low = _pred([10.0] * 24)
+
+    assert plan_service.recommend_flavor(make_ctx(expected_users=300), low) == "small"
+    assert plan_service.recommend_flavor(make_ctx(expected_users=300, time_slot="peak"), low) == "medium"
+    assert plan_service.recommend_flavor(make_ctx(expected_users=3000, time_slot="low"), low) == "small"
+    assert plan_service.recommend_flavor(make_ctx(expected_users=3000, time_slot="weekend"), low) == "medium"
+    assert (
+        plan_service.recommend_flavor(
+            make_ctx(expected_users=3000, time_slot="weekend"), low, downgrade_slots=("low", "weekend")
+        )
+        == "small"
+    )
+    assert plan_service.recommend_flavor(make_ctx(expected_users=300), _pred([2000.0] * 24)) == "large"
+
+
+def test_build_plan_uses_cache(monkeypatch, make_ctx):
+    """같은 컨텍스트로 두 번 호출하면 predictor는 한 번만 실행된다."""
+    predictor = _CountingPredictor()
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: predictor)
+    monkeypatch.setattr(plan_service, "notify_anomaly", lambda *args, **kwargs: None)
+
+    req = PlansRequest(github_url="repo", metric_name="total_events", context=make_ctx())
+    first = plan_service.build_plan(req)
+    second = plan_service.build_plan(req.model_copy(update={"context": make_ctx(context_id="ctx-2")}))
+
+    assert predictor.calls == 1
+    assert first is second
+    assert first.recommended_flavor == "small"
+    assert first.expected_cost_per_day == 1.2
+
+
+def test_build_batch_plan_batches_misses_and_shares_cache(monkeypatch, make_ctx):
+    """캐시 미스만 한 번의 run_batch 로 예측하고, 결과는 /plans 캐시와 공유된다."""
+    predictor = _BatchPredictor()
+    fetched = []
+    monkeypatch.setattr(plan_service, "notify_anomaly", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        plan_service, "_fetch_history_bulk", lambda urls, metric: fetched.append(list(urls)) or {}
+    )
+
+    # repo-a 는 /plans 로 미리 계산해 캐시에 넣어 둔다
+    single = _CountingPredictor()
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: single)
+    plan_service.build_plan(PlansRequest(github_url="repo-a", metric_name="total_events", context=make_ctx()))
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: predictor)
+
+    req = BatchPlansRequest(
+        items=[
+            BatchPlanItem(github_url="repo-a", context=make_ctx()),
+            BatchPlanItem(github_url="repo-big", context=make_ctx()),
+            BatchPlanItem(github_url="repo-c", context=make_ctx()),
+        ]
+    )
+    resp = plan_service.build_batch_plan(req)
+
+    assert predictor.batches == [["repo-big", "repo-c"]]
+    assert fetched == [["repo-big", "repo-c"]]
+    assert [r.github_url for r in resp.results] == ["repo-a", "repo-big", "repo-c"]
+    assert [r.results["total_events"].recommended_flavor for r in resp.results] == ["small", "large", "small"]
+    assert all(r.error is None for r in resp.results)
+
+
+def test_build_batch_plan_reports_item_errors(monkeypatch, make_ctx):
+    """predictor 실패는 해당 그룹 항목의 error 로만 노출된다."""
+
+    class _Failing(BasePredictor):
+        def run(self, *, github_url, metric_name, ctx, model_version, horizon=None):
+            raise RuntimeError("boom")
+
+        def run_batch(self, items, *, metric_name, model_version, horizon=None):
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: _Failing())
+    monkeypatch.setattr(plan_service, "_fetch_history_bulk", lambda urls, metric: {})
+
+    resp = plan_service.build_batch_plan(
+        BatchPlansRequest(
+            items=[BatchPlanItem(github_url="repo-x", context=make_ctx())], metric_names=["total_events", "avg_cpu"]
+        )
+    )
+
+    assert resp.results[0].results == {}
+    # 실패한 metric 마다 오류가 남는다 (마지막 것만 남지 않음)
+    assert resp.results[0].error.startswith("total_events: ")
+    assert "; avg_cpu: " in resp.results[0].error and resp.results[0].error.count("boom") == 2
+
+
+def test_iter_batch_plan_streams_per_chunk(monkeypatch, make_ctx):
+    """chunk 단위로 예측하고, 첫 chunk 결과는 다음 chunk 계산 전에 내보낸다."""
+    predictor = _BatchPredictor()
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: predictor)
+    monkeypatch.setattr(plan_service, "notify_anomaly", lambda *args, **kwargs: None)
+    monkeypatch.setattr(plan_service, "_fetch_history_bulk", lambda urls, metric: {})
+
+    req = BatchPlansRequest(
+        items=[BatchPlanItem(github_url=f"repo-{i}", context=make_ctx()) for i in range(5)],
+        metric_names=["total_events", "avg_cpu"],
+    )
+    lines = plan_service.iter_batch_plan(req, chunk_size=2)
+
+    first = next(lines)
+    assert (first.github_url, first.metric_name) == ("repo-0", "total_events")
+    assert predictor.batches == [["repo-0", "repo-1"]]
+
+    rest = list(lines)
+    assert len(rest) == 5 * 2 - 1
+    assert predictor.batches[-1] == ["repo-4"]
+    assert all(line.result is not None and line.error is None for line in rest)
+
+
+def test_build_plan_horizon_flows_to_predictor_and_cache(monkeypatch, make_ctx):
+    """horizon_hours 만큼 예측하고, horizon 이 다르면 캐시를 공유하지 않는다."""
+    from app.core.predictor.baseline_predictor import BaselinePredictor
+
+    predictor = BaselinePredictor()
+    predictor.data_source = None
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: predictor)
+    monkeypatch.setattr(plan_service, "notify_anomaly", lambda *args, **kwargs: None)
+
+    req = PlansRequest(github_url="repo", metric_name="total_events", context=make_ctx())
+    day = plan_service.build_plan(req)
+    week = plan_service.build_plan(req.model_copy(update={"horizon_hours": 168}))
+
+    assert len(day.prediction.predictions) == 24
+    assert len(week.prediction.predictions) == 168
+    assert week.prediction.predictions[-1].time - week.prediction.predictions[0].time == timedelta(hours=167)
+
+
+def test_build_plan_persists_requirements_text(monkeypatch, make_ctx):
+    """요청의 requirements 가 이력 저장 큐의 requirements_text 로 전달된다."""
+    enqueued = []
+    monkeypatch.setattr(plan_service, "pick_engine", lambda model_version: _CountingPredictor())
+    monkeypatch.setattr(plan_service, "notify_anomaly", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        plan_service.prediction_persister, "enqueue", lambda fc, ctx, **kwargs: enqueued.append(kwargs)
+    )
+
+    plan_service.build_plan(
+        PlansRequest(github_url="repo", metric_name="total_events", context=make_ctx(), requirements="피크 대비 여유")
+    )
+
+    assert [kw["requirements_text"] for kw in enqueued] == ["피크 대비 여유"]
@@ -0,0 +1,82 @@
+# tests/test_policy.py
+
+"""
+policy 모듈 단위 테스트.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+from app.core.forecast import Forecast
+from app.core.metrics import get_metric_meta
+from app.core.policy import (
+    ClampStage,
+    SmoothingStage,
+    build_pipeline,
+    postprocess_forecast,
+    postprocess_forecasts,
+)
+
+_T0 = datetime(2025, 1, 1, 1, 0)
+
+
+def _fc(values, metric_name="total_events") -> Forecast:
+    return Forecast(
+        github_url="repo", metric_name=metric_name, model_version="v1",
+        generated_at=_T0, start=_T0, values=values,
+    )
+
+
+def test_default_pipeline_weights_and_clamps(make_ctx):
+    """기본 파이프라인은 weight 적용 후 메트릭 종류별로 clamp 한다."""
+    counts = postprocess_forecast(_fc([-1.0, 2.0, float("nan")]), make_ctx(weight=2.0))
+    ratios = postprocess_forecast(_fc([-0.1, 0.3, 0.8, float("nan")], "avg_cpu"), make_ctx(weight=2.0))
+
+    np.testing.assert_allclose(counts.values, [0.0, 4.0, 0.0])
+    np.testing.assert_allclose(ratios.values, [0.0, 0.6, 1.0, 0.0])
+
+
+def test_optional_stages_are_composed_in_order():
+    """smoothing/headroom 은 설정할 때만 포함되며 clamp 는 항상 마지막이다."""
+    assert [type(s).__name__ for s in build_pipeline(smoothing_window=1, headroom=1.0).stages] == [
+        "WeightStage", "ClampStage",
+    ]
+    pipeline = build_pipeline(smoothing_window=2, headroom=1.5)
+    assert [type(s).__name__ for s in pipeline.stages] == [
+        "WeightStage", "SmoothingStage", "HeadroomStage", "ClampStage",
+    ]
+
+    out = pipeline.apply(np.array([0.2, 0.4, 0.8]), get_metric_meta("avg_cpu"), 1.0)
+    np.testing.assert_allclose(out, [0.3, 0.45, 0.9])
+
+
+def test_smoothing_stage_matches_trailing_mean():
+    values = np.array([[1.0, 2.0, 3.0, 4.0, 5.0], [5.0, 5.0, 5.0, 5.0, 5.0]])
+    out = SmoothingStage(3)(values, get_metric_meta("total_events"), np.ones((2, 1)))
+
+    np.testing.assert_allclose(out[0], [1.0, 1.5, 2.0, 3.0, 4.0])
+    np.testing.assert_allclose(out[1], 5.0)
+
+
+def test_clamp_stage_does_not_mutate_input():
+    values = np.array([[-1.0, 1.0]])
+    ClampStage()(values, get_metric_meta("total_events"), np.ones((1, 1)))
+    np.testing.assert_array_equal(values, [[-1.0, 1.0]])
+
+
+def test_batch_matches_single_and_keeps_order(make_ctx):
+    """서로 다른 metric/horizon 이 섞여도 단건 처리와 같은 결과를 입력 순서대로 반환한다."""
+    fcs = [
+        _fc([1.0, 2.0, 3.0]),
+        _fc([0.5, 0.9], "avg_cpu"),
+        _fc([-4.0, 8.0, 1.0]),
+        _fc([7.0]),
+    ]
+    ctxs = [make_ctx(weight=1.0), make_ctx(weight=1.5), make_ctx(weight=0.5), make_ctx(weight=2.0)]
+
+    batch = postprocess_forecasts(fcs, ctxs)
+
+    assert [fc.metric_name for fc in batch] == [fc.metric_name for fc in fcs]
+    for fc, ctx, got in zip(fcs, ctxs, batch):
+        np.testing.assert_allclose(got.values, postprocess_forecast(fc, ctx).values)
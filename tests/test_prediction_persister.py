@@ -0,0 +1,103 @@
+# tests/test_prediction_persister.py
+
+"""
+prediction_persister 모듈 단위 테스트.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import prediction_persister
+from app.core.forecast import Forecast
+from app.core.persistence_models import Base, MCPContext, Prediction, PredictionPoint
+
+_T0 = datetime(2025, 1, 1, 1, 0)
+
+
+@pytest.fixture
+def session_factory(make_engine):
+    # 적재 스레드와 테스트가 같은 메모리 DB 를 보도록 연결 하나를 공유한다
+    engine = make_engine(Base.metadata.sorted_tables, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    prediction_persister.stop()
+
+
+def _fc(url, n=3) -> Forecast:
+    return Forecast(
+        github_url=url, metric_name="total_events", model_version="v1",
+        generated_at=_T0, start=_T0, values=[float(i) for i in range(n)],
+    )
+
+
+def _count(session_factory, model) -> int:
+    with session_factory() as db:
+        return db.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_enqueue_is_noop_when_not_running(make_ctx):
+    assert prediction_persister.enqueue(_fc("repo"), make_ctx()) is False
+
+
+def test_batches_are_flushed_in_one_transaction(session_factory, make_ctx):
+    """같은 context_id 가 반복돼도 저장되고, 종료 시 남은 레코드까지 모두 기록된다."""
+    before = prediction_persister.stats()
+    prediction_persister.start(session_factory=session_factory, batch_size=2, flush_ms=50)
+
+    for i in range(5):
+        assert prediction_persister.enqueue(_fc(f"repo-{i}"), make_ctx(), recommended_flavor="small")
+    prediction_persister.stop()
+
+    after = prediction_persister.stats()
+    assert after["written"] - before["written"] == 5
+    assert after["batches"] - before["batches"] >= 3
+    assert _count(session_factory, MCPContext) == 5
+    assert _count(session_factory, Prediction) == 5
+    assert _count(session_factory, PredictionPoint) == 15
+
+    with session_factory() as db:
+        pred = db.execute(select(Prediction).where(Prediction.github_url == "repo-3")).scalar_one()
+        assert pred.horizon_hours == 3
+        assert [p.predicted_value for p in pred.prediction_points] == [0.0, 1.0, 2.0]
+        assert pred.context.context_json["context_id"] == "ctx-1"
+
+
+def test_failed_flush_is_counted_and_rolled_back(session_factory, make_ctx):
+    def broken_factory():
+        session = session_factory()
+        session.flush = lambda *a, **k: (_ for _ in ()).throw(RuntimeError("db down"))
+        return session
+
+    before = prediction_persister.stats()["failed"]
+    prediction_persister.start(session_factory=broken_factory, batch_size=10, flush_ms=10)
+    prediction_persister.enqueue(_fc("repo"), make_ctx())
+    prediction_persister.stop()
+
+    assert prediction_persister.stats()["failed"] - before == 1
+    assert _count(session_factory, Prediction) == 0
+
+
+def test_predictor_inputs_are_persisted_or_left_null(session_factory, make_ctx):
+    """입력 구간/특징 수/스케일은 Forecast 값 그대로, 모르면 NULL. 요구사항 원문도 저장한다."""
+    prediction_persister.start(session_factory=session_factory, batch_size=10, flush_ms=10)
+    lstm = _fc("repo-lstm").replace(sequence_length=48, feature_count=7, scale_factor=1.25)
+    prediction_persister.enqueue(lstm, make_ctx(), requirements_text="피크 시간대 스케일업 필요")
+    prediction_persister.enqueue(_fc("repo-fallback"), make_ctx())
+    prediction_persister.stop()
+
+    with session_factory() as db:
+        rows = {
+            p.github_url: (p, p.feature_snapshot, p.context)
+            for p in db.execute(select(Prediction)).scalars()
+        }
+        pred, snap, ctx = rows["repo-lstm"]
+        assert (snap.sequence_length, snap.feature_count, float(pred.scale_factor)) == (48, 7, 1.25)
+        assert (snap.window_end - snap.window_start).total_seconds() == 48 * 3600
+        assert ctx.requirements_text == "피크 시간대 스케일업 필요"
+
+        pred, snap, ctx = rows["repo-fallback"]
+        assert (snap.sequence_length, snap.feature_count, snap.window_start, pred.scale_factor) == (None, None, None, None)
+        assert ctx.requirements_text is None
@@ -0,0 +1,84 @@
+# tests/test_singleflight.py
+
+"""
+singleflight 모듈 단위 테스트.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    """동시에 들어온 동일 키 호출은 한 번만 계산하고 결과를 공유한다."""
+    flight: SingleFlight[int] = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def compute() -> int:
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return 42
+
+    results = []
+
+    def worker() -> None:
+        results.append(flight.do("key", compute))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=worker) for _ in range(4)]
+    for t in followers:
+        t.start()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert len(calls) == 1
+    assert [r for r, _ in results] == [42] * 5
+    assert sum(1 for _, shared in results if shared) == 4
+    assert flight.in_flight() == 0
+
+
+def test_error_is_propagated_to_waiters():
+    """리더 호출의 예외는 대기 중인 호출에도 그대로 전달된다."""
+    flight: SingleFlight[int] = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def compute() -> int:
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    def worker() -> None:
+        try:
+            flight.do("key", compute)
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=worker)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert errors == ["boom", "boom"]
+
+
+def test_sequential_calls_recompute():
+    """진행 중인 호출이 없으면 매번 새로 계산한다 (결과 저장은 plan_cache 역할)."""
+    flight: SingleFlight[int] = SingleFlight()
+    counter = iter(range(10))
+
+    first, shared1 = flight.do("key", lambda: next(counter))
+    second, shared2 = flight.do("key", lambda: next(counter))
+
+    assert (first, second) == (0, 1)
+    assert not shared1 and not shared2
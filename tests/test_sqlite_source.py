@@ -0,0 +1,69 @@
+# tests/test_sqlite_source.py
+
+"""
+sqlite_source 모듈 단위 테스트.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.core.errors import DataNotFoundError
+from app.core.predictor.data_sources import factory
+from app.core.predictor.data_sources.sqlite_source import SQLiteDataSource
+
+
+END = datetime(2025, 1, 2, 0)
+
+
+def _points(github_url, metric_name, values):
+    # values 는 오래된 것부터, 마지막 값이 END 시각
+    n = len(values)
+    return [
+        {"github_url": github_url, "metric_name": metric_name, "ts": END - timedelta(hours=n - 1 - i), "value": v}
+        for i, v in enumerate(values)
+    ]
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = SQLiteDataSource(str(tmp_path / "edge" / "history.db"))
+    yield src
+    src.engine.dispose()
+
+
+def test_append_then_range_read(source):
+    assert source.append(_points("repo-a", "avg_cpu", [1.0, 2.0, 3.0, 4.0])) == 4
+    # 재전송은 무시된다
+    source.append(_points("repo-a", "avg_cpu", [9.0, 9.0]))
+
+    np.testing.assert_array_equal(source.fetch_historical_data("repo-a", "avg_cpu", hours=3, end_time=END), [2, 3, 4])
+    np.testing.assert_array_equal(
+        source.fetch_historical_data("repo-a", "avg_cpu", hours=6, end_time=END), [1, 1, 1, 2, 3, 4]
+    )
+    with pytest.raises(DataNotFoundError):
+        source.fetch_historical_data("repo-a", "avg_memory", hours=3, end_time=END)
+
+
+def test_fetch_many_splits_by_service(source):
+    source.append(_points("repo-a", "avg_cpu", [1.0, 2.0]) + _points("repo-b", "avg_cpu", [10.0, 20.0, 30.0]))
+    source.append(_points("repo-c", "avg_memory", [5.0]))
+
+    many = source.fetch_many(["repo-b", "repo-a", "repo-c", "repo-x"], "avg_cpu", hours=3, end_time=END)
+
+    assert sorted(many) == ["repo-a", "repo-b"]
+    np.testing.assert_array_equal(many["repo-a"], [1, 1, 2])
+    np.testing.assert_array_equal(many["repo-b"], [10, 20, 30])
+
+
+def test_factory_selects_sqlite_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_SOURCE_BACKEND", "sqlite")
+    monkeypatch.setenv("SQLITE_DATA_PATH", str(tmp_path / "history.db"))
+    monkeypatch.setattr(factory, "_data_source_instance", None)
+
+    src = factory.get_data_source()
+
+    assert isinstance(src, SQLiteDataSource) and src.is_available()
+    assert (tmp_path / "history.db").exists()
+    src.engine.dispose()
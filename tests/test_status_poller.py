@@ -0,0 +1,127 @@
+# tests/test_status_poller.py
+
+"""
+status_poller 모듈 단위 테스트.
+"""
+
+from types import SimpleNamespace
+
+from app.core import status_poller
+
+
+class _FakeCompute:
+    def __init__(self, servers):
+        self._servers = servers
+        self.list_calls = 0
+
+    def servers(self, details=False):
+        self.list_calls += 1
+        return list(self._servers)
+
+
+def test_refresh_once_uses_single_list_call(monkeypatch):
+    """추적 중인 인스턴스 수와 무관하게 서버 목록 호출은 1회."""
+    monkeypatch.setattr(status_poller, "_latest_usage", lambda repos, metric: {r: 0.5 for r in repos})
+    compute = _FakeCompute(
+        [
+            SimpleNamespace(id="vm-1", status="ACTIVE"),
+            SimpleNamespace(id="vm-2", status="ERROR"),
+            SimpleNamespace(id="vm-untracked", status="ACTIVE"),
+        ]
+    )
+    conn = SimpleNamespace(compute=compute)
+    projects = [
+        {"repository": "https://github.com/org/a", "instance_id": "vm-1"},
+        {"repository": "https://github.com/org/b", "instance_id": "vm-2"},
+        {"repository": "https://github.com/org/c", "instance_id": "vm-gone"},
+        {"repository": "https://github.com/org/d", "instance_id": None},
+    ]
+
+    refreshed = status_poller.refresh_once(conn=conn, projects=projects)
+
+    assert refreshed == 3
+    assert compute.list_calls == 1
+
+    a = status_poller.get_status("https://github.com/org/a")
+    assert a["is_healthy"] is True
+    assert a["cpu_usage"] == 0.5
+    assert status_poller.get_status("https://github.com/org/b")["server_status"] == "ERROR"
+    assert status_poller.get_instance_status("vm-gone")["server_status"] == "NOT_FOUND"
+    assert status_poller.get_status("https://github.com/org/d") is None
+    assert status_poller.last_refresh() is not None
+
+
+def test_refresh_once_without_tracked_instances_skips_openstack():
+    """추적 대상이 없으면 OpenStack 연결 자체를 만들지 않는다."""
+    assert status_poller.refresh_once(conn=None, projects=[]) == 0
+
+
+def test_refresh_once_tracks_every_fleet_instance(monkeypatch):
+    """fleet 프로젝트는 인스턴스별 상태를 모두 갱신하고, 저장소 상태는 전체가 정상일 때만 healthy."""
+    monkeypatch.setattr(status_poller, "_latest_usage", lambda repos, metric: {r: 0.5 for r in repos})
+    conn = SimpleNamespace(
+        compute=_FakeCompute([SimpleNamespace(id="f-1", status="ACTIVE"), SimpleNamespace(id="f-2", status="BUILD")])
+    )
+    projects = [{"repository": "https://github.com/org/fleet", "instance_id": "f-1", "instance_ids": ["f-1", "f-2"]}]
+
+    assert status_poller.refresh_once(conn=conn, projects=projects) == 2
+
+    repo = status_poller.get_status("https://github.com/org/fleet")
+    assert repo["instance_id"] == "f-1" and repo["is_healthy"] is False
+    assert [i["instance_id"] for i in repo["instances"]] == ["f-1", "f-2"]
+    assert status_poller.get_instance_status("f-2")["server_status"] == "BUILD"
+
+
+def test_refresh_once_groups_projects_sharing_a_repository(monkeypatch):
+    """같은 저장소를 배포한 여러 프로젝트의 인스턴스가 저장소 상태에 모두 보인다."""
+    monkeypatch.setattr(status_poller, "_latest_usage", lambda repos, metric: {r: 0.5 for r in repos})
+    conn = SimpleNamespace(
+        compute=_FakeCompute([SimpleNamespace(id="p-1", status="ACTIVE"), SimpleNamespace(id="p-2", status="ERROR")])
+    )
+    projects = [
+        {"repository": "https://github.com/org/shared", "instance_id": "p-1"},
+        {"repository": "https://github.com/org/shared", "instance_id": "p-2"},
+    ]
+
+    assert status_poller.refresh_once(conn=conn, projects=projects) == 2
+
+    repo = status_poller.get_status("https://github.com/org/shared")
+    assert [i["instance_id"] for i in repo["instances"]] == ["p-1", "p-2"]
+    assert repo["is_healthy"] is False
+
+
+def test_refresh_once_drops_untracked_and_fetches_usage_once_per_metric(monkeypatch):
+    """스냅샷은 주기마다 교체되고, 사용량은 저장소 수와 무관하게 metric 당 fetch_many 1회."""
+    import numpy as np
+
+    from app.core.predictor.data_sources import DataSource
+
+    calls = []
+
+    class _Source(DataSource):
+        def fetch_historical_data(self, github_url, metric_name, hours=168, end_time=None):
+            raise AssertionError("fetch_many 만 사용해야 한다")
+
+        def fetch_many(self, github_urls, metric_name, hours=168, end_time=None):
+            calls.append((tuple(github_urls), metric_name))
+            return {url: np.array([0.1, 0.7]) for url in github_urls}
+
+        def is_available(self):
+            return True
+
+    monkeypatch.setattr("app.core.predictor.data_sources.get_data_source", lambda: _Source())
+    conn = SimpleNamespace(compute=_FakeCompute([SimpleNamespace(id="p-1", status="ACTIVE")]))
+    projects = [
+        {"repository": "https://github.com/org/p", "instance_id": "p-1"},
+        {"repository": "https://github.com/org/q", "instance_id": "q-1"},
+    ]
+
+    assert status_poller.refresh_once(conn=conn, projects=projects) == 2
+    assert sorted(metric for _, metric in calls) == ["avg_cpu", "avg_memory"]
+    assert status_poller.get_status("https://github.com/org/q")["mem_usage"] == 0.7
+
+    # q 가 삭제되면 다음 주기에 스냅샷에서도 사라진다
+    assert status_poller.refresh_once(conn=conn, projects=projects[:1]) == 1
+    assert status_poller.get_status("https://github.com/org/q") is None
+    assert status_poller.get_instance_status("q-1") is None
+    assert status_poller.get_status("https://github.com/org/p")["cpu_usage"] == 0.7